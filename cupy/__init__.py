@@ -37,13 +37,13 @@ def is_available():
 __version__ = _version.__version__
 
 
-from cupy import fft  # NOQA
+# `cupy.linalg` is always imported as it provides top-level functions such
+# as `cupy.dot`. Other submodules are imported on first access (see
+# `__getattr__` below) to reduce the import time.
 from cupy import linalg  # NOQA
-from cupy import polynomial  # NOQA
-from cupy import random  # NOQA
+
 # `cupy.sparse` is deprecated in v8
-from cupy import sparse  # NOQA
-from cupy import testing  # NOQA  # NOQA
+_lazy_submodules = ('fft', 'polynomial', 'random', 'sparse', 'testing')
 
 
 # import class and function
@@ -203,7 +203,6 @@ from cupy._creation.from_data import fromfunction  # NOQA
 from cupy._creation.from_data import fromiter  # NOQA
 from cupy._creation.from_data import frombuffer  # NOQA
 from cupy._creation.from_data import fromstring  # NOQA
-from cupy._creation.from_data import loadtxt  # NOQA
 from cupy._creation.from_data import genfromtxt  # NOQA
 
 from cupy._creation.ranges import arange  # NOQA
@@ -433,6 +432,7 @@ from cupy._io.formatting import array2string  # NOQA
 from cupy._io.formatting import format_float_positional  # NOQA
 from cupy._io.formatting import format_float_scientific  # NOQA
 
+from cupy._io.text import loadtxt  # NOQA
 from cupy._io.text import savetxt  # NOQA
 
 
@@ -844,11 +844,16 @@ def get_array_module(*args):
        ...     return xp.maximum(0, x) + xp.log1p(xp.exp(-abs(x)))
 
     """
+    # Sparse matrices cannot exist unless `cupyx.scipy.sparse` is imported,
+    # so avoid importing it here.
+    sparse = _sys.modules.get('cupyx.scipy.sparse')
     for arg in args:
-        if isinstance(arg, (ndarray, _cupyx.scipy.sparse.spmatrix,
+        if isinstance(arg, (ndarray,
                             _core.fusion._FusionVarArray,
                             _core.new_fusion._ArrayProxy)):
             return _cupy
+        if sparse is not None and isinstance(arg, sparse.spmatrix):
+            return _cupy
     return _numpy
 
 
@@ -1082,12 +1087,23 @@ or earlier.
 
 
 def __getattr__(name):
+    if name in _lazy_submodules:
+        import importlib
+        module = importlib.import_module('cupy.' + name)
+        _embed_signatures(module.__dict__)
+        return module
+
     if name in _deprecated_apis:
         return getattr(_numpy, name)
 
     raise AttributeError(f"module 'cupy' has no attribute {name!r}")
 
 
+def __dir__():
+    return list(globals()) + [
+        name for name in _lazy_submodules if name not in globals()]
+
+
 def _embed_signatures(dirs):
     for name, value in dirs.items():
         if isinstance(value, ufunc):
@@ -1099,8 +1115,4 @@ def _embed_signatures(dirs):
 
 
 _embed_signatures(globals())
-_embed_signatures(fft.__dict__)
 _embed_signatures(linalg.__dict__)
-_embed_signatures(random.__dict__)
-_embed_signatures(sparse.__dict__)
-_embed_signatures(testing.__dict__)
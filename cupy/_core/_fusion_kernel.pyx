@@ -9,6 +9,7 @@ from cupy._core.core cimport compile_with_cache
 from cupy._core.core cimport _ndarray_base
 from cupy._core cimport internal
 from cupy._core cimport _routines_manipulation as _manipulation
+from cupy.cuda cimport device
 from cupy_backends.cuda.api cimport driver
 from cupy_backends.cuda.api cimport runtime
 
@@ -61,6 +62,7 @@ cdef class FusedKernel:
         readonly str _submodule_code
         readonly str _cuda_body
         readonly dict _cuda_params_memo
+        readonly dict _launch_memo
         readonly list _block_strides
         readonly bint _use_grid_sync
 
@@ -81,6 +83,7 @@ cdef class FusedKernel:
         self._name = name
         self._params = sorted(params, key=lambda x: x.serial_number)
         self._cuda_params_memo = {}
+        self._launch_memo = {}
 
         # Generate the device functions.
         submodule_code = '\n\n'.join(set(itertools.chain.from_iterable([
@@ -265,22 +268,27 @@ cdef class FusedKernel:
 
     cdef tuple _reduce_dims(self, list ndarray_list):
         """Reduce number of dimensions of ndarrays and returns the cache key.
+
+        The key consists of the ndim, the C-contiguity and the 32-bit
+        indexability of the arrays, which determine the CUDA parameters.
         """
         cdef list params = self._params
-        cdef list ndims = []
+        cdef list key = []
         cdef _ndarray_base array
         cdef int i
 
         for i in range(len(params)):
             param = params[i]
-            if param.ndim <= 1:
+            if not isinstance(param, _TraceArray):
                 continue
             array = ndarray_list[i]
-            array = array.reduced_view()
-            ndarray_list[i] = array
-            ndims.append(array.ndim)
+            if param.ndim > 1:
+                array = array.reduced_view()
+                ndarray_list[i] = array
+            key.append(
+                (array.ndim, array._c_contiguous, array._index_32_bits))
 
-        return tuple(ndims)
+        return tuple(key)
 
     cdef list _get_inout_args(self, tuple args, list ndarray_list):
         """Get the arguments passed to ``kern.linear_launch``.
@@ -348,22 +356,31 @@ cdef class FusedKernel:
         ret = self._get_return_value(ndarray_list)
         reduce_key = self._reduce_dims(ndarray_list)
         inout_args = self._get_inout_args(args, ndarray_list)
-        cuda_params = self._get_cuda_params(reduce_key, ndarray_list)
         typedef = self._get_typedefs(args)
-        kern = _cuda_compile(
-            typedef + self._submodule_code,
-            self._name, cuda_params, self._cuda_body, self._use_grid_sync)
 
         block_strides, block_size, shared_mem = (
             self._get_kernel_size(ndarray_list))
 
-        # TODO(asi1024): Optimize kernel size parameter.
-        if not runtime._is_hip_environment:
-            kern_size = driver.occupancyMaxActiveBlocksPerMultiprocessor(
-                kern.ptr, block_size, shared_mem) * block_size
-        else:
-            # In HIP sometimes the occupancy calc seems to be broken
-            kern_size = block_size * 512
+        # Memoize the compiled kernel and its size to skip building the
+        # source code and querying the occupancy on every call.
+        launch_key = (reduce_key, typedef, device.get_device_id())
+        launch = self._launch_memo.get(launch_key)
+        if launch is None:
+            cuda_params = self._get_cuda_params(reduce_key, ndarray_list)
+            kern = _cuda_compile(
+                typedef + self._submodule_code,
+                self._name, cuda_params, self._cuda_body,
+                self._use_grid_sync)
+
+            # TODO(asi1024): Optimize kernel size parameter.
+            if not runtime._is_hip_environment:
+                kern_size = driver.occupancyMaxActiveBlocksPerMultiprocessor(
+                    kern.ptr, block_size, shared_mem) * block_size
+            else:
+                # In HIP sometimes the occupancy calc seems to be broken
+                kern_size = block_size * 512
+            launch = self._launch_memo[launch_key] = (kern, kern_size)
+        kern, kern_size = launch
 
         kargs = inout_args + block_strides
         kern.linear_launch(
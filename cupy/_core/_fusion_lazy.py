@@ -0,0 +1,772 @@
+"""Lazy kernel fusion of consecutive ufunc calls.
+
+In the lazy mode, which is enabled by :func:`cupyx.lazy_fusion`, ufunc and
+reduction calls do not launch kernels immediately but return
+:class:`_LazyArray` objects, nodes of an expression graph. When the value of
+a node is needed, e.g., by ``get()``, indexing or an operation that cannot
+be deferred, the graph is compiled into a single kernel with
+:func:`cupy.fuse`, so that the intermediate arrays are never written to the
+device memory. The fused functions are cached by the structure of the
+graph, and the kernels are cached by :func:`cupy.fuse` for the dtypes and
+shapes of the inputs.
+"""
+
+import collections
+import contextlib
+import os
+import sys
+import threading
+import weakref
+
+import numpy
+
+import cupy
+from cupy._core import _fusion_interface
+from cupy._core import _fusion_thread_local
+from cupy._core import _kernel
+from cupy._core import _reduction
+from cupy._core import _routines_logic as _logic
+from cupy._core import _routines_math as _math
+from cupy._core import _routines_statistics as _statistics
+from cupy._core import _scalar
+from cupy._core import core
+from cupy._core import fusion
+from cupy._core import internal
+from cupy.cuda import device
+
+
+_thread_local = _fusion_thread_local.thread_local
+
+# Graphs are materialized when they grow beyond this number of operations,
+# to bound the size of the generated kernels.
+_max_ops = 64
+
+_UFUNC = 0
+_REDUCTION = 1
+
+# Map from the structure of a graph to a `fusion.Fusion` object, in the
+# order of the least recently used first.
+_fused_cache = collections.OrderedDict()
+
+# Set of the structures of graphs and the signatures of their inputs (see
+# `_signature`) for which the fused function failed, in the order of the
+# least recently used first. The values are None.
+_unfusable_cache = collections.OrderedDict()
+
+# Maximum number of the entries of each of the caches above.
+_max_cache_size = 256
+
+# Guards the caches above, which are shared by all threads.
+_cache_lock = threading.Lock()
+
+_dummy_arrays = {}
+
+# Code objects of the CuPy functions that just call the reduction methods.
+_passthrough_codes = None
+
+_root = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+_cupy_dirs = tuple(
+    os.path.join(_root, name) + os.sep
+    for name in ('cupy', 'cupyx', 'cupy_backends'))
+_this_file = __file__
+
+_delegated_protocols = frozenset([
+    '__cuda_array_interface__', '__dlpack__', '__dlpack_device__'])
+
+# Errors raised by `cupy.fuse` for operations that it cannot trace.
+_fallback_errors = (TypeError, ValueError, NotImplementedError)
+
+
+@contextlib.contextmanager
+def lazy_fusion():
+    """Context manager to fuse consecutive ufunc calls lazily.
+
+    Inside this context, arithmetic operators on :class:`cupy.ndarray`
+    (e.g., ``x + y``) and ufunc calls and reductions (``sum``, ``prod``,
+    ``max``, ``min``, ``all`` and ``any``) taking the results of them do not
+    launch kernels. Instead, they return lazy arrays which record the
+    operations. When the value of a lazy array is needed, the operations are
+    fused into a single kernel with :func:`cupy.fuse`, which is compiled and
+    cached per the structure of the operations, and then executed. This
+    eliminates the intermediate arrays and the kernel launches of
+    elementwise-heavy code without rewriting it into a fused function.
+
+    A lazy array is materialized into a :class:`cupy.ndarray` when it is
+    converted by :func:`cupy.asarray`, indexed, copied to the host with
+    ``get()``, printed, or passed to an operation that cannot be deferred,
+    such as an in-place operation, a ufunc call with ``out`` or ``dtype``,
+    or any other function or method of :class:`cupy.ndarray`. The shape
+    and dtype of a lazy array are available without materializing it. Lazy
+    arrays created in the context can be used after exiting it, and the
+    operations on them are then executed immediately.
+
+    The rule is that operators are deferred, and so are ufunc calls taking
+    lazy arrays. Ufunc calls are not deferred by themselves, as the
+    routines of CuPy call ufuncs in the same way and expect ndarrays; e.g.,
+    ``cupy.exp(x)`` for an ndarray ``x`` is executed immediately, while
+    ``cupy.exp(x + 1)`` is deferred. Operations in CuPy functions called in
+    the context are executed as usual.
+
+    The inputs of the deferred operations are read when the result is
+    materialized. An in-place operator, item assignment or ufunc call with
+    ``out`` on an input therefore materializes the lazy arrays reading it
+    first, in the context and after exiting it, and so do ``fill``, ``set``
+    and reductions with ``out``. Writes in other threads are not tracked,
+    nor are in-place ``sort``, :class:`cupy.RawKernel` and library calls
+    writing an input; materialize the lazy arrays before such writes.
+
+    Example:
+        >>> x = cupy.arange(10, dtype=cupy.float32)
+        >>> with cupyx.lazy_fusion():
+        ...     y = cupy.exp(-x * x) * 2 + 1  # no kernel is launched
+        ...     z = y.sum()  # no kernel is launched
+        ...     z = float(z)  # a single fused kernel is launched
+    """
+    prev = _fusion_thread_local.is_lazy()
+    if not prev:
+        pending = _get_pending()
+        if pending is None:
+            pending = _thread_local.lazy_pending = _PendingGraphs()
+        pending.active = True
+    _thread_local.is_lazy = True
+    core._enter_lazy_context()
+    try:
+        yield
+    finally:
+        core._exit_lazy_context()
+        _thread_local.is_lazy = prev
+        if not prev:
+            pending.active = False
+            pending.release_if_done()
+
+
+@contextlib.contextmanager
+def _eager():
+    prev = _fusion_thread_local.is_lazy()
+    _thread_local.is_lazy = False
+    try:
+        yield
+    finally:
+        _thread_local.is_lazy = prev
+
+
+def _materialize_all(args):
+    return [a._materialize() if isinstance(a, _LazyArray) else a
+            for a in args]
+
+
+def _call_eager(func, args, kwargs):
+    args = _materialize_all(args)
+    kwargs = {
+        k: v._materialize() if isinstance(v, _LazyArray) else v
+        for k, v in kwargs.items()}
+    with _eager():
+        return func(*args, **kwargs)
+
+
+def _get_passthrough_codes():
+    global _passthrough_codes
+    if _passthrough_codes is None:
+        from cupy._math import sumprod
+        from cupy._statistics import order
+        _passthrough_codes = frozenset([
+            f.__code__ for f in (
+                sumprod.sum, sumprod.prod, order.amax, order.amin)])
+    return _passthrough_codes
+
+
+def _user_frame():
+    # Returns the innermost frame outside CuPy, or None if the caller is a
+    # function of CuPy.
+    passthrough = _get_passthrough_codes()
+    frame = sys._getframe(1)
+    while frame is not None and (
+            frame.f_code.co_filename == _this_file
+            or frame.f_code in passthrough):
+        frame = frame.f_back
+    if frame is None or frame.f_code.co_filename.startswith(_cupy_dirs):
+        return None
+    return frame
+
+
+def _comparisons():
+    # Comparison ufuncs indexed by the operation code of ``__richcmp__``.
+    return (cupy.less, cupy.less_equal, cupy.equal, cupy.not_equal,
+            cupy.greater, cupy.greater_equal)
+
+
+def _get_dummy_array(dtype):
+    a = _dummy_arrays.get(dtype)
+    if a is None:
+        a = _dummy_arrays[dtype] = core.ndarray((0,), dtype)
+    return a
+
+
+def _guess_out_dtypes(func, args):
+    # Feeds dummy arguments to `guess_routine` in the same way as the
+    # ufunc, so that the result types (and the errors) are the same.
+    in_args = []
+    weaks = []
+    for a in args:
+        if isinstance(a, (core.ndarray, _LazyArray)):
+            in_args.append(_get_dummy_array(a.dtype))
+            weaks.append(False)
+        else:
+            typ = type(a)
+            if typ in (int, float, complex):
+                in_args.append(_scalar._python_scalar_to_numpy_scalar(a))
+                weaks.append(typ)
+            else:
+                in_args.append(numpy.bool_(a) if typ is bool else a)
+                weaks.append(False)
+    op = func._ops.guess_routine(
+        func.name, func._routine_cache, in_args, tuple(weaks), None, None)
+    return op.get_out_dtypes()
+
+
+def _is_deferrable_arg(a, dev_id):
+    if isinstance(a, _LazyArray):
+        return True
+    if isinstance(a, core.ndarray):
+        return a.data.device_id == dev_id
+    return type(a) in (int, float, complex, bool) or (
+        isinstance(a, numpy.generic))
+
+
+def _is_deferrable(ufunc, args, kwargs):
+    if (not _fusion_thread_local.is_lazy() or kwargs or ufunc.nout != 1
+            or len(args) != ufunc.nin):
+        return False
+    dev_id = device.get_device_id()
+    if not all([_is_deferrable_arg(a, dev_id) for a in args]):
+        return False
+    # Do not return lazy arrays to CuPy functions, which expect ndarrays.
+    return _user_frame() is not None
+
+
+def _defer_ufunc(ufunc, args):
+    (dtype,) = _guess_out_dtypes(ufunc, args)
+    shape = internal._broadcast_shapes([
+        a.shape if isinstance(a, (core.ndarray, _LazyArray)) else ()
+        for a in args])
+    return _LazyArray._create(_UFUNC, ufunc, tuple(args), None, shape, dtype)
+
+
+def call_operator(ufunc, args):
+    """Calls a ufunc for an operator of ndarray in the lazy mode.
+
+    Returns a lazy array, or ``NotImplemented`` if the operator should be
+    executed immediately.
+    """
+    if not _is_deferrable(ufunc, args, None):
+        return NotImplemented
+    return _defer_ufunc(ufunc, args)
+
+
+def call_ufunc(ufunc, args, kwargs):
+    """Calls a ufunc taking lazy arrays.
+
+    Returns a lazy array, or the result of the eager execution if the call
+    cannot be deferred.
+    """
+    if not _is_deferrable(ufunc, args, kwargs):
+        return _call_eager(ufunc, args, kwargs)
+    return _defer_ufunc(ufunc, args)
+
+
+def call_reduction(kernel, a, axis, dtype, out, keepdims):
+    """Calls a reduction kernel on a lazy array."""
+    if (not _fusion_thread_local.is_lazy() or dtype is not None
+            or out is not None or keepdims or _user_frame() is None):
+        return _call_eager(
+            kernel, (a,),
+            dict(axis=axis, dtype=dtype, out=out, keepdims=keepdims))
+    axes = internal._normalize_axis_indices(axis, a.ndim)
+    shape = tuple([d for i, d in enumerate(a.shape) if i not in axes])
+    (out_dtype,) = _guess_out_dtypes(kernel, (a,))
+    return _LazyArray._create(
+        _REDUCTION, kernel, (a,), axes, shape, out_dtype)
+
+
+def _build_program(root):
+    # Flattens the graph into a list of operations in a topological order.
+    # Each operation is a tuple of ``(kind, func, refs, axes)``, where
+    # ``refs`` refers to the inputs of the fused function by non-negative
+    # indices and the results of the preceding operations by ``~index``.
+    leaves = []
+    leaf_refs = {}
+    node_refs = {}
+    program = []
+
+    def visit(x):
+        if isinstance(x, _LazyArray):
+            if x._value is None:
+                ref = node_refs.get(id(x))
+                if ref is None:
+                    refs = tuple([visit(a) for a in x._args])
+                    program.append((x._kind, x._func, refs, x._axes))
+                    ref = node_refs[id(x)] = ~(len(program) - 1)
+                return ref
+            x = x._value
+        ref = leaf_refs.get(id(x))
+        if ref is None:
+            ref = leaf_refs[id(x)] = len(leaves)
+            leaves.append(x)
+        return ref
+
+    visit(root)
+    return leaves, tuple(program)
+
+
+def _run_program(program, args, fusing):
+    results = []
+    for kind, func, refs, axes in program:
+        xs = [args[r] if r >= 0 else results[~r] for r in refs]
+        if kind == _UFUNC:
+            results.append(func(*xs))
+        elif fusing:
+            results.append(_fusion_thread_local.call_reduction(
+                func, xs[0], axis=axes))
+        else:
+            results.append(func(xs[0], axis=axes))
+    return results[-1]
+
+
+def _cache_get(cache, key):
+    with _cache_lock:
+        try:
+            value = cache[key]
+        except KeyError:
+            return False, None
+        cache.move_to_end(key)
+    return True, value
+
+
+def _cache_set(cache, key, value):
+    with _cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > _max_cache_size:
+            cache.popitem(last=False)
+
+
+def _signature(leaves):
+    # The types of the inputs of a graph which the fused kernel depends on.
+    return tuple([
+        (a.dtype, a.ndim) if isinstance(a, (core.ndarray, numpy.generic))
+        else type(a) for a in leaves])
+
+
+def _get_fused(program):
+    found, f = _cache_get(_fused_cache, program)
+    if found:
+        return f
+
+    def func(*args):
+        return _run_program(program, args, True)
+
+    f = fusion.Fusion(func, 'lazy_fusion')
+    _cache_set(_fused_cache, program, f)
+    return f
+
+
+def _get_pending():
+    return getattr(_thread_local, 'lazy_pending', None)
+
+
+def _input_key(x):
+    # Identifies the memory read by an input of a lazy array. Pending lazy
+    # arrays are identified by themselves until they are materialized.
+    if isinstance(x, _LazyArray):
+        if x._value is None:
+            return id(x)
+        x = x._value
+    if isinstance(x, core.ndarray):
+        return id(x.data.mem)
+    return None
+
+
+class _PendingGraphs:
+    """Lazy arrays of a thread which are not materialized yet.
+
+    This class maps the memory of each input of the lazy arrays to the lazy
+    arrays reading it directly, so that the graphs reading an array are
+    materialized before the array is written. A pending lazy array is an
+    input of its parents, so the map also links it to its parents.
+
+    The writes of ndarrays are checked while an instance exists. It is kept
+    after exiting the context until all the lazy arrays are materialized.
+    """
+
+    def __init__(self):
+        self.active = False
+        self._readers = {}
+        self._prune_size = 1024
+        core._add_lazy_tracker(1)
+
+    def __del__(self):
+        core._add_lazy_tracker(-1)
+
+    def release_if_done(self):
+        self._prune()
+        if not self._readers and _get_pending() is self:
+            _thread_local.lazy_pending = None
+
+    def add(self, node):
+        readers = self._readers
+        for a in node._args:
+            key = _input_key(a)
+            if key is None:
+                continue
+            nodes = readers.get(key)
+            if nodes is None:
+                if len(readers) >= self._prune_size:
+                    self._prune()
+                nodes = readers[key] = weakref.WeakSet()
+            nodes.add(node)
+
+    def _prune(self):
+        readers = self._readers
+        for key in [k for k, v in readers.items() if not _any_pending(v)]:
+            del readers[key]
+        self._prune_size = max(1024, 2 * len(readers))
+
+    def materialized(self, node):
+        # The parents of the node read its value from now on.
+        parents = self._readers.pop(id(node), None)
+        if parents:
+            key = id(node._value.data.mem)
+            nodes = self._readers.get(key)
+            if nodes is None:
+                self._readers[key] = parents
+            else:
+                nodes |= parents
+        if not self.active:
+            self.release_if_done()
+
+    def flush(self, key):
+        """Materializes the graphs reading the memory identified by key."""
+        nodes = self._readers.pop(key, None)
+        if not nodes:
+            return
+        refs = [weakref.ref(n) for n in nodes if n._value is None]
+        # Materializes the whole graphs from their roots, so that the
+        # operations stay fused.
+        for r in self._roots(refs):
+            root = r()
+            if root is not None:
+                root._materialize()
+        # The nodes still alive are referenced outside of the graphs.
+        for r in refs:
+            n = r()
+            if n is not None and n._value is None:
+                n._materialize()
+        if not self.active:
+            self.release_if_done()
+
+    def _roots(self, refs):
+        roots = []
+        seen = set()
+        stack = [r() for r in refs]
+        while stack:
+            n = stack.pop()
+            if n is None or n._value is not None or id(n) in seen:
+                continue
+            seen.add(id(n))
+            parents = [
+                p for p in self._readers.get(id(n), ()) if p._value is None]
+            if parents:
+                stack += parents
+            else:
+                roots.append(weakref.ref(n))
+        return roots
+
+
+def _any_pending(nodes):
+    for n in nodes:
+        if n._value is None:
+            return True
+    return False
+
+
+class _LazyArray:
+    """An array whose value is computed lazily.
+
+    This class records an operation and its arguments, which may be lazy
+    arrays too. Unless explicitly supported, attributes are looked up on
+    the materialized :class:`cupy.ndarray`.
+    """
+
+    __slots__ = (
+        '_kind', '_func', '_args', '_axes', '_n_ops', '_value',
+        'shape', 'dtype', '__weakref__')
+
+    # Makes ndarray operators return NotImplemented to call the reflected
+    # operators of this class.
+    __array_ufunc__ = None
+
+    @staticmethod
+    def _create(kind, func, args, axes, shape, dtype):
+        self = _LazyArray()
+        self._kind = kind
+        self._func = func
+        self._args = args
+        self._axes = axes
+        self._value = None
+        self.shape = shape
+        self.dtype = dtype
+        self._n_ops = 1 + sum([
+            a._n_ops for a in args if isinstance(a, _LazyArray)])
+        if self._n_ops >= _max_ops:
+            self._materialize()
+        else:
+            pending = _get_pending()
+            if pending is not None:
+                pending.add(self)
+        return self
+
+    def _materialize(self):
+        if self._value is not None:
+            return self._value
+        leaves, program = _build_program(self)
+        with _eager():
+            out = None
+            key = (program, _signature(leaves))
+            if not _cache_get(_unfusable_cache, key)[0]:
+                try:
+                    out = _get_fused(program)(*leaves)
+                except _fallback_errors:
+                    out = None
+                if not isinstance(out, core.ndarray) or (
+                        out.shape != self.shape):
+                    _cache_set(_unfusable_cache, key, None)
+                    out = None
+            if out is None:
+                # Falls back to the eager execution, which raises an error
+                # if the operations are invalid.
+                out = _run_program(program, leaves, False)
+            if out.dtype != self.dtype:
+                out = out.astype(self.dtype)
+        self._value = out
+        # Releases the graph.
+        self._func = self._args = None
+        self._n_ops = 0
+        pending = _get_pending()
+        if pending is not None:
+            pending.materialized(self)
+        return out
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return internal.prod(self.shape)
+
+    def __cupy_get_ndarray__(self):
+        return self._materialize()
+
+    def __cupy_override_elementwise_kernel__(self, kernel, *args, **kwargs):
+        if isinstance(kernel, _kernel.ufunc):
+            return call_ufunc(kernel, args, kwargs)
+        return _call_eager(kernel, args, kwargs)
+
+    def __cupy_override_reduction_kernel__(
+            self, kernel, axis, dtype, out, keepdims):
+        assert isinstance(kernel, _reduction._SimpleReductionKernel)
+        return call_reduction(kernel, self, axis, dtype, out, keepdims)
+
+    def __getattr__(self, name):
+        # Avoids materializing the array when probed for private attributes
+        # or protocols.
+        if name.startswith('_') and name not in _delegated_protocols:
+            raise AttributeError(
+                '{!r} object has no attribute {!r}'.format(
+                    type(self).__name__, name))
+        return getattr(self._materialize(), name)
+
+    def __repr__(self):
+        return repr(self._materialize())
+
+    def __str__(self):
+        return str(self._materialize())
+
+    def __format__(self, format_spec):
+        return format(self._materialize(), format_spec)
+
+    def __array__(self, dtype=None, copy=None):
+        raise TypeError(
+            'Implicit conversion to a NumPy array is not allowed. '
+            'Please use `.get()` to construct a NumPy array explicitly.')
+
+    def __len__(self):
+        return len(self._materialize())
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __getitem__(self, key):
+        return self._materialize()[key]
+
+    def __setitem__(self, key, value):
+        self._materialize()[key] = value
+
+    def __bool__(self):
+        return bool(self._materialize())
+
+    def __int__(self):
+        return int(self._materialize())
+
+    def __float__(self):
+        return float(self._materialize())
+
+    def __complex__(self):
+        return complex(self._materialize())
+
+    def __index__(self):
+        return self._materialize().__index__()
+
+    def __matmul__(self, other):
+        return self._materialize() @ other
+
+    def __rmatmul__(self, other):
+        return other @ self._materialize()
+
+    def __neg__(self):
+        return cupy.negative(self)
+
+    def __pos__(self):
+        return cupy.positive(self)
+
+    def __abs__(self):
+        return cupy.absolute(self)
+
+    def __invert__(self):
+        return cupy.invert(self)
+
+    def __add__(self, other):
+        return cupy.add(self, other)
+
+    def __radd__(self, other):
+        return cupy.add(other, self)
+
+    def __sub__(self, other):
+        return cupy.subtract(self, other)
+
+    def __rsub__(self, other):
+        return cupy.subtract(other, self)
+
+    def __mul__(self, other):
+        return cupy.multiply(self, other)
+
+    def __rmul__(self, other):
+        return cupy.multiply(other, self)
+
+    def __truediv__(self, other):
+        return cupy.true_divide(self, other)
+
+    def __rtruediv__(self, other):
+        return cupy.true_divide(other, self)
+
+    def __floordiv__(self, other):
+        return cupy.floor_divide(self, other)
+
+    def __rfloordiv__(self, other):
+        return cupy.floor_divide(other, self)
+
+    def __mod__(self, other):
+        return cupy.remainder(self, other)
+
+    def __rmod__(self, other):
+        return cupy.remainder(other, self)
+
+    def __pow__(self, other):
+        return cupy.power(self, other)
+
+    def __rpow__(self, other):
+        return cupy.power(other, self)
+
+    def __lshift__(self, other):
+        return cupy.left_shift(self, other)
+
+    def __rlshift__(self, other):
+        return cupy.left_shift(other, self)
+
+    def __rshift__(self, other):
+        return cupy.right_shift(self, other)
+
+    def __rrshift__(self, other):
+        return cupy.right_shift(other, self)
+
+    def __and__(self, other):
+        return cupy.bitwise_and(self, other)
+
+    def __rand__(self, other):
+        return cupy.bitwise_and(other, self)
+
+    def __or__(self, other):
+        return cupy.bitwise_or(self, other)
+
+    def __ror__(self, other):
+        return cupy.bitwise_or(other, self)
+
+    def __xor__(self, other):
+        return cupy.bitwise_xor(self, other)
+
+    def __rxor__(self, other):
+        return cupy.bitwise_xor(other, self)
+
+    def __lt__(self, other):
+        return cupy.less(self, other)
+
+    def __le__(self, other):
+        return cupy.less_equal(self, other)
+
+    def __eq__(self, other):
+        return cupy.equal(self, other)
+
+    def __ne__(self, other):
+        return cupy.not_equal(self, other)
+
+    def __ge__(self, other):
+        return cupy.greater_equal(self, other)
+
+    def __gt__(self, other):
+        return cupy.greater(self, other)
+
+    def astype(self, dtype, order='K', casting=None, subok=None, copy=True):
+        if (order == 'K' and casting is None and subok is None
+                and _fusion_thread_local.is_lazy()
+                and _user_frame() is not None):
+            dtype = numpy.dtype(dtype)
+            if not copy and dtype == self.dtype:
+                return self
+            if _fusion_interface._dtype_to_astype_dict is None:
+                _fusion_interface._set_dtype_to_astype_dict()
+            return _fusion_interface._dtype_to_astype_dict[dtype](self)
+        return self._materialize().astype(
+            dtype, order=order, casting=casting, subok=subok, copy=copy)
+
+    def sum(self, axis=None, dtype=None, out=None, keepdims=False):
+        return call_reduction(
+            _math._sum_auto_dtype, self, axis, dtype, out, keepdims)
+
+    def prod(self, axis=None, dtype=None, out=None, keepdims=False):
+        return call_reduction(
+            _math._prod_auto_dtype, self, axis, dtype, out, keepdims)
+
+    def max(self, axis=None, out=None, keepdims=False):
+        return call_reduction(
+            _statistics.amax, self, axis, None, out, keepdims)
+
+    def min(self, axis=None, out=None, keepdims=False):
+        return call_reduction(
+            _statistics.amin, self, axis, None, out, keepdims)
+
+    def all(self, axis=None, out=None, keepdims=False):
+        return call_reduction(_logic.all, self, axis, None, out, keepdims)
+
+    def any(self, axis=None, out=None, keepdims=False):
+        return call_reduction(_logic.any, self, axis, None, out, keepdims)
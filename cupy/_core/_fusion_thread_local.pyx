@@ -24,6 +24,14 @@ cpdef inline bint is_fusing() except? -1:
     return is_old_fusing() or is_new_fusing()
 
 
+cpdef inline bint is_lazy() except? -1:
+    try:
+        return thread_local.is_lazy
+    except AttributeError:
+        thread_local.is_lazy = False
+    return False
+
+
 def check_not_runtime():
     assert is_new_fusing()
 
@@ -44,3 +52,23 @@ def call_reduction(fusion_op, *args, **kwargs):
 
 def call_indexing(fusion_op, *args, **kwargs):
     return thread_local.history.call_indexing(fusion_op, *args, **kwargs)
+
+
+def call_lazy_operator(ufunc, args):
+    if not is_lazy():
+        return NotImplemented
+    from cupy._core import _fusion_lazy
+    return _fusion_lazy.call_operator(ufunc, args)
+
+
+def call_lazy_comparison(int op, x, y):
+    if not is_lazy():
+        return NotImplemented
+    from cupy._core import _fusion_lazy
+    return _fusion_lazy.call_operator(_fusion_lazy._comparisons()[op], (x, y))
+
+
+def flush_lazy_readers(x):
+    pending = getattr(thread_local, 'lazy_pending', None)
+    if pending is not None:
+        pending.flush(id(x.data.mem))
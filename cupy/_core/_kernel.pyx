@@ -864,6 +864,8 @@ cdef class ElementwiseKernel:
         arg_list, _ = _preprocess_args(dev_id, args, True)
 
         out_args = arg_list[self.nin:]
+        for o in out_args:
+            core._flush_lazy_readers(o)
         # _broadcast updates shape
         in_args = _broadcast(
             arg_list, self.params, size != -1, shape)[:self.nin]
@@ -1294,6 +1296,8 @@ cdef class ufunc:
         in_args, weaks = _preprocess_args(dev_id, in_args, False)
         out_args = _preprocess_optional_args(dev_id, out_args, False)
         given_out_args = [o for o in out_args if o is not None]
+        for o in given_out_args:
+            core._flush_lazy_readers(o)
 
         # TODO(kataoka): Typecheck `in_args` w.r.t. `casting` (before
         # broadcast).
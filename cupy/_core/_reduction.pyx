@@ -20,6 +20,7 @@ from cupy._core cimport _scalar
 from cupy._core._scalar import get_typename as _get_typename
 from cupy._core.core cimport _convert_object_with_cuda_array_interface
 from cupy._core.core cimport _create_ndarray_from_shape_strides
+from cupy._core.core cimport _flush_lazy_readers
 from cupy._core.core cimport compile_with_cache
 from cupy._core.core cimport _ndarray_base
 from cupy._core cimport internal
@@ -314,6 +315,8 @@ cdef class _AbstractReductionKernel:
         cdef _ndarray_base ret
         cdef bint cub_success
 
+        for o in out_args:
+            _flush_lazy_readers(o)
         if dtype is not None:
             dtype = get_dtype(dtype).type
 
@@ -14,10 +14,12 @@ from cupy import _environment
 from cupy._core._kernel import create_ufunc
 from cupy._core._kernel import ElementwiseKernel
 from cupy._core._ufuncs import elementwise_copy
+from cupy._core import _fusion_thread_local
 from cupy._core import flags
 from cupy._core import syncdetect
 from cupy import cuda
 from cupy.cuda import memory as memory_module
+from cupy.cuda import _pinned_staging
 from cupy.cuda import stream as stream_mod
 
 
@@ -87,6 +89,66 @@ cdef inline _should_use_rop(x, y):
     return y_ufunc is None
 
 
+# Mirrors whether the staging of cupy.cuda._pinned_staging is enabled, so
+# that get() and set() do not call into the module while it is disabled.
+cdef bint _pinned_staging_enabled = _pinned_staging._enabled
+
+
+def _set_pinned_staging_enabled(bint enabled):
+    global _pinned_staging_enabled
+    _pinned_staging_enabled = enabled
+
+
+# The number of the contexts of cupyx.lazy_fusion entered in all threads.
+# Operators check it before the thread-local lazy mode, so that they do not
+# pay for the lazy mode when it is not in use.
+cdef int _n_lazy_contexts = 0
+
+
+def _enter_lazy_context():
+    global _n_lazy_contexts
+    _n_lazy_contexts += 1
+
+
+def _exit_lazy_context():
+    global _n_lazy_contexts
+    _n_lazy_contexts -= 1
+
+
+# The number of the objects tracking the inputs of pending lazy arrays in
+# all threads. Writes of ndarrays are checked only while it is not zero.
+cdef int _n_lazy_trackers = 0
+
+
+def _add_lazy_tracker(int delta):
+    global _n_lazy_trackers
+    _n_lazy_trackers += delta
+
+
+# Defer operators in the lazy mode (see cupyx.lazy_fusion). They return
+# NotImplemented if the operator is to be executed immediately.
+@cython.profile(False)
+cdef inline object _lazy_unary(ufunc, x):
+    if _n_lazy_contexts == 0:
+        return NotImplemented
+    return _fusion_thread_local.call_lazy_operator(ufunc, (x,))
+
+
+@cython.profile(False)
+cdef inline object _lazy_binary(ufunc, x, y):
+    if _n_lazy_contexts == 0:
+        return NotImplemented
+    return _fusion_thread_local.call_lazy_operator(ufunc, (x, y))
+
+
+# Materializes the lazy arrays of this thread which read ``x`` before ``x`` is
+# written, so that the deferred operations see the old values.
+cdef int _flush_lazy_readers(x) except -1:
+    if _n_lazy_trackers != 0 and isinstance(x, _ndarray_base):
+        _fusion_thread_local.flush_lazy_readers(x)
+    return 0
+
+
 cdef tuple _HANDLED_TYPES
 
 cdef object _null_context = contextlib.nullcontext()
@@ -740,6 +802,7 @@ cdef class _ndarray_base:
             value = value.astype(self.dtype, copy=False).item()
 
         if value == 0 and self._c_contiguous:
+            _flush_lazy_readers(self)
             self.data.memset_async(0, self.nbytes)
         else:
             fill_kernel(value, self)
@@ -1189,6 +1252,10 @@ cdef class _ndarray_base:
     # Comparison operators:
 
     def __richcmp__(object self, object other, int op):
+        if _n_lazy_contexts != 0:
+            ret = _fusion_thread_local.call_lazy_comparison(op, self, other)
+            if ret is not NotImplemented:
+                return ret
         if isinstance(other, ndarray):
             if op == 0:
                 return _logic._ndarray_less(self, other)
@@ -1251,6 +1318,9 @@ cdef class _ndarray_base:
     # Unary operations:
 
     def __neg__(self):
+        ret = _lazy_unary(_math._negative, self)
+        if ret is not NotImplemented:
+            return ret
         return _math._negative(self)
 
     def __pos__(self):
@@ -1259,17 +1329,29 @@ cdef class _ndarray_base:
                    'Returning a copy, but in the future this will error.')
             warnings.warn(msg, DeprecationWarning)
             return self.copy()
+        ret = _lazy_unary(_math._positive, self)
+        if ret is not NotImplemented:
+            return ret
         return _math._positive(self)
 
     def __abs__(self):
+        ret = _lazy_unary(_math._absolute, self)
+        if ret is not NotImplemented:
+            return ret
         return _math._absolute(self)
 
     def __invert__(self):
+        ret = _lazy_unary(_binary._invert, self)
+        if ret is not NotImplemented:
+            return ret
         return _binary._invert(self)
 
     # Arithmetic:
 
     def __add__(x, y):
+        ret = _lazy_binary(_math._add, x, y)
+        if ret is not NotImplemented:
+            return ret
         if isinstance(y, ndarray):
             return _math._add(x, y)
         elif _should_use_rop(x, y):
@@ -1278,6 +1360,9 @@ cdef class _ndarray_base:
             return numpy.add(x, y)
 
     def __sub__(x, y):
+        ret = _lazy_binary(_math._subtract, x, y)
+        if ret is not NotImplemented:
+            return ret
         if isinstance(y, ndarray):
             return _math._subtract(x, y)
         elif _should_use_rop(x, y):
@@ -1286,6 +1371,9 @@ cdef class _ndarray_base:
             return numpy.subtract(x, y)
 
     def __mul__(x, y):
+        ret = _lazy_binary(_math._multiply, x, y)
+        if ret is not NotImplemented:
+            return ret
         if isinstance(y, ndarray):
             return _math._multiply(x, y)
         elif _should_use_rop(x, y):
@@ -1310,6 +1398,9 @@ cdef class _ndarray_base:
             return numpy.divide(x, y)
 
     def __truediv__(x, y):
+        ret = _lazy_binary(_math._true_divide, x, y)
+        if ret is not NotImplemented:
+            return ret
         if isinstance(y, ndarray):
             return _math._true_divide(x, y)
         elif _should_use_rop(x, y):
@@ -1318,6 +1409,9 @@ cdef class _ndarray_base:
             return numpy.true_divide(x, y)
 
     def __floordiv__(x, y):
+        ret = _lazy_binary(_math._floor_divide, x, y)
+        if ret is not NotImplemented:
+            return ret
         if isinstance(y, ndarray):
             return _math._floor_divide(x, y)
         elif _should_use_rop(x, y):
@@ -1326,6 +1420,9 @@ cdef class _ndarray_base:
             return numpy.floor_divide(x, y)
 
     def __mod__(x, y):
+        ret = _lazy_binary(_math._remainder, x, y)
+        if ret is not NotImplemented:
+            return ret
         if isinstance(y, ndarray):
             return _math._remainder(x, y)
         elif _should_use_rop(x, y):
@@ -1343,6 +1440,9 @@ cdef class _ndarray_base:
 
     def __pow__(x, y, modulo):
         # Note that we ignore the modulo argument as well as NumPy.
+        ret = _lazy_binary(_math._power, x, y)
+        if ret is not NotImplemented:
+            return ret
         if isinstance(y, ndarray):
             return _math._power(x, y)
         elif _should_use_rop(x, y):
@@ -1351,6 +1451,9 @@ cdef class _ndarray_base:
             return numpy.power(x, y)
 
     def __lshift__(x, y):
+        ret = _lazy_binary(_binary._left_shift, x, y)
+        if ret is not NotImplemented:
+            return ret
         if isinstance(y, ndarray):
             return _binary._left_shift(x, y)
         elif _should_use_rop(x, y):
@@ -1359,6 +1462,9 @@ cdef class _ndarray_base:
             return numpy.left_shift(x, y)
 
     def __rshift__(x, y):
+        ret = _lazy_binary(_binary._right_shift, x, y)
+        if ret is not NotImplemented:
+            return ret
         if isinstance(y, ndarray):
             return _binary._right_shift(x, y)
         elif _should_use_rop(x, y):
@@ -1367,6 +1473,9 @@ cdef class _ndarray_base:
             return numpy.right_shift(x, y)
 
     def __and__(x, y):
+        ret = _lazy_binary(_binary._bitwise_and, x, y)
+        if ret is not NotImplemented:
+            return ret
         if isinstance(y, ndarray):
             return _binary._bitwise_and(x, y)
         elif _should_use_rop(x, y):
@@ -1375,6 +1484,9 @@ cdef class _ndarray_base:
             return numpy.bitwise_and(x, y)
 
     def __or__(x, y):
+        ret = _lazy_binary(_binary._bitwise_or, x, y)
+        if ret is not NotImplemented:
+            return ret
         if isinstance(y, ndarray):
             return _binary._bitwise_or(x, y)
         elif _should_use_rop(x, y):
@@ -1383,6 +1495,9 @@ cdef class _ndarray_base:
             return numpy.bitwise_or(x, y)
 
     def __xor__(x, y):
+        ret = _lazy_binary(_binary._bitwise_xor, x, y)
+        if ret is not NotImplemented:
+            return ret
         if isinstance(y, ndarray):
             return _binary._bitwise_xor(x, y)
         elif _should_use_rop(x, y):
@@ -1577,6 +1692,7 @@ cdef class _ndarray_base:
             array([9998., 9999.])
 
         """
+        _flush_lazy_readers(self)
         if _util.ENABLE_SLICE_COPY and (
                 type(slices) is slice
                 and slices == slice(None, None, None)
@@ -1863,9 +1979,12 @@ cdef class _ndarray_base:
         prev_device = runtime.getDevice()
         try:
             runtime.setDevice(self.device.id)
-            a_gpu.data.copy_to_host_async(ptr, a_gpu.nbytes, stream)
-            if blocking:
-                stream.synchronize()
+            if not (blocking and _pinned_staging_enabled and
+                    _pinned_staging.copy_to_host(
+                        a_gpu.data, ptr, a_gpu.nbytes, stream)):
+                a_gpu.data.copy_to_host_async(ptr, a_gpu.nbytes, stream)
+                if blocking:
+                    stream.synchronize()
         finally:
             runtime.setDevice(prev_device)
         return a_cpu
@@ -1898,11 +2017,15 @@ cdef class _ndarray_base:
         if stream is None:
             stream = stream_module.get_current_stream()
 
+        _flush_lazy_readers(self)
         ptr = arr.ctypes.data
         prev_device = runtime.getDevice()
         try:
             runtime.setDevice(self.device.id)
-            self.data.copy_from_host_async(ptr, self.nbytes, stream)
+            if not (_pinned_staging_enabled and
+                    _pinned_staging.copy_from_host(
+                        self.data, ptr, self.nbytes, stream)):
+                self.data.copy_from_host_async(ptr, self.nbytes, stream)
         finally:
             runtime.setDevice(prev_device)
 
@@ -813,28 +813,21 @@ class Fusion(object):
         if _fusion_thread_local.is_old_fusing():
             return self.func(*args)
 
-        exec_cupy = False
-        for a in args:
-            if isinstance(a, core.ndarray):
-                exec_cupy = True
-                break
-        if not exec_cupy:
-            # No cupy ndarray exists in the arguments
-            return self.func(*args)
-
-        # Invalid argument types
-        for arg in args:
-            if not isinstance(arg, _acceptable_types):
-                mes = 'Invalid argument type for \'{}\': ({})'
-                arg_types = ', '.join(repr(type(a)) for a in args)
-                raise TypeError(mes.format(self.name, arg_types))
-
-        # Cache the result of execution path analysis
+        # Cache the result of execution path analysis. The key is built in
+        # the same pass as the checks of the argument types.
         cdef list params_info = []
+        cdef bint exec_cupy = False
+        cdef bint invalid = False
+        cdef bint unsupported = False
         for arg in args:
             if isinstance(arg, core.ndarray):
+                exec_cupy = True
                 params_info.append(arg.dtype.char)
                 params_info.append(arg.ndim)
+            elif invalid:
+                continue
+            elif not isinstance(arg, _acceptable_types):
+                invalid = True
             elif isinstance(arg, numpy.generic):
                 params_info.append(arg.dtype.char)
             elif arg is None:
@@ -852,7 +845,17 @@ class Fusion(object):
                 params_info.append('D')
                 params_info.append(complex)
             else:
-                assert False
+                # numpy.ndarray is not supported with cupy.ndarray.
+                unsupported = True
+
+        if not exec_cupy:
+            # No cupy ndarray exists in the arguments
+            return self.func(*args)
+        if invalid:
+            mes = 'Invalid argument type for \'{}\': ({})'
+            arg_types = ', '.join(repr(type(a)) for a in args)
+            raise TypeError(mes.format(self.name, arg_types))
+        assert not unsupported
 
         cdef tuple key = tuple(params_info)
 
@@ -3,6 +3,7 @@ import functools
 import numpy
 
 from cupy._core import core
+from cupy._core.core cimport _ndarray_base
 from cupy._core import _fusion_trace
 from cupy._core import _fusion_kernel
 from cupy._core import _fusion_thread_local
@@ -21,6 +22,45 @@ cdef tuple _fusion_argument_types = (
     core.ndarray, numpy.ndarray, numpy.generic,
     int, float, complex, bool, type(None))
 
+cdef frozenset _fast_path_scalar_types = frozenset([
+    int, float, complex, bool, type(None)])
+
+
+cdef tuple _get_signature(tuple args):
+    # Returns a key that determines the kernel and the shapes of its
+    # parameters, or None if no ndarray is given or an argument is of a type
+    # handled only by the slow path. Each ndarray is represented by its
+    # dtype, shape, contiguity and the indices of the first arguments that
+    # are the same array or share the same base, so that the key is at
+    # least as fine as the keys of the slow path.
+    cdef list key = []
+    cdef dict ids = None
+    cdef dict bases = None
+    cdef _ndarray_base a
+    cdef Py_ssize_t i
+
+    for i in range(len(args)):
+        arg = args[i]
+        if isinstance(arg, _ndarray_base):
+            a = arg
+            if ids is None:
+                ids = {}
+                bases = {}
+            base = a.base
+            key.append((
+                a.dtype.char, a.shape, a._c_contiguous, a._index_32_bits,
+                ids.setdefault(id(a), i),
+                -1 if base is None else bases.setdefault(id(base), i)))
+        elif type(arg) in _fast_path_scalar_types:
+            key.append(type(arg))
+        elif isinstance(arg, numpy.generic):
+            key.append(arg.dtype.char)
+        else:
+            return None
+    if ids is None:
+        return None
+    return tuple(key)
+
 
 def _get_fused_kernel(name, func, args):
     try:
@@ -45,6 +85,7 @@ class Fusion:
         self.func = func
         self.name = name or func.__name__
         self._cache = {}
+        self._fast_cache = {}
         # TODO(asi1024): Support switch of optimization mode.
 
     def __repr__(self):
@@ -52,6 +93,7 @@ class Fusion:
 
     def clear_cache(self):
         self._cache = {}
+        self._fast_cache = {}
 
     def __call__(self, *args, **kwargs):
         cdef int nargs = len(args)
@@ -61,6 +103,15 @@ class Fusion:
             # Inner function of composition of multiple fused functions.
             return self.func(*args)
 
+        # Fast path: find the kernel by a signature of the arguments
+        # computed in a single pass, without building the keys below.
+        signature = _get_signature(args)
+        if signature is not None:
+            entry = self._fast_cache.get(signature)
+            if entry is not None:
+                kernel, shapes = entry
+                return kernel.execute(args, shapes)
+
         exec_cupy = False
         for i in range(nargs):
             if isinstance(args[i], core.ndarray):
@@ -159,6 +210,8 @@ class Fusion:
             cache_shape[shape_key] = kernel, shapes
             kernel_list.append(kernel)
 
+        if signature is not None:
+            self._fast_cache[signature] = kernel, shapes
         return kernel.execute(args, shapes)
 
 
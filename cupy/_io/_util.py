@@ -0,0 +1,26 @@
+import cupy
+from cupy.cuda import _pinned_staging
+
+
+def to_device(arr):
+    """Sends a host array to the current device without a full host copy.
+
+    The array may be memory-mapped. Its contents are sent through pinned
+    chunks when they are contiguous and of a numeric dtype.
+    """
+    if (arr.dtype.char not in '?bhilqBHILQefdFD' or
+            not arr.dtype.isnative or
+            not (arr.flags.c_contiguous or arr.flags.f_contiguous)):
+        return cupy.array(arr)
+    order = 'F' if arr.flags.f_contiguous and not arr.flags.c_contiguous \
+        else 'C'
+    out = cupy.empty(arr.shape, arr.dtype, order)
+    if out.nbytes == 0:
+        return out
+    stream = cupy.cuda.get_current_stream()
+    ptr = arr.ctypes.data
+    if _pinned_staging._copy_from_host_chunked(
+            out.data, ptr, out.nbytes, stream,
+            _pinned_staging._chunk_size) is None:
+        out.data.copy_from_host_async(ptr, out.nbytes, stream)
+    return out
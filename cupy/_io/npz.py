@@ -1,17 +1,215 @@
+import collections
+import concurrent.futures
+import io
+import os
+import struct
+import sys
 import warnings
+import zipfile
+import zlib
 
 import numpy
 
 import cupy
+from cupy._io import _util
+from cupy.cuda import _pinned_staging
 
 
 _support_allow_pickle = (numpy.lib.NumpyVersion(numpy.__version__) >= '1.10.0')
 
+_read_array_header = {
+    (1, 0): numpy.lib.format.read_array_header_1_0,
+    (2, 0): numpy.lib.format.read_array_header_2_0,
+}
+
+
+def _is_npy_file(path):
+    with open(path, 'rb') as f:
+        magic = f.read(len(numpy.lib.format.MAGIC_PREFIX))
+    return magic == numpy.lib.format.MAGIC_PREFIX
+
+
+def _mmap_stored_member(path, info):
+    # Memory-maps an uncompressed .npy member of a zip file. Returns None if
+    # it cannot be mapped.
+    with open(path, 'rb') as f:
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        if local_header[:4] != b'PK\x03\x04':
+            return None
+        name_len, extra_len = struct.unpack('<HH', local_header[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        version = numpy.lib.format.read_magic(f)
+        if version not in _read_array_header:
+            return None
+        shape, fortran_order, dtype = _read_array_header[version](f)
+        offset = f.tell()
+    if dtype.hasobject or numpy.prod(shape) == 0:
+        return None
+    return numpy.memmap(
+        path, dtype=dtype, mode='r', offset=offset, shape=shape,
+        order='F' if fortran_order else 'C')
+
+
+def _write_device_array(fp, a):
+    # Writes a CuPy array in .npy format by transferring it to the host in
+    # chunks through pinned buffers, writing each chunk while the next one
+    # is transferred.
+    if not (a.flags.c_contiguous or a.flags.f_contiguous):
+        a = cupy.ascontiguousarray(a)
+    header = numpy.lib.format.header_data_from_array_1_0(a)
+    try:
+        numpy.lib.format.write_array_header_1_0(fp, header)
+    except ValueError:
+        # The header is too large for the format version 1.0.
+        numpy.lib.format.write_array_header_2_0(fp, header)
+    if a.nbytes == 0:
+        return
+    stream = cupy.cuda.get_current_stream()
+    with a.device:
+        chunks = _pinned_staging._to_host_chunks(
+            a.data, a.nbytes, stream, _pinned_staging._chunk_size)
+        if chunks is None:
+            fp.write(a.get(order='A').tobytes(order='A'))
+            return
+        for _, buf, size in chunks:
+            fp.write(memoryview(buf)[:size])
+
+
+def _write_array(fp, arr, allow_pickle=True):
+    if isinstance(arr, cupy.ndarray):
+        _write_device_array(fp, arr)
+    else:
+        numpy.lib.format.write_array(
+            fp, numpy.asanyarray(arr), allow_pickle=allow_pickle)
+
+
+def _deflate_chunk(data, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+class _ParallelCompressor(object):
+
+    # Compresses the data written to a zip member on a thread pool. Each
+    # chunk is deflated independently and ends with a sync flush, so that
+    # the outputs concatenate into a single raw deflate stream, as pigz
+    # does. The stream is terminated with an empty final block.
+
+    def __init__(self, executor, level, max_pending):
+        self._executor = executor
+        self._level = level
+        self._max_pending = max_pending
+        self._pending = collections.deque()
+
+    def compress(self, data):
+        self._pending.append(self._executor.submit(
+            _deflate_chunk, bytes(data), self._level))
+        out = []
+        while self._pending and (len(self._pending) > self._max_pending or
+                                 self._pending[0].done()):
+            out.append(self._pending.popleft().result())
+        return b''.join(out)
+
+    def flush(self):
+        out = [future.result() for future in self._pending]
+        self._pending.clear()
+        out.append(zlib.compressobj(
+            self._level, zlib.DEFLATED, -15).flush(zlib.Z_FINISH))
+        return b''.join(out)
+
+
+# Number of threads to compress the members of `savez_compressed`.
+_compress_workers = os.cpu_count() or 1
+
+# Python versions whose `zipfile` is known to compress the data written to a
+# member with its private `_compressor` attribute, which `_savez` replaces
+# to compress in parallel.
+_compressor_hook_versions = ((3, 9), (3, 14))
+
+# Whether the `_compressor` attribute can be replaced; None if not checked.
+_compressor_hook_works = None
+
+
+class _ProbeCompressor(object):
+
+    def __init__(self, compressor):
+        self._compressor = compressor
+        self.called = False
+
+    def compress(self, data):
+        self.called = True
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+
+def _can_replace_compressor():
+    # Checks that a replaced `_compressor` takes effect and produces a valid
+    # member, so that `_savez` falls back to the serial compression if
+    # `zipfile` changes its internals.
+    global _compressor_hook_works
+    if _compressor_hook_works is None:
+        works = False
+        lo, hi = _compressor_hook_versions
+        if lo <= sys.version_info[:2] <= hi:
+            buf = io.BytesIO()
+            data = b'cupy' * 16
+            with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                with zipf.open('probe', 'w') as fp:
+                    compressor = getattr(fp, '_compressor', None)
+                    if compressor is not None:
+                        probe = fp._compressor = _ProbeCompressor(compressor)
+                        fp.write(data)
+                        works = probe.called
+            if works:
+                with zipfile.ZipFile(buf) as zipf:
+                    works = zipf.read('probe') == data
+        _compressor_hook_works = works
+    return _compressor_hook_works
+
+
+def _savez(file, args, kwds, compress):
+    if not hasattr(file, 'write'):
+        file = os.fspath(file)
+        if not file.endswith('.npz'):
+            file = file + '.npz'
+
+    namedict = kwds
+    for i, val in enumerate(args):
+        key = 'arr_%d' % i
+        if key in namedict.keys():
+            raise ValueError(
+                'Cannot use un-named variables and keyword %s' % key)
+        namedict[key] = val
+
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    executor = None
+    if compress and _compress_workers > 1 and _can_replace_compressor():
+        executor = concurrent.futures.ThreadPoolExecutor(_compress_workers)
+    try:
+        with zipfile.ZipFile(file, mode='w', compression=compression,
+                             allowZip64=True) as zipf:
+            for key, val in namedict.items():
+                # always force zip64 as NumPy does (numpy/numpy#10776)
+                with zipf.open(key + '.npy', 'w', force_zip64=True) as fp:
+                    if (executor is not None and
+                            getattr(fp, '_compressor', None) is not None):
+                        fp._compressor = _ParallelCompressor(
+                            executor, zlib.Z_DEFAULT_COMPRESSION,
+                            _compress_workers * 2)
+                    _write_array(fp, val)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
 
 class NpzFile(object):
 
-    def __init__(self, npz_file):
+    def __init__(self, npz_file, path=None):
         self.npz_file = npz_file
+        self._path = path
 
     def __enter__(self):
         self.npz_file.__enter__()
@@ -21,8 +219,23 @@ class NpzFile(object):
         self.npz_file.__exit__(typ, val, traceback)
 
     def __getitem__(self, key):
+        if self._path is not None:
+            # Uncompressed members are memory-mapped and streamed to the
+            # device instead of being read into the host memory at once.
+            member = key
+            if key in self.npz_file.files:
+                member = key + '.npy'
+            try:
+                info = self.npz_file.zip.getinfo(member)
+            except KeyError:
+                info = None
+            if (info is not None and
+                    info.compress_type == zipfile.ZIP_STORED):
+                arr = _mmap_stored_member(self._path, info)
+                if arr is not None:
+                    return _util.to_device(arr)
         arr = self.npz_file[key]
-        return cupy.array(arr)
+        return _util.to_device(arr)
 
     def close(self):
         self.npz_file.close()
@@ -35,6 +248,11 @@ def load(file, mmap_mode=None, allow_pickle=None):
     current device. NPZ file is converted to NpzFile object, which defers the
     transfer to the time of accessing the items.
 
+    When ``file`` is a path, the arrays in an ``.npy`` file or uncompressed
+    ``.npz`` file are memory-mapped and streamed to the device in chunks
+    through pinned memory, so that the whole file is not read into the host
+    memory at once.
+
     Args:
         file (file-like object or string): The file to read.
         mmap_mode (None, 'r+', 'r', 'w+', 'c'): If not ``None``, memory-map the
@@ -59,6 +277,19 @@ def load(file, mmap_mode=None, allow_pickle=None):
     .. seealso:: :func:`numpy.load`
 
     """
+    path = None
+    if isinstance(file, (str, os.PathLike)):
+        path = os.fspath(file)
+        if mmap_mode in (None, 'r', 'c') and _is_npy_file(path):
+            # The array is read from the memory-mapped file in chunks.
+            try:
+                obj = numpy.load(path, 'r')
+            except ValueError:
+                # e.g., object arrays and empty arrays cannot be mapped.
+                pass
+            else:
+                return _util.to_device(obj)
+
     if _support_allow_pickle:
         allow_pickle = False if allow_pickle is None else allow_pickle
         obj = numpy.load(file, mmap_mode, allow_pickle)
@@ -68,9 +299,9 @@ def load(file, mmap_mode=None, allow_pickle=None):
         obj = numpy.load(file, mmap_mode)
 
     if isinstance(obj, numpy.ndarray):
-        return cupy.array(obj)
+        return _util.to_device(obj)
     elif isinstance(obj, numpy.lib.npyio.NpzFile):
-        return NpzFile(obj)
+        return NpzFile(obj, path)
     else:
         return obj
 
@@ -94,9 +325,24 @@ def save(file, arr, allow_pickle=None):
             In NumPy 1.9, this option cannot be specified (saving objects
             using pickles is always allowed).
 
+    .. note::
+        A CuPy array is written in chunks transferred through pinned memory,
+        without copying the whole array to the host memory at once.
+
     .. seealso:: :func:`numpy.save`
 
     """
+    if isinstance(arr, cupy.ndarray):
+        if hasattr(file, 'write'):
+            _write_device_array(file, arr)
+        else:
+            file = os.fspath(file)
+            if not file.endswith('.npy'):
+                file = file + '.npy'
+            with open(file, 'wb') as f:
+                _write_device_array(f, arr)
+        return
+
     if _support_allow_pickle:
         allow_pickle = True if allow_pickle is None else allow_pickle
         numpy.save(file, cupy.asnumpy(arr), allow_pickle)
@@ -120,27 +366,25 @@ def savez(file, *args, **kwds):
         *args: Arrays with implicit keys.
         **kwds: Arrays with explicit keys.
 
+    .. note::
+        CuPy arrays are written in chunks transferred through pinned memory,
+        without copying the whole arrays to the host memory at once.
+
     .. seealso:: :func:`numpy.savez`
 
     """
-    args = map(cupy.asnumpy, args)
-    for key in kwds:
-        kwds[key] = cupy.asnumpy(kwds[key])
-    numpy.savez(file, *args, **kwds)
+    _savez(file, args, kwds, False)
 
 
 def savez_compressed(file, *args, **kwds):
     """Saves one or more arrays into a file in compressed ``.npz`` format.
 
     It is equivalent to :func:`cupy.savez` function except the output file is
-    compressed.
+    compressed. Large members are compressed in parallel on multiple threads.
 
     .. seealso::
        :func:`cupy.savez` for more detail,
        :func:`numpy.savez_compressed`
 
     """
-    args = map(cupy.asnumpy, args)
-    for key in kwds:
-        kwds[key] = cupy.asnumpy(kwds[key])
-    numpy.savez_compressed(file, *args, **kwds)
+    _savez(file, args, kwds, True)
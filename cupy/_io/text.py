@@ -1,13 +1,597 @@
+import codecs
+import importlib
+import mmap
+import operator
+import os
+import warnings
+
 import numpy
+
 import cupy
+from cupy import _core
+from cupy._creation import from_data
+from cupy._io import _util
+from cupy.cuda import _pinned_staging
+
+
+# Size of the blocks of the file parsed at once. A block is extended to the
+# end of the line it ends in.
+_block_size = 256 * 1024 * 1024
+
+# Modules to open compressed files by the extension, as `numpy.savetxt`
+# does. They are imported on use to keep `import cupy` fast.
+_savetxt_compressors = {
+    '.gz': 'gzip', '.bz2': 'bz2', '.xz': 'lzma', '.lzma': 'lzma'}
+
+_preamble = r'''
+#include <cupy/math_constants.h>
+
+__device__ bool _loadtxt_is_space(unsigned char c) {
+    return c == ' ' || c == '\t' || c == '\r' || c == '\v' || c == '\f';
+}
+
+// Returns the end of the line [s, e) excluding a comment.
+__device__ long long _loadtxt_content_end(
+        const unsigned char* buf, long long s, long long e, int comment) {
+    if (comment >= 0) {
+        for (long long k = s; k < e; ++k) {
+            if (buf[k] == comment) return k;
+        }
+    }
+    return e;
+}
+
+__device__ bool _loadtxt_is_blank(
+        const unsigned char* buf, long long s, long long e) {
+    for (long long k = s; k < e; ++k) {
+        if (!_loadtxt_is_space(buf[k])) return false;
+    }
+    return true;
+}
+
+// Finds the field starting at *s in the line ending at e. Sets [*fs, *fe)
+// to the field stripped of whitespace and advances *s to the next field.
+// Returns false if there is no field left.
+__device__ bool _loadtxt_next_field(
+        const unsigned char* buf, long long* s, long long e, int delimiter,
+        long long* fs, long long* fe) {
+    long long k = *s;
+    if (delimiter < 0) {
+        while (k < e && _loadtxt_is_space(buf[k])) ++k;
+        if (k == e) return false;
+        *fs = k;
+        while (k < e && !_loadtxt_is_space(buf[k])) ++k;
+        *fe = k;
+        *s = k;
+        return true;
+    }
+    if (k > e) return false;
+    long long d = k;
+    while (d < e && buf[d] != delimiter) ++d;
+    *s = d + 1;
+    while (k < d && _loadtxt_is_space(buf[k])) ++k;
+    while (d > k && _loadtxt_is_space(buf[d - 1])) --d;
+    *fs = k;
+    *fe = d;
+    return true;
+}
+
+__device__ bool _loadtxt_match(
+        const unsigned char* p, const unsigned char* end, const char* word) {
+    for (; *word; ++p, ++word) {
+        if (p == end || (*p | 0x20) != *word) return false;
+    }
+    return p == end;
+}
+
+// Parses an integer into its sign and magnitude.
+__device__ bool _loadtxt_parse_int(
+        const unsigned char* p, const unsigned char* end, bool* neg,
+        unsigned long long* out) {
+    *neg = false;
+    if (p < end && (*p == '+' || *p == '-')) {
+        *neg = *p == '-';
+        ++p;
+    }
+    if (p == end) return false;
+    unsigned long long v = 0;
+    for (; p < end; ++p) {
+        unsigned int d = *p - '0';
+        if (d > 9 || v > (0xffffffffffffffffull - d) / 10) return false;
+        v = v * 10 + d;
+    }
+    *out = v;
+    return true;
+}
+
+struct _loadtxt_dd {
+    double hi, lo;
+};
+
+__device__ _loadtxt_dd _loadtxt_dd_norm(double hi, double lo) {
+    double s = hi + lo;
+    _loadtxt_dd r = {s, lo - (s - hi)};
+    return r;
+}
+
+__device__ _loadtxt_dd _loadtxt_dd_mul(_loadtxt_dd a, _loadtxt_dd b) {
+    double p = a.hi * b.hi;
+    if (isinf(p)) {
+        _loadtxt_dd r = {p, 0.0};
+        return r;
+    }
+    double e = fma(a.hi, b.hi, -p) + (a.hi * b.lo + a.lo * b.hi);
+    return _loadtxt_dd_norm(p, e);
+}
+
+__device__ _loadtxt_dd _loadtxt_dd_div(_loadtxt_dd a, _loadtxt_dd b) {
+    double q = a.hi / b.hi;
+    _loadtxt_dd qb = {q, 0.0};
+    qb = _loadtxt_dd_mul(qb, b);
+    double r = (a.hi - qb.hi) - qb.lo + a.lo;
+    return _loadtxt_dd_norm(q, r / b.hi);
+}
+
+// Returns 10 ** n for n >= 0 in double-double precision.
+__device__ _loadtxt_dd _loadtxt_pow10(int n) {
+    _loadtxt_dd r = {1.0, 0.0};
+    _loadtxt_dd b = {10.0, 0.0};
+    for (; n != 0; n >>= 1) {
+        if (n & 1) r = _loadtxt_dd_mul(r, b);
+        if (n > 1) b = _loadtxt_dd_mul(b, b);
+    }
+    return r;
+}
+
+__device__ bool _loadtxt_parse_double(
+        const unsigned char* p, const unsigned char* end, double* out) {
+    // Powers of ten exactly representable in double.
+    const double exact[] = {
+        1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, 1e11,
+        1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22};
+    bool neg = false;
+    if (p < end && (*p == '+' || *p == '-')) {
+        neg = *p == '-';
+        ++p;
+    }
+    double v;
+    if (_loadtxt_match(p, end, "nan")) {
+        v = CUDART_NAN;
+    } else if (_loadtxt_match(p, end, "inf") ||
+               _loadtxt_match(p, end, "infinity")) {
+        v = CUDART_INF;
+    } else {
+        // Accumulate up to 19 significant digits into an integer mantissa.
+        // The digits after them are ignored.
+        unsigned long long mant = 0;
+        int ndigits = 0;
+        int exp10 = 0;
+        bool any = false;
+        for (; p < end && (unsigned int)(*p - '0') <= 9; ++p) {
+            any = true;
+            if (ndigits < 19) {
+                mant = mant * 10 + (*p - '0');
+                if (mant != 0) ++ndigits;
+            } else {
+                ++exp10;
+            }
+        }
+        if (p < end && *p == '.') {
+            for (++p; p < end && (unsigned int)(*p - '0') <= 9; ++p) {
+                any = true;
+                if (ndigits < 19) {
+                    mant = mant * 10 + (*p - '0');
+                    if (mant != 0) ++ndigits;
+                    --exp10;
+                }
+            }
+        }
+        if (!any) return false;
+        if (p < end && (*p == 'e' || *p == 'E')) {
+            ++p;
+            bool eneg = false;
+            if (p < end && (*p == '+' || *p == '-')) {
+                eneg = *p == '-';
+                ++p;
+            }
+            if (p == end) return false;
+            int e = 0;
+            for (; p < end && (unsigned int)(*p - '0') <= 9; ++p) {
+                if (e < 100000) e = e * 10 + (*p - '0');
+            }
+            exp10 += eneg ? -e : e;
+        }
+        if (p != end) return false;
+        if (mant == 0) {
+            v = 0.0;
+        } else if (mant < (1ull << 53) && exp10 >= -22 && exp10 <= 22) {
+            // Both operands are exact, so the result is correctly rounded.
+            v = (double)mant;
+            v = exp10 < 0 ? v / exact[-exp10] : v * exact[exp10];
+        } else {
+            // Scale the mantissa in double-double precision, which rounds
+            // correctly except when the value is extremely close to a tie.
+            double hi = (double)mant;
+            _loadtxt_dd m = {
+                hi, (double)(long long)(mant - (unsigned long long)hi)};
+            int scale = 0;
+            if (exp10 >= 0) {
+                m = _loadtxt_dd_mul(m, _loadtxt_pow10(exp10));
+            } else {
+                if (exp10 < -280) {
+                    // Keep the low part away from the subnormal range.
+                    scale = 200;
+                    m.hi = ldexp(m.hi, scale);
+                    m.lo = ldexp(m.lo, scale);
+                }
+                if (exp10 < -300) {
+                    m = _loadtxt_dd_div(m, _loadtxt_pow10(300));
+                    exp10 += 300;
+                }
+                m = _loadtxt_dd_div(m, _loadtxt_pow10(-exp10));
+            }
+            v = ldexp(m.hi, -scale);
+            if (v < 2.2250738585072014e-308) {
+                // Round the subnormal value again with the low part.
+                double half = ldexp(1.0, scale - 1075);
+                double err = m.hi - ldexp(v, scale);
+                double up = (err - half) + m.lo;
+                double down = (err + half) + m.lo;
+                bool odd = (long long)ldexp(v, 1074) & 1;
+                if (up > 0.0 || (up == 0.0 && odd)) {
+                    v = nextafter(v, CUDART_INF);
+                } else if (down < 0.0 || (down == 0.0 && odd)) {
+                    v = nextafter(v, 0.0);
+                }
+            }
+        }
+    }
+    *out = neg ? -v : v;
+    return true;
+}
+'''
+
+_count_fields_kernel = _core.ElementwiseKernel(
+    'raw uint8 buf, raw int64 starts, raw int64 ends, int32 comment, '
+    'int32 delimiter',
+    'int32 n',
+    '''
+    long long s = starts[i];
+    long long e = _loadtxt_content_end(&buf[0], s, ends[i], comment);
+    int count = 0;
+    if (!_loadtxt_is_blank(&buf[0], s, e)) {
+        long long fs, fe;
+        while (_loadtxt_next_field(&buf[0], &s, e, delimiter, &fs, &fe)) {
+            ++count;
+        }
+    }
+    n = count;
+    ''',
+    'cupy_loadtxt_count_fields',
+    preamble=_preamble)
+
+_parse_fields_kernel = _core.ElementwiseKernel(
+    'raw uint8 buf, raw int64 starts, raw int64 ends, raw int32 rows, '
+    'raw int32 col_map, int32 ncols_out, int32 comment, int32 delimiter, '
+    'bool integer, uint64 neg_max, uint64 pos_max',
+    'raw T out, raw int32 err',
+    '''
+    int row = rows[i];
+    if (row >= 0) {
+        long long s = starts[i];
+        long long e = _loadtxt_content_end(&buf[0], s, ends[i], comment);
+        long long fs, fe;
+        for (int j = 0;
+             _loadtxt_next_field(&buf[0], &s, e, delimiter, &fs, &fe);
+             ++j) {
+            int c = col_map[j];
+            if (c < 0) continue;
+            bool ok;
+            long long idx = (long long)row * ncols_out + c;
+            if (integer) {
+                bool neg;
+                unsigned long long v;
+                ok = _loadtxt_parse_int(&buf[fs], &buf[fe], &neg, &v) &&
+                     v <= (neg ? neg_max : pos_max);
+                out[idx] = neg ? (T)(long long)(0ull - v) : (T)v;
+            } else {
+                double v;
+                ok = _loadtxt_parse_double(&buf[fs], &buf[fe], &v);
+                out[idx] = (T)v;
+            }
+            if (!ok) atomicMin(&err[0], (int)i);
+        }
+    }
+    ''',
+    'cupy_loadtxt_parse_fields',
+    preamble=_preamble)
+
+
+def _get_char(value, name):
+    # Returns the code of a single ASCII character, -1 for None, or raises
+    # TypeError if the parser on the device does not support the value.
+    if value is None:
+        return -1
+    if isinstance(value, bytes):
+        value = value.decode('latin-1')
+    if isinstance(value, str) and len(value) == 1 and ord(value) < 128:
+        return ord(value)
+    raise TypeError('unsupported {}: {!r}'.format(name, value))
+
+
+def _open_source(fname):
+    # Returns a tuple of the file object to memory-map, the offset to start
+    # reading at and whether the file object has to be closed, or None if
+    # the source cannot be memory-mapped.
+    if isinstance(fname, (str, bytes, os.PathLike)):
+        path = os.fspath(fname)
+        ext = os.path.splitext(path)[1].lower()
+        if (ext in ('.gz', '.bz2', '.xz', '.lzma')
+                or not os.path.isfile(path)):
+            return None
+        return open(path, 'rb'), 0, True
+    if 'b' not in getattr(fname, 'mode', ''):
+        return None
+    try:
+        fname.fileno()
+        return fname, fname.tell(), False
+    except (AttributeError, OSError):
+        return None
 
 
-def savetxt(fname, X, *args, **kwargs):
+def _skip_lines(mm, start, skiprows):
+    # Returns the offset after ``skiprows`` lines from ``start`` and the
+    # number of the lines skipped.
+    size = len(mm)
+    line = 0
+    while line < skiprows and start < size:
+        nl = mm.find(b'\n', start)
+        start = size if nl < 0 else nl + 1
+        line += 1
+    return start, line
+
+
+def _iter_blocks(mm, start):
+    # Yields ``(offset, end)`` of the blocks of whole lines in the memory map.
+    size = len(mm)
+    while start < size:
+        end = min(start + _block_size, size)
+        if end < size:
+            nl = mm.rfind(b'\n', start, end)
+            if nl < 0:
+                nl = mm.find(b'\n', end)
+            end = size if nl < 0 else nl + 1
+        yield start, end
+        start = end
+
+
+def _count_lines(mm, start):
+    # Returns the number of the lines from ``start`` to the end.
+    count = 0
+    for offset, end in _iter_blocks(mm, start):
+        block = numpy.frombuffer(mm, numpy.uint8, end - offset, offset)
+        count += int(numpy.count_nonzero(block == ord('\n')))
+    if mm[len(mm) - 1:] != b'\n':
+        count += 1
+    return count
+
+
+def _parse_block(mm, offset, end, line, dtype, comment, delimiter, usecols,
+                 ncols, out, row):
+    # Parses the lines in ``mm[offset:end]`` on the device, where ``line``
+    # is the number of the lines before the block, into ``out[row:]``.
+    # ``out`` is allocated for the lines from the block to the end of the
+    # file if it is None. Returns ``out``, the number of the rows parsed,
+    # the number of columns in the file and the number of the lines in the
+    # block. The rows are not parsed if all the lines are blank.
+    buf = _util.to_device(numpy.frombuffer(mm, numpy.uint8, end - offset,
+                                           offset))
+    ends = cupy.flatnonzero(buf == ord('\n'))
+    if mm[end - 1:end] != b'\n':
+        ends = cupy.concatenate([ends, cupy.array([len(buf)], ends.dtype)])
+    starts = cupy.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+
+    n = _count_fields_kernel(buf, starts, ends, comment, delimiter,
+                             cupy.empty(len(ends), numpy.int32))
+    nonblank = n > 0
+    if ncols is None:
+        first = int(nonblank.argmax())
+        ncols = int(n[first])
+        if ncols == 0:
+            return out, 0, None, len(ends), None
+    mismatch = nonblank & (n != ncols)
+    if mismatch.any():
+        i = int(mismatch.argmax())
+        raise ValueError(
+            'the number of columns changed from {} to {} at line {}; use '
+            '`usecols` to select a subset and avoid this error'.format(
+                ncols, int(n[i]), line + i + 1))
+    rows = cupy.cumsum(nonblank, dtype=numpy.int32) - 1
+    nrows = int(rows[-1]) + 1
+    rows[~nonblank] = -1
+
+    if usecols is None:
+        usecols = range(ncols)
+    fields = []
+    inverse = []
+    for c in usecols:
+        if not -ncols <= c < ncols:
+            raise ValueError(
+                'invalid column index {} at line {} with {} columns'.format(
+                    c, line + int(nonblank.argmax()) + 1, ncols))
+        # A column selected more than once is parsed once.
+        c %= ncols
+        if c not in fields:
+            fields.append(c)
+        inverse.append(fields.index(c))
+    col_map = numpy.full(ncols, -1, numpy.int32)
+    col_map[fields] = numpy.arange(len(fields), dtype=numpy.int32)
+
+    if dtype.kind in 'iu':
+        info = numpy.iinfo(dtype)
+        integer = True
+        neg_max, pos_max = -int(info.min), int(info.max)
+    else:
+        integer = False
+        neg_max = pos_max = 0
+    if out is None:
+        # The lines from the block to the end of the file bound the number
+        # of the rows.
+        out = cupy.empty((_count_lines(mm, offset), len(fields)), dtype)
+    no_error = numpy.iinfo(numpy.int32).max
+    err = cupy.full(1, no_error, numpy.int32)
+    _parse_fields_kernel(
+        buf, starts, ends, rows, cupy.asarray(col_map), len(fields),
+        comment, delimiter, integer, numpy.uint64(neg_max),
+        numpy.uint64(pos_max), out[row:row + nrows], err, size=len(ends))
+    i = int(err[0])
+    if i != no_error:
+        text = mm[offset + int(starts[i]):offset + int(ends[i])]
+        raise ValueError('could not convert line {} to {}: {!r}'.format(
+            line + i + 1, dtype, text.decode('latin-1').rstrip()))
+    return out, nrows, ncols, len(ends), inverse
+
+
+def _loadtxt(mm, start, dtype, comment, delimiter, skiprows, usecols):
+    parse_dtype = numpy.dtype(numpy.float64) if dtype.char == 'e' else dtype
+    out = None
+    row = 0
+    ncols = None
+    inverse = None
+    start, line = _skip_lines(mm, start, skiprows)
+    for offset, end in _iter_blocks(mm, start):
+        out, nrows, ncols_, nlines, inverse_ = _parse_block(
+            mm, offset, end, line, parse_dtype, comment, delimiter, usecols,
+            ncols, out, row)
+        if nrows:
+            ncols, inverse = ncols_, inverse_
+            row += nrows
+        line += nlines
+    if row == 0:
+        return None
+    # Blank lines and comments leave unused rows at the end.
+    out = out[:row]
+    if inverse != list(range(len(inverse))):
+        out = out[:, inverse]
+    return out.astype(dtype, copy=False)
+
+
+def loadtxt(fname, dtype=float, comments='#', delimiter=None,
+            converters=None, skiprows=0, usecols=None, unpack=False,
+            ndmin=0, encoding=None, max_rows=None, **kwargs):
+    """Load data from a text file.
+
+    When ``fname`` is a path or a file object opened in binary mode, the
+    file is memory-mapped and parsed on the device: blocks of whole lines
+    are sent to the device as raw bytes, and the lines are split into
+    fields and the fields are converted to numbers by CUDA kernels. Only
+    the parsed array and one block of the file are kept in the device
+    memory, so that files larger than the device memory can be loaded as
+    long as the result fits.
+
+    The parsing on the device supports numeric ``dtype`` other than complex
+    types, ``comments`` and ``delimiter`` of a single character other than
+    a space or a newline, ``skiprows``, ``usecols``, ``unpack`` and
+    ``ndmin``. Floating-point values may differ from NumPy in the last bit
+    when they have more than 15 significant digits or an exponent beyond
+    ``1e22``, as digits after the 19th significant one are ignored. Other
+    arguments and sources fall back to NumPy's ``loadtxt``, and the result
+    is coerced to a CuPy array.
+
+    .. seealso:: :func:`numpy.loadtxt`
+    """
+    source = None
+    try:
+        dtype_ = numpy.dtype(dtype)
+        comment = _get_char(comments, 'comments')
+        delim = _get_char(delimiter, 'delimiter')
+        if (converters is None and max_rows is None and not kwargs
+                and (dtype_.char in 'efd' or dtype_.kind in 'iu')
+                and delim not in (ord(' '), ord('\n'), ord('\r'))
+                and (delim < 0 or delim != comment)
+                and (encoding in (None, 'bytes') or codecs.lookup(
+                    encoding).name in ('ascii', 'utf-8', 'iso8859-1'))):
+            source = _open_source(fname)
+    except (TypeError, LookupError):
+        pass
+    if source is None:
+        return from_data.loadtxt(
+            fname, dtype=dtype, comments=comments, delimiter=delimiter,
+            converters=converters, skiprows=skiprows, usecols=usecols,
+            unpack=unpack, ndmin=ndmin, encoding=encoding,
+            max_rows=max_rows, **kwargs)
+
+    if ndmin not in (0, 1, 2):
+        raise ValueError('Illegal value of ndmin keyword: {}'.format(ndmin))
+    if usecols is not None:
+        usecols = [operator.index(usecols)] if not hasattr(
+            usecols, '__iter__') else [operator.index(c) for c in usecols]
+    f, start, close = source
+    try:
+        size = os.fstat(f.fileno()).st_size
+        arr = None
+        if start < size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                arr = _loadtxt(mm, start, dtype_, comment, delim, skiprows,
+                               usecols)
+        if not close:
+            f.seek(max(start, size))
+    finally:
+        if close:
+            f.close()
+
+    if arr is None:
+        warnings.warn('loadtxt: input contained no data: "{}"'.format(fname),
+                      UserWarning, stacklevel=2)
+        arr = cupy.empty((0, 1 if usecols is None else len(usecols)),
+                         dtype_)
+    # Squeeze and expand the dimensions in the same way as NumPy.
+    if arr.ndim > ndmin:
+        arr = arr.squeeze()
+    if arr.ndim < ndmin:
+        if ndmin == 1:
+            arr = cupy.atleast_1d(arr)
+        else:
+            arr = cupy.atleast_2d(arr).T
+    return arr.T if unpack else arr
+
+
+def savetxt(fname, X, fmt='%.18e', delimiter=' ', newline='\n', header='',
+            footer='', comments='# ', encoding=None):
     """Save an array to a text file.
 
     .. note::
-        Uses NumPy's ``savetxt``.
+        Uses NumPy's ``savetxt``. A CuPy array is copied to the host and
+        written in blocks of rows, so that the whole array is not copied to
+        the host memory at once.
 
     .. seealso:: :func:`numpy.savetxt`
     """
-    numpy.savetxt(fname, cupy.asnumpy(X), *args, **kwargs)
+    if not isinstance(X, cupy.ndarray) or X.ndim not in (1, 2) or (
+            X.nbytes <= _pinned_staging._chunk_size):
+        numpy.savetxt(fname, cupy.asnumpy(X), fmt, delimiter, newline,
+                      header, footer, comments, encoding)
+        return
+
+    if isinstance(fname, os.PathLike):
+        fname = os.fspath(fname)
+    if isinstance(fname, str):
+        module = _savetxt_compressors.get(os.path.splitext(fname)[1])
+        opener = open if module is None else (
+            importlib.import_module(module).open)
+        with opener(fname, 'wt', encoding=encoding) as f:
+            savetxt(f, X, fmt, delimiter, newline, header, footer, comments,
+                    encoding)
+        return
+
+    row_bytes = X.nbytes // X.shape[0]
+    rows = max(1, _pinned_staging._chunk_size // row_bytes)
+    n = X.shape[0]
+    for start in range(0, n, rows):
+        stop = min(start + rows, n)
+        numpy.savetxt(
+            fname, X[start:stop].get(), fmt, delimiter, newline,
+            header if start == 0 else '', footer if stop == n else '',
+            comments, encoding)
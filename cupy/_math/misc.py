@@ -1,5 +1,4 @@
 import cupy
-import cupyx.scipy.fft
 
 from cupy import _core
 from cupy._core import _routines_math as _math
@@ -78,6 +77,7 @@ def convolve(a, v, mode='full'):
 
 
 def _fft_convolve(a1, a2, mode):
+    import cupyx.scipy.fft
 
     offset = 0
     if a1.shape[-1] < a2.shape[-1]:
@@ -140,6 +140,9 @@ from cupy.cuda.pinned_memory import PinnedMemory  # NOQA
 from cupy.cuda.pinned_memory import PinnedMemoryPointer  # NOQA
 from cupy.cuda.pinned_memory import PinnedMemoryPool  # NOQA
 from cupy.cuda.pinned_memory import set_pinned_memory_allocator  # NOQA
+from cupy.cuda._pinned_staging import get_pinned_staging_stats  # NOQA
+from cupy.cuda._pinned_staging import reset_pinned_staging_stats  # NOQA
+from cupy.cuda._pinned_staging import set_pinned_staging  # NOQA
 from cupy.cuda.stream import Event  # NOQA
 from cupy.cuda.stream import get_current_stream  # NOQA
 from cupy.cuda.stream import get_elapsed_time  # NOQA
@@ -0,0 +1,559 @@
+"""On-disk storage of compiled kernel binaries.
+
+The compiler (:mod:`cupy.cuda.compiler`) looks up and stores compiled
+binaries through the cache objects defined in this module. Each binary is
+keyed by a hash-based file name (e.g., ``<sha1>.cubin``) and stored with the
+hash of its content prepended so that partially written entries can be
+detected and ignored.
+
+Two backends are available, selected by the ``CUPY_CACHE_BACKEND``
+environment variable:
+
+- ``file`` (default): one file per binary (:class:`_DiskCache`).
+- ``packed``: all binaries in a single append-only blob file with a
+  memory-mapped index (:class:`_PackedCache`).
+"""
+
+import contextlib
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+_has_usedforsecurity = (sys.version_info >= (3, 9))
+
+
+def _hash(value):
+    if _has_usedforsecurity:
+        return hashlib.sha1(value, usedforsecurity=False)
+    return hashlib.sha1(value)
+
+
+def _hash_digest(value):
+    return _hash(value).digest()
+
+
+def _hash_hexdigest(value):
+    return _hash(value).hexdigest()
+
+
+_hash_length = len(_hash_hexdigest(b''))  # 40 for SHA1
+
+# Extensions of the binaries stored in the cache. Other files found in the
+# cache directory (e.g., CUDA sources saved with CUPY_CACHE_SAVE_CUDA_SOURCE)
+# are treated as sidecars of the binary they are named after.
+_binary_exts = ('.cubin', '.hsaco')
+_sidecar_exts = ('.cu', '.cpp')
+
+# When a limit is exceeded, entries are evicted until the cache shrinks
+# below this fraction of the limit, so that the directory is not rescanned
+# on every store.
+_evict_low_water = 0.9
+
+
+def _get_int_env_variable(name, default):
+    val = os.environ.get(name)
+    if val is None or len(val) == 0:
+        return default
+    try:
+        return int(val)
+    except ValueError:
+        return default
+
+
+def _pack(binary):
+    return _hash_hexdigest(binary).encode('ascii') + binary
+
+
+def _unpack(data):
+    # Returns the binary, or None if the data is truncated or corrupted.
+    if len(data) < _hash_length:
+        return None
+    hash_value = data[:_hash_length]
+    binary = data[_hash_length:]
+    if hash_value != _hash_hexdigest(binary).encode('ascii'):
+        return None
+    return binary
+
+
+class _DiskCache:
+
+    """Sharded kernel cache directory with an optional size limit.
+
+    Entries are stored under ``<cache_dir>/<first two hex digits>/<name>``
+    so that no single directory holds a huge number of files. Entries
+    written by older versions of CuPy directly under ``cache_dir`` are
+    still found and moved into their shard on first access.
+
+    When ``max_bytes`` or ``max_entries`` is positive, the least recently
+    used entries are removed once the cache grows beyond the limit. The
+    modification time of an entry is bumped on every hit and used as its
+    last access time, as access times are unreliable on filesystems
+    mounted with ``noatime``/``relatime``.
+
+    Args:
+        cache_dir (str): Path to the cache directory.
+        max_bytes (int): Maximum total size of the cached binaries in bytes.
+            ``0`` means unlimited.
+        max_entries (int): Maximum number of cached binaries. ``0`` means
+            unlimited.
+    """
+
+    def __init__(self, cache_dir, max_bytes=0, max_entries=0):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # Running estimates of the cache size, only maintained when a limit
+        # is set. ``None`` means that the directory has not been scanned yet.
+        self._bytes = None
+        self._entries = None
+
+    def _shard_dir(self, name):
+        return os.path.join(self.cache_dir, name[:2])
+
+    def get_path(self, name):
+        """Returns the path of the file storing the entry ``name``."""
+        return os.path.join(self._shard_dir(name), name)
+
+    def _has_limit(self):
+        return self.max_bytes > 0 or self.max_entries > 0
+
+    def load(self, name):
+        """Returns the cached binary for ``name``, or ``None`` on a miss."""
+        path = self.get_path(name)
+        binary = self._read(path)
+        if binary is None:
+            legacy_path = os.path.join(self.cache_dir, name)
+            binary = self._read(legacy_path)
+            if binary is not None:
+                try:
+                    os.makedirs(self._shard_dir(name), exist_ok=True)
+                    os.replace(legacy_path, path)
+                except OSError:
+                    pass
+        with self._lock:
+            if binary is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        try:
+            # Record the access for LRU eviction.
+            os.utime(path)
+        except OSError:
+            # The cache directory may be read-only.
+            pass
+        return binary
+
+    def _read(self, path):
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        return _unpack(data)
+
+    def store(self, name, binary):
+        """Stores ``binary`` as ``name`` and returns the path written."""
+        shard_dir = self._shard_dir(name)
+        os.makedirs(shard_dir, exist_ok=True)
+        path = os.path.join(shard_dir, name)
+
+        # shutil.move is not atomic operation, so it could result in a
+        # corrupted file. We detect it by appending a hash at the beginning
+        # of each cache file. If the file is corrupted, it will be ignored
+        # next time it is read.
+        data = _pack(binary)
+        with tempfile.NamedTemporaryFile(dir=shard_dir, delete=False) as tf:
+            tf.write(data)
+            temp_path = tf.name
+        shutil.move(temp_path, path)
+
+        if self._has_limit():
+            with self._lock:
+                if self._bytes is None:
+                    self._bytes, self._entries = self._scan_totals()
+                else:
+                    self._bytes += len(data)
+                    self._entries += 1
+                over = ((0 < self.max_bytes < self._bytes) or
+                        (0 < self.max_entries < self._entries))
+            if over:
+                self.evict()
+        return path
+
+    def _scan(self):
+        # Returns a list of (mtime, size, path) of all binaries in the cache.
+        entries = []
+        try:
+            dirs = [self.cache_dir] + [
+                e.path for e in os.scandir(self.cache_dir)
+                if len(e.name) == 2 and e.is_dir()]
+        except OSError:
+            return entries
+        for d in dirs:
+            try:
+                it = os.scandir(d)
+            except OSError:
+                continue
+            with it:
+                for e in it:
+                    if not e.name.endswith(_binary_exts):
+                        continue
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, e.path))
+        return entries
+
+    def _scan_totals(self):
+        entries = self._scan()
+        return sum(size for _, size, _ in entries), len(entries)
+
+    def evict(self):
+        """Removes least recently used entries until within the limits.
+
+        Entries are removed until both the total size and the number of
+        entries fall below 90% of the configured limits.
+        """
+        entries = self._scan()
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        total_entries = len(entries)
+        target_bytes = int(self.max_bytes * _evict_low_water)
+        target_entries = int(self.max_entries * _evict_low_water)
+        evicted = 0
+        for _, size, path in entries:
+            if not ((self.max_bytes > 0 and total_bytes > target_bytes) or
+                    (self.max_entries > 0 and
+                     total_entries > target_entries)):
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Removed concurrently by another process.
+                pass
+            except OSError:
+                continue
+            else:
+                evicted += 1
+            for ext in _sidecar_exts:
+                try:
+                    os.remove(path + ext)
+                except OSError:
+                    pass
+            total_bytes -= size
+            total_entries -= 1
+        with self._lock:
+            self._evictions += evicted
+            self._bytes = total_bytes
+            self._entries = total_entries
+        return evicted
+
+    def get_info(self):
+        """Returns a dict describing the cache and its usage statistics."""
+        total_bytes, total_entries = self._scan_totals()
+        with self._lock:
+            if self._bytes is not None:
+                self._bytes = total_bytes
+                self._entries = total_entries
+            return {
+                'backend': 'file',
+                'cache_dir': self.cache_dir,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'bytes': total_bytes,
+                'entries': total_entries,
+                'max_bytes': self.max_bytes,
+                'max_entries': self.max_entries,
+            }
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    # Exclusive inter-process lock held on the file at ``path``.
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# Index record: SHA1 digest of the entry name, offset and length of the
+# packed binary in the blob file.
+_index_record = struct.Struct('<20sQQ')
+
+
+class _PackedCache:
+
+    """Kernel cache packed into a single blob file with an index.
+
+    The cache consists of three files in ``<cache_dir>/packed``:
+
+    - ``blobs.bin``: an append-only file holding the binaries, each
+      prepended with its hash as in :class:`_DiskCache`.
+    - ``index.bin``: an append-only sequence of fixed-size records mapping
+      the digest of an entry name to the location of its binary.
+    - ``lock``: a file locked by writers to serialize appends.
+
+    Readers do not take the lock. The index is memory-mapped and only the
+    records appended since the last lookup are parsed, so a lookup costs a
+    dictionary access and a single read from the blob file. A binary is
+    always appended before its index record, and a torn write is detected
+    by the hash check.
+
+    As the files are append-only, the size limits of :class:`_DiskCache` do
+    not apply to this backend; :meth:`clear` can be used to reset it.
+
+    Args:
+        cache_dir (str): Path to the cache directory.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.max_bytes = 0
+        self.max_entries = 0
+        self._dir = os.path.join(cache_dir, 'packed')
+        self._blob_path = os.path.join(self._dir, 'blobs.bin')
+        self._index_path = os.path.join(self._dir, 'index.bin')
+        self._lock_path = os.path.join(self._dir, 'lock')
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        # digest -> (offset, length)
+        self._index = {}
+        self._index_parsed = 0
+        self._index_file = None
+        self._blob_file = None
+
+    def _key(self, name):
+        return _hash_digest(name.encode('ascii'))
+
+    def _refresh_index(self):
+        # Parses the records appended to the index since the last call.
+        # Must be called with self._lock held.
+        if self._index_file is not None:
+            try:
+                ino = os.stat(self._index_path).st_ino
+            except FileNotFoundError:
+                ino = None
+            if ino != os.fstat(self._index_file.fileno()).st_ino:
+                # Cleared by another process.
+                self._close()
+                self._index = {}
+                self._index_parsed = 0
+        if self._index_file is None:
+            try:
+                self._index_file = open(self._index_path, 'rb')
+            except FileNotFoundError:
+                return
+        size = os.fstat(self._index_file.fileno()).st_size
+        size -= size % _index_record.size
+        if size <= self._index_parsed:
+            return
+        with mmap.mmap(self._index_file.fileno(), size,
+                       access=mmap.ACCESS_READ) as m:
+            for key, offset, length in _index_record.iter_unpack(
+                    m[self._index_parsed:size]):
+                self._index[key] = (offset, length)
+        self._index_parsed = size
+
+    def _read_blob(self, offset, length):
+        # Must be called with self._lock held.
+        if self._blob_file is None:
+            self._blob_file = open(self._blob_path, 'rb')
+        fd = self._blob_file.fileno()
+        if hasattr(os, 'pread'):
+            return os.pread(fd, length, offset)
+        self._blob_file.seek(offset)
+        return self._blob_file.read(length)
+
+    def load(self, name):
+        """Returns the cached binary for ``name``, or ``None`` on a miss."""
+        key = self._key(name)
+        with self._lock:
+            loc = self._index.get(key)
+            if loc is None:
+                self._refresh_index()
+                loc = self._index.get(key)
+            binary = None
+            if loc is not None:
+                try:
+                    binary = _unpack(self._read_blob(*loc))
+                except OSError:
+                    pass
+            if binary is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return binary
+
+    def store(self, name, binary):
+        """Appends ``binary`` as ``name`` to the cache.
+
+        Returns ``None`` as the entry is not stored in a file of its own.
+        """
+        key = self._key(name)
+        data = _pack(binary)
+        os.makedirs(self._dir, exist_ok=True)
+        with self._lock, _file_lock(self._lock_path):
+            self._refresh_index()
+            if key in self._index:
+                # Stored concurrently by another process.
+                return None
+            with open(self._blob_path, 'ab') as f:
+                f.seek(0, os.SEEK_END)
+                offset = f.tell()
+                f.write(data)
+            with open(self._index_path, 'ab') as f:
+                f.write(_index_record.pack(key, offset, len(data)))
+            self._index[key] = (offset, len(data))
+        return None
+
+    def evict(self):
+        return 0
+
+    def clear(self):
+        """Removes all entries from the cache."""
+        os.makedirs(self._dir, exist_ok=True)
+        with self._lock, _file_lock(self._lock_path):
+            self._close()
+            for path in (self._index_path, self._blob_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._index = {}
+            self._index_parsed = 0
+
+    def _close(self):
+        for f in (self._index_file, self._blob_file):
+            if f is not None:
+                f.close()
+        self._index_file = self._blob_file = None
+
+    def get_info(self):
+        """Returns a dict describing the cache and its usage statistics."""
+        with self._lock:
+            self._refresh_index()
+            try:
+                total_bytes = os.path.getsize(self._blob_path)
+            except OSError:
+                total_bytes = 0
+            return {
+                'backend': 'packed',
+                'cache_dir': self.cache_dir,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': 0,
+                'bytes': total_bytes,
+                'entries': len(self._index),
+                'max_bytes': self.max_bytes,
+                'max_entries': self.max_entries,
+            }
+
+
+def load_toolchain_fingerprint(cache_dir, key):
+    """Returns the toolchain fingerprint stored for ``key``, or ``None``.
+
+    The fingerprint is the result of preprocessing an empty file with the
+    compiler, which is a part of the kernel cache key. It is persisted in
+    ``<cache_dir>/toolchain`` so that new processes do not need to run the
+    compiler just to compute cache keys.
+    """
+    path = os.path.join(cache_dir, 'toolchain', _hash_hexdigest(
+        key.encode('utf-8')))
+    try:
+        with open(path, 'rb') as f:
+            data = _unpack(f.read())
+    except OSError:
+        return None
+    if data is None:
+        return None
+    # The fingerprint is either str (CUDA) or bytes (HIP).
+    kind, value = data[:1], data[1:]
+    if kind == b's':
+        return value.decode('utf-8')
+    elif kind == b'b':
+        return value
+    return None
+
+
+def store_toolchain_fingerprint(cache_dir, key, fingerprint):
+    """Persists the toolchain fingerprint for ``key``."""
+    if isinstance(fingerprint, str):
+        data = b's' + fingerprint.encode('utf-8')
+    else:
+        data = b'b' + bytes(fingerprint)
+    toolchain_dir = os.path.join(cache_dir, 'toolchain')
+    path = os.path.join(toolchain_dir, _hash_hexdigest(key.encode('utf-8')))
+    try:
+        os.makedirs(toolchain_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+                dir=toolchain_dir, delete=False) as tf:
+            tf.write(_pack(data))
+            temp_path = tf.name
+        os.replace(temp_path, path)
+    except OSError:
+        # The fingerprint is recomputed next time.
+        pass
+
+
+_caches: dict = {}
+_caches_lock = threading.Lock()
+
+
+def get_disk_cache(cache_dir):
+    """Returns the cache object for ``cache_dir``.
+
+    The backend is selected by the ``CUPY_CACHE_BACKEND`` environment
+    variable (``file`` or ``packed``) and the limits are read from the
+    ``CUPY_CACHE_MAX_BYTES`` and ``CUPY_CACHE_MAX_ENTRIES`` environment
+    variables. Statistics are kept per process for each cache directory.
+    """
+    backend = os.environ.get('CUPY_CACHE_BACKEND') or 'file'
+    if backend not in ('file', 'packed'):
+        raise ValueError(
+            'Invalid CUPY_CACHE_BACKEND: {} '
+            '(must be "file" or "packed")'.format(backend))
+    key = (backend, cache_dir)
+    cache = _caches.get(key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(key)
+            if cache is None:
+                if backend == 'file':
+                    cache = _DiskCache(cache_dir)
+                else:
+                    cache = _PackedCache(cache_dir)
+                _caches[key] = cache
+    if backend == 'file':
+        cache.max_bytes = _get_int_env_variable('CUPY_CACHE_MAX_BYTES', 0)
+        cache.max_entries = _get_int_env_variable('CUPY_CACHE_MAX_ENTRIES', 0)
+    return cache
@@ -0,0 +1,210 @@
+"""Staging of host-device copies through pooled pinned buffers.
+
+Copies between device memory and pageable host memory are slow as the
+driver copies through its own small pinned buffer synchronously. When the
+staging is enabled, :meth:`cupy.ndarray.get` and :meth:`cupy.ndarray.set`
+copy through pinned buffers obtained from the pinned memory allocator
+(:class:`cupy.cuda.PinnedMemoryPool` by default) instead. Large arrays are
+split into chunks of a fixed size, so that the buffers are reused across
+transfers, and the host-side copy of a chunk overlaps with the DMA of the
+next one.
+"""
+
+import ctypes
+import os
+import threading
+
+from cupy_backends.cuda.api import runtime
+from cupy.cuda import pinned_memory
+
+
+def _get_bool_env_variable(name, default):
+    val = os.environ.get(name)
+    if val is None or len(val) == 0:
+        return default
+    try:
+        return int(val) == 1
+    except ValueError:
+        return False
+
+
+_enabled = _get_bool_env_variable('CUPY_PINNED_STAGING', False)
+_chunk_size = 4 * 1024 * 1024
+_min_bytes = 64 * 1024
+
+_stats_lock = threading.Lock()
+_stats = {
+    'host_to_device_bytes': 0,
+    'device_to_host_bytes': 0,
+    'n_host_to_device': 0,
+    'n_device_to_host': 0,
+}
+
+
+def set_pinned_staging(enabled=True, chunk_size=None, min_bytes=None):
+    """Enables or disables staging host-device copies via pinned memory.
+
+    When enabled, :meth:`cupy.ndarray.get` (with ``blocking=True``) and
+    :meth:`cupy.ndarray.set` copy data between device memory and pageable
+    host memory through pinned buffers allocated from the pinned memory
+    pool, which usually achieves a higher bandwidth. Host arrays already
+    backed by pinned memory are copied directly.
+
+    The staging can also be enabled by setting ``CUPY_PINNED_STAGING``
+    environment variable to ``1``.
+
+    Args:
+        enabled (bool): Whether to enable the staging.
+        chunk_size (int): Size of the pinned buffers in bytes. Larger arrays
+            are copied in chunks of this size through two buffers. The
+            default is 4 MiB.
+        min_bytes (int): Arrays smaller than this number of bytes are copied
+            directly. The default is 64 KiB.
+    """
+    global _enabled, _chunk_size, _min_bytes
+    if chunk_size is not None:
+        if chunk_size <= 0:
+            raise ValueError(
+                'chunk_size must be positive: {}'.format(chunk_size))
+        _chunk_size = chunk_size
+    if min_bytes is not None:
+        if min_bytes < 0:
+            raise ValueError(
+                'min_bytes out of range: {}'.format(min_bytes))
+        _min_bytes = min_bytes
+    _enabled = bool(enabled)
+    # defer import to here to avoid circular dependency
+    from cupy._core import core
+    core._set_pinned_staging_enabled(_enabled)
+
+
+def get_pinned_staging_stats():
+    """Returns the statistics of the staged copies.
+
+    Returns:
+        dict: A dictionary with the following keys.
+
+        - ``'host_to_device_bytes'``, ``'device_to_host_bytes'``: the number
+          of bytes copied through the pinned buffers in each direction.
+        - ``'n_host_to_device'``, ``'n_device_to_host'``: the number of
+          staged copies in each direction.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_pinned_staging_stats():
+    """Resets the statistics returned by :func:`get_pinned_staging_stats`.
+    """
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
+
+
+def _count(direction, nbytes):
+    with _stats_lock:
+        _stats[direction + '_bytes'] += nbytes
+        _stats['n_' + direction] += 1
+
+
+def _use_staging(host_ptr, nbytes):
+    return (_enabled and nbytes >= _min_bytes and nbytes > 0
+            and not pinned_memory.is_memory_pinned(host_ptr))
+
+
+def _alloc_buffers(nbytes, chunk_size):
+    n = 1 if nbytes <= chunk_size else 2
+    try:
+        return [pinned_memory.alloc_pinned_memory(min(chunk_size, nbytes))
+                for _ in range(n)]
+    except runtime.CUDARuntimeError as e:
+        if e.status != runtime.errorMemoryAllocation:
+            raise
+        return None
+
+
+def copy_to_host(memptr, host_ptr, nbytes, stream):
+    """Copies device memory to host memory through pinned buffers.
+
+    The copy is synchronous with respect to the host. Returns ``False``
+    without copying if the staging is not applicable, e.g., when it is
+    disabled or the pinned buffers could not be allocated.
+    """
+    if not _use_staging(host_ptr, nbytes):
+        return False
+    return _copy_to_host_chunked(memptr, host_ptr, nbytes, stream, _chunk_size)
+
+
+def copy_from_host(memptr, host_ptr, nbytes, stream):
+    """Copies host memory to device memory through pinned buffers.
+
+    The copy is asynchronous with respect to the host, but the host memory
+    can be modified once this function returns. Returns ``False`` without
+    copying if the staging is not applicable.
+    """
+    if not _use_staging(host_ptr, nbytes):
+        return False
+    return _copy_from_host_chunked(
+        memptr, host_ptr, nbytes, stream, _chunk_size) is not None
+
+
+def _copy_to_host_chunked(memptr, host_ptr, nbytes, stream, chunk_size):
+    # Returns False if the pinned buffers could not be allocated.
+    chunks = _to_host_chunks(memptr, nbytes, stream, chunk_size)
+    if chunks is None:
+        return False
+    for offset, buf, size in chunks:
+        ctypes.memmove(host_ptr + offset, buf.ptr, size)
+    return True
+
+
+def _to_host_chunks(memptr, nbytes, stream, chunk_size):
+    # Returns an iterator of ``(offset, buffer, size)`` of the chunks of the
+    # device memory copied to pinned buffers, or None if the buffers could
+    # not be allocated. A buffer is valid until the next item is requested,
+    # and the next chunk is transferred while the current one is consumed.
+    buffers = _alloc_buffers(nbytes, chunk_size)
+    if buffers is None:
+        return None
+    return _iter_to_host_chunks(memptr, nbytes, stream, chunk_size, buffers)
+
+
+def _iter_to_host_chunks(memptr, nbytes, stream, chunk_size, buffers):
+    pending = None
+    for i, offset in enumerate(range(0, nbytes, chunk_size)):
+        size = min(chunk_size, nbytes - offset)
+        buf = buffers[i % len(buffers)]
+        (memptr + offset).copy_to_host_async(buf.ptr, size, stream)
+        event = stream.record()
+        if pending is not None:
+            pending[0].synchronize()
+            yield pending[1:]
+        pending = (event, offset, buf, size)
+    if pending is not None:
+        pending[0].synchronize()
+        yield pending[1:]
+    _count('device_to_host', nbytes)
+
+
+def _copy_from_host_chunked(memptr, host_ptr, nbytes, stream, chunk_size):
+    # Returns the event recorded after the last chunk, or None if the pinned
+    # buffers could not be allocated.
+    buffers = _alloc_buffers(nbytes, chunk_size)
+    if buffers is None:
+        return None
+    events = [None] * len(buffers)
+    for i, offset in enumerate(range(0, nbytes, chunk_size)):
+        size = min(chunk_size, nbytes - offset)
+        j = i % len(buffers)
+        if events[j] is not None:
+            # Wait until the buffer is consumed by the previous copy.
+            events[j].synchronize()
+        ctypes.memmove(buffers[j].ptr, host_ptr + offset, size)
+        (memptr + offset).copy_from_host_async(buffers[j].ptr, size, stream)
+        events[j] = event = stream.record()
+    # Keep the buffers out of the pool until the copies complete.
+    for e, buf in zip(events, buffers):
+        if e is not None:
+            pinned_memory._add_to_watch_list(e, buf)
+    _count('host_to_device', nbytes)
+    return event
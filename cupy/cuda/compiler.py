@@ -1,5 +1,7 @@
+import concurrent.futures
 import copy
-import hashlib
+import glob
+import json
 import math
 import os
 import platform
@@ -13,6 +15,8 @@ import warnings
 from cupy.cuda import device
 from cupy.cuda import function
 from cupy.cuda import get_rocm_path
+from cupy.cuda import _kernel_cache
+from cupy.cuda._kernel_cache import _hash_hexdigest
 from cupy_backends.cuda.api import driver
 from cupy_backends.cuda.api import runtime
 from cupy_backends.cuda.libs import nvrtc
@@ -274,20 +278,6 @@ def _jitify_prep(source, options, cu_path):
     return options, headers, include_names
 
 
-_has_usedforsecurity = (sys.version_info >= (3, 9))
-
-
-def _hash_hexdigest(value):
-    if _has_usedforsecurity:
-        hashobj = hashlib.sha1(value, usedforsecurity=False)
-    else:
-        hashobj = hashlib.sha1(value)
-    return hashobj.hexdigest()
-
-
-_hash_length = len(_hash_hexdigest(b''))  # 40 for SHA1
-
-
 def compile_using_nvrtc(source, options=(), arch=None, filename='kern.cu',
                         name_expressions=None, log_stream=None,
                         cache_in_memory=False, jitify=False):
@@ -467,9 +457,162 @@ def get_cache_dir():
     return os.environ.get('CUPY_CACHE_DIR', _default_cache_dir)
 
 
+def get_cache_info(cache_dir=None):
+    """Returns the usage statistics of the kernel disk cache.
+
+    Args:
+        cache_dir (str): Path to the cache directory. If ``None``, the
+            default cache directory (see :envvar:`CUPY_CACHE_DIR`) is used.
+
+    Returns:
+        dict: A dictionary with the following keys:
+
+        - ``'backend'``: the cache layout (see :envvar:`CUPY_CACHE_BACKEND`).
+        - ``'cache_dir'``: the path to the cache directory.
+        - ``'hits'``, ``'misses'``: the number of lookups in this process
+          which found or did not find a valid binary in the cache.
+        - ``'evictions'``: the number of entries removed by this process to
+          keep the cache within its limits.
+        - ``'bytes'``, ``'entries'``: the current total size and number of
+          the binaries stored in the cache.
+        - ``'max_bytes'``, ``'max_entries'``: the limits set by
+          :envvar:`CUPY_CACHE_MAX_BYTES` and
+          :envvar:`CUPY_CACHE_MAX_ENTRIES` (``0`` means unlimited).
+    """
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+    return _kernel_cache.get_disk_cache(cache_dir).get_info()
+
+
 _empty_file_preprocess_cache: dict = {}
 
 
+def _get_loaded_libraries(name):
+    # Returns the paths to the shared libraries loaded in this process whose
+    # file names contain `name`. Only available on Linux.
+    paths = set()
+    try:
+        with open('/proc/self/maps') as f:
+            for line in f:
+                fields = line.split(None, 5)
+                if len(fields) == 6 and name in os.path.basename(fields[5]):
+                    paths.add(fields[5].strip())
+    except OSError:
+        pass
+    return sorted(paths)
+
+
+def _stat_files(paths):
+    stats = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stats.append((path, st.st_size, st.st_mtime_ns))
+    return tuple(stats)
+
+
+_toolchain_identity_cache: dict = {}
+
+
+def _get_toolchain_files(backend, toolchain_path):
+    if backend == 'nvcc':
+        # defer import to here to avoid circular dependency
+        from cupy.cuda import get_nvcc_path
+        # The path could come from the env var NVCC with options.
+        nvcc = get_nvcc_path()
+        cmd = nvcc.split()[:1] if nvcc else []
+        return [shutil.which(c) or c for c in cmd]
+    if backend == 'hipcc':
+        return [shutil.which('hipcc') or 'hipcc']
+    if backend == 'nvrtc':
+        libraries = _get_loaded_libraries('nvrtc')
+        if not libraries and _win32 and toolchain_path is not None:
+            libraries = sorted(glob.glob(
+                os.path.join(toolchain_path, 'bin', 'nvrtc64_*.dll')))
+        return libraries
+    return _get_loaded_libraries('hiprtc')
+
+
+def _get_toolchain_identity(backend, toolchain_path):
+    # Identifies the build of the compiler by the size and the modification
+    # time of its binary or library, so that the fingerprint persisted for a
+    # toolchain path is not reused after the toolchain is upgraded in place.
+    # The compiler is not run, and the result is cached for the process.
+    key = (backend, toolchain_path)
+    identity = _toolchain_identity_cache.get(key)
+    if identity is None:
+        identity = _stat_files(_get_toolchain_files(backend, toolchain_path))
+        _toolchain_identity_cache[key] = identity
+    return identity
+
+
+def _get_toolchain_fingerprint(env, cache_dir, cache_in_memory, preprocess):
+    # Returns the output of preprocessing an empty file (`preprocess()`) to
+    # include the compiler internal version in the cache key. As it requires
+    # running the compiler, it is cached in memory and also persisted to the
+    # cache directory for subsequent processes.
+    base = _empty_file_preprocess_cache.get(env, None)
+    if base is not None:
+        return base
+    if not cache_in_memory:
+        if runtime.is_hip:
+            toolchain_path = get_rocm_path()
+        else:
+            # defer import to here to avoid circular dependency
+            from cupy.cuda import get_cuda_path
+            from cupy.cuda import get_nvcc_path
+            toolchain_path = get_cuda_path()
+        identity = _get_toolchain_identity(env[3], toolchain_path)
+        if env[3] == 'nvcc':
+            toolchain_path = (toolchain_path, get_nvcc_path())
+        key = repr((env, toolchain_path, identity))
+        base = _kernel_cache.load_toolchain_fingerprint(cache_dir, key)
+    if base is None:
+        base = preprocess()
+        if not cache_in_memory:
+            _kernel_cache.store_toolchain_fingerprint(cache_dir, key, base)
+    _empty_file_preprocess_cache[env] = base
+    return base
+
+
+_recorded_keys: set = set()
+
+
+def _record_compile(source, options, arch, extra_source, backend,
+                    enable_cooperative_groups, jitify):
+    # Appends the compile request to the manifest specified by
+    # CUPY_CACHE_RECORD, so that the kernel cache can be populated ahead of
+    # time by ``python -m cupyx.tools.warm_cache``.
+    path = os.environ.get('CUPY_CACHE_RECORD')
+    if not path:
+        return
+    # Avoid repeating CuPy's headers (used as a part of the cache key) in
+    # every entry; the replay uses the headers of the installed CuPy.
+    from cupy._core import core
+    cupy_headers = (extra_source is not None
+                    and extra_source == core._get_header_source())
+    entry = {
+        'source': source,
+        'options': list(options),
+        'arch': arch,
+        'extra_source': None if cupy_headers else extra_source,
+        'cupy_headers': cupy_headers,
+        'backend': backend,
+        'enable_cooperative_groups': enable_cooperative_groups,
+        'jitify': jitify,
+    }
+    line = json.dumps(entry, sort_keys=True) + '\n'
+    key = _hash_hexdigest(line.encode('utf-8'))
+    if key in _recorded_keys:
+        return
+    _recorded_keys.add(key)
+    with _kernel_cache._file_lock(path + '.lock'):
+        with open(path, 'a') as f:
+            f.write(line)
+
+
 def _compile_module_with_cache(
         source, options=(), arch=None, cache_dir=None, extra_source=None,
         backend='nvrtc', *, enable_cooperative_groups=False,
@@ -489,6 +632,12 @@ def _compile_module_with_cache(
         _get_bool_env_variable('CUPY_CACHE_IN_MEMORY', False)
         and backend == 'nvrtc')
 
+    # Kernels compiled with name expressions are always recompiled, so
+    # there is no point in recording them.
+    if not cache_in_memory and name_expressions is None:
+        _record_compile(source, options, arch, extra_source, backend,
+                        enable_cooperative_groups, jitify)
+
     if runtime.is_hip:
         backend = 'hiprtc' if backend == 'nvrtc' else 'hipcc'
         return _compile_with_cache_hip(
@@ -501,12 +650,69 @@ def _compile_module_with_cache(
             cache_in_memory, jitify)
 
 
+def compile_many(sources, options=(), arch=None, cache_dir=None,
+                 extra_source=None, backend='nvrtc', *, max_workers=None):
+    """Compiles multiple kernel sources in parallel using the kernel cache.
+
+    Each source is looked up in and stored into the kernel disk cache as
+    done for a single kernel, but compilation of the sources is distributed
+    over a pool of threads. NVRTC and NVCC run without holding the GIL, so
+    the compilation time scales with the number of CPU cores.
+
+    Only the disk cache is filled. The in-memory caches of the kernel
+    objects, such as :class:`cupy.RawKernel` and
+    :class:`cupy.ElementwiseKernel`, are not populated; a kernel object
+    compiling one of the sources later reads the binary from the disk
+    cache instead of compiling it again.
+
+    Args:
+        sources (list of str): CUDA source codes.
+        options (tuple of str): Compiler options applied to all sources.
+        arch (str): Target architecture. If ``None``, the architecture of
+            the current device is used.
+        cache_dir (str): Path to the cache directory. If ``None``, the
+            default cache directory is used.
+        extra_source (str): Extra string used as a part of the cache key.
+        backend (str): ``'nvrtc'`` or ``'nvcc'``.
+        max_workers (int): Maximum number of threads. If ``None``, the
+            number of CPUs is used.
+
+    Returns:
+        list of cupy.cuda.function.Module: The modules loaded on the
+        current device, in the same order as ``sources``.
+
+    .. note::
+        If any of the sources fails to compile, the exception raised by
+        the first failing source in ``sources`` is propagated after all
+        other sources have been processed.
+    """
+    sources = list(sources)
+    options = tuple(options)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(sources)))
+    # The current device is thread-local, so it must be propagated to
+    # the worker threads.
+    device_id = device.get_device_id()
+
+    def _compile(source):
+        with device.Device(device_id):
+            return _compile_module_with_cache(
+                source, options, arch, cache_dir, extra_source, backend)
+
+    if max_workers == 1:
+        return [_compile(source) for source in sources]
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        futures = [executor.submit(_compile, source) for source in sources]
+        concurrent.futures.wait(futures)
+    return [future.result() for future in futures]
+
+
 def _compile_with_cache_cuda(
         source, options, arch, cache_dir, extra_source=None, backend='nvrtc',
         enable_cooperative_groups=False, name_expressions=None,
         log_stream=None, cache_in_memory=False, jitify=False):
     # NVRTC does not use extra_source. extra_source is used for cache key.
-    global _empty_file_preprocess_cache
     if cache_dir is None:
         cache_dir = get_cache_dir()
     if arch is None:
@@ -536,11 +742,10 @@ def _compile_with_cache_cuda(
     options += _get_extra_include_dir_opts()
     env = ((arch, options, _get_nvrtc_version(), backend)
            + _get_arch_for_options_for_nvrtc(arch))
-    base = _empty_file_preprocess_cache.get(env, None)
-    if base is None:
-        # This is for checking NVRTC/NVCC compiler internal version
-        base = _preprocess('', options, arch, backend)
-        _empty_file_preprocess_cache[env] = base
+    # This is for checking NVRTC/NVCC compiler internal version
+    base = _get_toolchain_fingerprint(
+        env, cache_dir, cache_in_memory,
+        lambda: _preprocess('', options, arch, backend))
 
     key_src = '%s %s %s %s' % (env, base, source, extra_source)
     key_src = key_src.encode('utf-8')
@@ -550,23 +755,16 @@ def _compile_with_cache_cuda(
 
     if not cache_in_memory:
         # Read from disk cache
-        if not os.path.isdir(cache_dir):
-            os.makedirs(cache_dir, exist_ok=True)
+        disk_cache = _kernel_cache.get_disk_cache(cache_dir)
 
         # To handle conflicts in concurrent situation, we adopt lock-free
         # method to avoid performance degradation.
         # We force recompiling to retrieve C++ mangled names if so desired.
-        path = os.path.join(cache_dir, name)
-        if os.path.exists(path) and not name_expressions:
-            with open(path, 'rb') as file:
-                data = file.read()
-            if len(data) >= _hash_length:
-                hash = data[:_hash_length]
-                cubin = data[_hash_length:]
-                cubin_hash = _hash_hexdigest(cubin).encode('ascii')
-                if hash == cubin_hash:
-                    mod.load(cubin)
-                    return mod
+        if not name_expressions:
+            cubin = disk_cache.load(name)
+            if cubin is not None:
+                mod.load(cubin)
+                return mod
     else:
         # Enforce compiling -- the resulting kernel will be cached elsewhere,
         # so we do nothing
@@ -598,20 +796,12 @@ def _compile_with_cache_cuda(
 
     if not cache_in_memory:
         # Write to disk cache
-        cubin_hash = _hash_hexdigest(cubin).encode('ascii')
-
-        # shutil.move is not atomic operation, so it could result in a
-        # corrupted file. We detect it by appending a hash at the beginning
-        # of each cache file. If the file is corrupted, it will be ignored
-        # next time it is read.
-        with tempfile.NamedTemporaryFile(dir=cache_dir, delete=False) as tf:
-            tf.write(cubin_hash)
-            tf.write(cubin)
-            temp_path = tf.name
-        shutil.move(temp_path, path)
+        path = disk_cache.store(name, cubin)
 
         # Save .cu source file along with .cubin
-        if _get_bool_env_variable('CUPY_CACHE_SAVE_CUDA_SOURCE', False):
+        # (not supported by the packed backend)
+        if (path is not None and
+                _get_bool_env_variable('CUPY_CACHE_SAVE_CUDA_SOURCE', False)):
             with open(path + '.cu', 'w') as f:
                 f.write(source)
     else:
@@ -836,8 +1026,6 @@ def _compile_with_cache_hip(source, options, arch, cache_dir, extra_source,
                             backend='hiprtc', name_expressions=None,
                             log_stream=None, cache_in_memory=False,
                             use_converter=True):
-    global _empty_file_preprocess_cache
-
     # TODO(leofang): this might be possible but is currently undocumented
     if _is_cudadevrt_needed(options):
         raise ValueError('separate compilation is not supported in HIP')
@@ -872,14 +1060,16 @@ def _compile_with_cache_hip(source, options, arch, cache_dir, extra_source,
                                         is_hiprtc=(backend == 'hiprtc'))
 
     env = (arch, options, _get_nvrtc_version(), backend)
-    base = _empty_file_preprocess_cache.get(env, None)
-    if base is None:
+
+    def preprocess():
         # This is for checking HIPRTC/HIPCC compiler internal version
         if backend == 'hiprtc':
-            base = _preprocess_hiprtc('', options)
+            return _preprocess_hiprtc('', options)
         else:
-            base = _preprocess_hipcc('', options)
-        _empty_file_preprocess_cache[env] = base
+            return _preprocess_hipcc('', options)
+
+    base = _get_toolchain_fingerprint(
+        env, cache_dir, cache_in_memory, preprocess)
 
     key_src = '%s %s %s %s' % (env, base, source, extra_source)
     key_src = key_src.encode('utf-8')
@@ -889,23 +1079,16 @@ def _compile_with_cache_hip(source, options, arch, cache_dir, extra_source,
 
     if not cache_in_memory:
         # Read from disk cache
-        if not os.path.isdir(cache_dir):
-            os.makedirs(cache_dir, exist_ok=True)
+        disk_cache = _kernel_cache.get_disk_cache(cache_dir)
 
         # To handle conflicts in concurrent situation, we adopt lock-free
         # method to avoid performance degradation.
         # We force recompiling to retrieve C++ mangled names if so desired.
-        path = os.path.join(cache_dir, name)
-        if os.path.exists(path) and not name_expressions:
-            with open(path, 'rb') as f:
-                data = f.read()
-            if len(data) >= _hash_length:
-                hash_value = data[:_hash_length]
-                binary = data[_hash_length:]
-                binary_hash = _hash_hexdigest(binary).encode('ascii')
-                if hash_value == binary_hash:
-                    mod.load(binary)
-                    return mod
+        if not name_expressions:
+            binary = disk_cache.load(name)
+            if binary is not None:
+                mod.load(binary)
+                return mod
     else:
         # Enforce compiling -- the resulting kernel will be cached elsewhere,
         # so we do nothing
@@ -922,20 +1105,12 @@ def _compile_with_cache_hip(source, options, arch, cache_dir, extra_source,
 
     if not cache_in_memory:
         # Write to disk cache
-        binary_hash = _hash_hexdigest(binary).encode('ascii')
-
-        # shutil.move is not atomic operation, so it could result in a
-        # corrupted file. We detect it by appending a hash at the beginning
-        # of each cache file. If the file is corrupted, it will be ignored
-        # next time it is read.
-        with tempfile.NamedTemporaryFile(dir=cache_dir, delete=False) as tf:
-            tf.write(binary_hash)
-            tf.write(binary)
-            temp_path = tf.name
-        shutil.move(temp_path, path)
+        path = disk_cache.store(name, binary)
 
         # Save .cu source file along with .hsaco
-        if _get_bool_env_variable('CUPY_CACHE_SAVE_CUDA_SOURCE', False):
+        # (not supported by the packed backend)
+        if (path is not None and
+                _get_bool_env_variable('CUPY_CACHE_SAVE_CUDA_SOURCE', False)):
             with open(path + '.cpp', 'w') as f:
                 f.write(source)
     else:
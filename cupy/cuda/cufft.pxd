@@ -54,6 +54,7 @@ cdef class Plan1d:
         readonly Type fft_type
 
         readonly list gpus
+        object _exec_lock  # serializes the execution in a shared cache
         list batch_share
         list gather_streams
         list gather_events
@@ -81,6 +82,7 @@ cdef class PlanNd:
 
         # TODO(leofang): support multi-GPU transforms
         readonly list gpus
+        object _exec_lock  # serializes the execution in a shared cache
 
 
 cdef class XtPlanNd:
@@ -272,6 +272,29 @@ cdef _XtFree(intptr_t ptr):
     PyMem_Free(xtArr)
 
 
+cdef _execute(intptr_t plan, intptr_t s, int fft_type, a, out,
+              direction):
+    cdef int result
+    with nogil:
+        result = cufftSetStream(<Handle>plan, <Stream>s)
+    check_result(result)
+
+    if fft_type == CUFFT_C2C:
+        execC2C(plan, a.data.ptr, out.data.ptr, direction)
+    elif fft_type == CUFFT_R2C:
+        execR2C(plan, a.data.ptr, out.data.ptr)
+    elif fft_type == CUFFT_C2R:
+        execC2R(plan, a.data.ptr, out.data.ptr)
+    elif fft_type == CUFFT_Z2Z:
+        execZ2Z(plan, a.data.ptr, out.data.ptr, direction)
+    elif fft_type == CUFFT_D2Z:
+        execD2Z(plan, a.data.ptr, out.data.ptr)
+    elif fft_type == CUFFT_Z2D:
+        execZ2D(plan, a.data.ptr, out.data.ptr)
+    else:
+        raise ValueError
+
+
 cdef class Plan1d:
     def __init__(self, int nx, int fft_type, int batch, *,
                  devices=None, out=None):
@@ -280,6 +303,7 @@ cdef class Plan1d:
         cdef int result
 
         self.handle = <intptr_t>0
+        self._exec_lock = None
         self.xtArr = <intptr_t>0  # pointer to metadata for multi-GPU buffer
         self.xtArr_buffer = None  # actual multi-GPU intermediate buffer
 
@@ -499,29 +523,22 @@ cdef class Plan1d:
         else:
             self._single_gpu_fft(a, out, direction)
 
+    def _enable_exec_lock(self):
+        if self._exec_lock is None:
+            self._exec_lock = threading.Lock()
+
     def _single_gpu_fft(self, a, out, direction):
         cdef intptr_t plan = self.handle
         cdef intptr_t s = stream.get_current_stream().ptr
-        cdef int result
 
-        with nogil:
-            result = cufftSetStream(<Handle>plan, <Stream>s)
-        check_result(result)
-
-        if self.fft_type == CUFFT_C2C:
-            execC2C(plan, a.data.ptr, out.data.ptr, direction)
-        elif self.fft_type == CUFFT_R2C:
-            execR2C(plan, a.data.ptr, out.data.ptr)
-        elif self.fft_type == CUFFT_C2R:
-            execC2R(plan, a.data.ptr, out.data.ptr)
-        elif self.fft_type == CUFFT_Z2Z:
-            execZ2Z(plan, a.data.ptr, out.data.ptr, direction)
-        elif self.fft_type == CUFFT_D2Z:
-            execD2Z(plan, a.data.ptr, out.data.ptr)
-        elif self.fft_type == CUFFT_Z2D:
-            execZ2D(plan, a.data.ptr, out.data.ptr)
+        # A plan in the cache shared by threads (see
+        # cupy.fft.config.set_plan_cache_shared) has a lock, as cuFFT does
+        # not allow executing a plan from multiple threads at a time.
+        if self._exec_lock is None:
+            _execute(plan, s, self.fft_type, a, out, direction)
         else:
-            raise ValueError
+            with self._exec_lock:
+                _execute(plan, s, self.fft_type, a, out, direction)
 
     def _multi_gpu_setup_buffer(self, a):
         cdef XtArrayDesc* xtArr_desc
@@ -755,6 +772,7 @@ cdef class PlanNd:
         cdef intptr_t ptr
 
         self.handle = <intptr_t>0
+        self._exec_lock = None
         ndim = len(shape)
 
         if inembed is None:
@@ -832,29 +850,22 @@ cdef class PlanNd:
     def __exit__(self, exc_type, exc_value, traceback):
         _thread_local._current_plan = None
 
+    def _enable_exec_lock(self):
+        if self._exec_lock is None:
+            self._exec_lock = threading.Lock()
+
     def fft(self, a, out, direction):
         cdef intptr_t plan = self.handle
         cdef intptr_t s = stream.get_current_stream().ptr
-        cdef int result
 
-        with nogil:
-            result = cufftSetStream(<Handle>plan, <Stream>s)
-        check_result(result)
-
-        if self.fft_type == CUFFT_C2C:
-            execC2C(plan, a.data.ptr, out.data.ptr, direction)
-        elif self.fft_type == CUFFT_R2C:
-            execR2C(plan, a.data.ptr, out.data.ptr)
-        elif self.fft_type == CUFFT_C2R:
-            execC2R(plan, a.data.ptr, out.data.ptr)
-        elif self.fft_type == CUFFT_Z2Z:
-            execZ2Z(plan, a.data.ptr, out.data.ptr, direction)
-        elif self.fft_type == CUFFT_D2Z:
-            execD2Z(plan, a.data.ptr, out.data.ptr)
-        elif self.fft_type == CUFFT_Z2D:
-            execZ2D(plan, a.data.ptr, out.data.ptr)
+        # A plan in the cache shared by threads (see
+        # cupy.fft.config.set_plan_cache_shared) has a lock, as cuFFT does
+        # not allow executing a plan from multiple threads at a time.
+        if self._exec_lock is None:
+            _execute(plan, s, self.fft_type, a, out, direction)
         else:
-            raise ValueError
+            with self._exec_lock:
+                _execute(plan, s, self.fft_type, a, out, direction)
 
     def _output_dtype_and_shape(self, a):
         shape = list(a.shape)
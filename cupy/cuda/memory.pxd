@@ -59,6 +59,10 @@ cdef class MemoryPool:
     cpdef size_t total_bytes(self)
     cpdef set_limit(self, size=?, fraction=?)
     cpdef size_t get_limit(self)
+    cpdef set_trim_policy(self, idle_time=?, max_free_bytes=?, interval=?)
+    cpdef size_t trim(self)
+    cpdef dict get_stats(self)
+    cpdef reset_peak_stats(self)
 
 
 @cython.no_gc
@@ -7,14 +7,17 @@ import collections
 import gc
 import os
 import threading
+import time
 import warnings
 import weakref
 
 from fastrlock cimport rlock
 from libc.stdint cimport int8_t
 from libc.stdint cimport intptr_t
+from libc.stdint cimport uint64_t
 from libc.stdint cimport UINT64_MAX
 from libcpp cimport algorithm
+from libcpp.utility cimport pair
 
 from cupy.cuda cimport device
 from cupy.cuda cimport memory_hook
@@ -275,6 +278,8 @@ cdef class _Chunk:
         readonly intptr_t stream_ident
         public _Chunk prev
         public _Chunk next
+        # Time when the chunk was freed, used by the trim policy.
+        double _free_time
 
     def __init__(self, *args):
         # For debug
@@ -866,6 +871,7 @@ cpdef size_t _bin_index_from_size(size_t size):
     return (size - 1) // ALLOCATION_UNIT_SIZE
 
 
+cdef _monotonic = time.monotonic
 cdef _gc_isenabled = gc.isenabled
 cdef _gc_disable = gc.disable
 cdef _gc_enable = gc.enable
@@ -915,6 +921,135 @@ cdef class LockAndNoGc:
         _unlock_no_gc(self._lock, self._gc)
 
 
+cdef struct _FitNode:
+    intptr_t ptr
+    size_t size
+    # The maximum size in the subtree rooted at the node.
+    size_t max_size
+    uint64_t priority
+    # Indices of the children in `_FirstFitIndex._nodes`, or -1.
+    Py_ssize_t left
+    Py_ssize_t right
+
+
+@cython.final
+cdef class _FirstFitIndex:
+    """Index of free chunks ordered by address, used by the first-fit
+    policy.
+
+    This is a treap keyed by the address, whose nodes also hold the
+    maximum size in their subtree. The chunk with the lowest address that
+    fits a size is found in O(log n) expected time, as are insertions and
+    removals.
+    """
+
+    cdef:
+        vector.vector[_FitNode] _nodes
+        # Indices of the unused entries of `_nodes`.
+        vector.vector[Py_ssize_t] _unused
+        Py_ssize_t _root
+        uint64_t _seed
+
+    def __init__(self):
+        self._root = -1
+        self._seed = 0x9E3779B97F4A7C15
+
+    cdef uint64_t _random(self):
+        # xorshift64
+        cdef uint64_t x = self._seed
+        x ^= x << 13
+        x ^= x >> 7
+        x ^= x << 17
+        self._seed = x
+        return x
+
+    cdef size_t _max_size(self, Py_ssize_t t):
+        return 0 if t < 0 else self._nodes[t].max_size
+
+    cdef void _update(self, Py_ssize_t t):
+        cdef size_t m = self._nodes[t].size
+        cdef size_t m_left = self._max_size(self._nodes[t].left)
+        cdef size_t m_right = self._max_size(self._nodes[t].right)
+        if m < m_left:
+            m = m_left
+        if m < m_right:
+            m = m_right
+        self._nodes[t].max_size = m
+
+    cdef void _split(self, Py_ssize_t t, intptr_t ptr,
+                     Py_ssize_t* left, Py_ssize_t* right):
+        # Splits the subtree into the nodes with the addresses lower than
+        # `ptr` and the others.
+        if t < 0:
+            left[0] = right[0] = -1
+            return
+        if self._nodes[t].ptr < ptr:
+            self._split(self._nodes[t].right, ptr, &self._nodes[t].right,
+                        right)
+            left[0] = t
+        else:
+            self._split(self._nodes[t].left, ptr, left,
+                        &self._nodes[t].left)
+            right[0] = t
+        self._update(t)
+
+    cdef Py_ssize_t _merge(self, Py_ssize_t left, Py_ssize_t right):
+        # All the addresses in `left` must be lower than those in `right`.
+        cdef Py_ssize_t t
+        if left < 0:
+            return right
+        if right < 0:
+            return left
+        if self._nodes[left].priority > self._nodes[right].priority:
+            t = self._merge(self._nodes[left].right, right)
+            self._nodes[left].right = t
+            self._update(left)
+            return left
+        t = self._merge(left, self._nodes[right].left)
+        self._nodes[right].left = t
+        self._update(right)
+        return right
+
+    cdef insert(self, intptr_t ptr, size_t size):
+        cdef _FitNode node
+        cdef Py_ssize_t t, left, right
+        node.ptr = ptr
+        node.size = node.max_size = size
+        node.priority = self._random()
+        node.left = node.right = -1
+        if self._unused.empty():
+            t = <Py_ssize_t>self._nodes.size()
+            self._nodes.push_back(node)
+        else:
+            t = self._unused.back()
+            self._unused.pop_back()
+            self._nodes[t] = node
+        self._split(self._root, ptr, &left, &right)
+        self._root = self._merge(self._merge(left, t), right)
+
+    cdef erase(self, intptr_t ptr):
+        cdef Py_ssize_t left, mid, right
+        self._split(self._root, ptr, &left, &right)
+        self._split(right, ptr + 1, &mid, &right)
+        if mid >= 0:
+            self._unused.push_back(mid)
+        self._root = self._merge(left, right)
+
+    cdef bint find_first(self, size_t size, intptr_t* ptr):
+        """Finds the lowest address of the chunks that fit ``size``."""
+        cdef Py_ssize_t t = self._root
+        if t < 0 or self._nodes[t].max_size < size:
+            return False
+        while True:
+            if self._max_size(self._nodes[t].left) >= size:
+                t = self._nodes[t].left
+            elif self._nodes[t].size >= size:
+                ptr[0] = self._nodes[t].ptr
+                return True
+            else:
+                t = self._nodes[t].right
+
+
 @cython.final
 cdef class _Arena:
 
@@ -926,8 +1061,22 @@ cdef class _Arena:
         # `_free_lock` must be acquired to access it.
         vector.vector[int8_t] _flag
 
-    def __init__(self):
+        # Whether to maintain the index of free chunks ordered by address,
+        # used by the first-fit policy.
+        readonly bint _first_fit
+        # Index of the free chunks ordered by address.
+        # `_free_lock` must be acquired to access it.
+        _FirstFitIndex _ordered
+        # Map from memory pointer to the chunk in `_ordered`.
+        # `_free_lock` must be acquired to access it.
+        dict _ordered_chunks
+
+    def __init__(self, bint first_fit=False):
         self._free = []
+        self._first_fit = first_fit
+        if first_fit:
+            self._ordered = _FirstFitIndex()
+            self._ordered_chunks = {}
 
     cdef append_to_free_list(self, _Chunk chunk):
         # need self._free_lock
@@ -950,6 +1099,10 @@ cdef class _Arena:
             self._free.insert(index, free_list)
         free_list.add(chunk)
         self._flag[index] = 1
+        if self._first_fit:
+            ptr = chunk.ptr()
+            self._ordered.insert(ptr, chunk.size)
+            self._ordered_chunks[ptr] = chunk
 
     cdef bint remove_from_free_list(self, _Chunk chunk):
         """Removes the chunk from the free list (need self._free_lock).
@@ -981,9 +1134,31 @@ cdef class _Arena:
             if len(free_list) == 0:
                 self._free[index] = None
                 self._flag[index] = 0
+            if self._first_fit:
+                self._remove_from_ordered(chunk)
             return True
         return False
 
+    cdef _remove_from_ordered(self, _Chunk chunk):
+        # need self._free_lock
+        ptr = chunk.ptr()
+        self._ordered.erase(ptr)
+        del self._ordered_chunks[ptr]
+
+    cdef _Chunk pop_first_fit(self, size_t size):
+        """Removes and returns the free chunk with the lowest address that
+        fits ``size``.
+
+        Returns ``None`` if no chunk fits (need self._free_lock).
+        """
+        cdef intptr_t ptr
+        cdef _Chunk chunk
+        if not self._ordered.find_first(size, &ptr):
+            return None
+        chunk = self._ordered_chunks[ptr]
+        self.remove_from_free_list(chunk)
+        return chunk
+
 
 # cpdef because uint-tested
 # module-level function can be inlined
@@ -1010,10 +1185,28 @@ cdef class SingleDeviceMemoryPool:
       cudaMalloc.
     - If the cudaMalloc fails, the allocator will free all cached blocks that
       are not split and retry the allocation.
+
+    Args:
+        allocator (function): The base CuPy memory allocator.
+        policy (str): The policy to choose a cached block for an allocation.
+            ``'bin'`` (default) looks up free lists binned by size and picks
+            any block from the first non-empty bin that fits, i.e., a block
+            of the smallest size that fits. ``'first_fit'`` picks the block
+            with the lowest address that fits, whatever its size. It packs
+            long-lived allocations at low addresses, so that the blocks
+            freed at higher addresses are merged into large blocks. This
+            reduces the memory reserved by workloads alternating large
+            transient buffers and medium long-lived ones, but may increase
+            it for workloads with random lifetimes. It costs a second index
+            of the free blocks ordered by address, kept in sync with the
+            bins on every split and merge. The index is a search tree, so
+            the allocation time grows logarithmically with the number of
+            free blocks.
     """
 
     cdef:
         object _allocator
+        bint _first_fit
 
         # Map from memory pointer of the chunk (intptr_t) to the corresponding
         # Chunk object. All chunks currently allocated to the application from
@@ -1033,6 +1226,33 @@ cdef class SingleDeviceMemoryPool:
         # `_total_bytes_lock` must be acquired to access it.
         size_t _total_bytes_limit
 
+        # Statistics reported by `get_stats()`.
+        # `_in_use_lock` must be acquired to access them.
+        size_t _used_bytes
+        size_t _peak_used_bytes
+        size_t _n_malloc
+        size_t _n_free
+        # `_free_lock` must be acquired to access them.
+        size_t _n_pool_hits
+        size_t _n_pool_misses
+        map.map[size_t, size_t] _bin_counts
+        # `_total_bytes_lock` must be acquired to access them.
+        size_t _peak_total_bytes
+        size_t _n_oom_retries
+        size_t _trimmed_bytes
+
+        # Trim policy; see `set_trim_policy()`.
+        # `_free_lock` must be acquired to access them.
+        double _trim_idle_time
+        Py_ssize_t _trim_max_free_bytes
+        double _next_idle_trim
+        object _trim_event
+        # Free blocks which are not split, in the order of the least
+        # recently freed first. Only kept while `_trim_max_free_bytes` is
+        # set, so that `free()` releases them without a scan.
+        # `_free_lock` must be acquired to access it.
+        object _unsplit_free
+
         object __weakref__
         object _weakref
         object _free_lock
@@ -1040,20 +1260,28 @@ cdef class SingleDeviceMemoryPool:
         object _total_bytes_lock
         readonly int _device_id
 
-    def __init__(self, allocator=None):
+    def __init__(self, allocator=None, policy='bin'):
         if allocator is None:
             allocator = _malloc
+        if policy not in ('bin', 'first_fit'):
+            raise ValueError('Invalid policy: {}'.format(policy))
         self._in_use = {}
         self._arenas = {}
         self._allocator = allocator
+        self._first_fit = policy == 'first_fit'
         self._weakref = weakref.ref(self)
         self._device_id = device.get_device_id()
         self._free_lock = rlock.create_fastrlock()
         self._in_use_lock = rlock.create_fastrlock()
         self._total_bytes_lock = rlock.create_fastrlock()
+        self._trim_max_free_bytes = -1
 
         self.set_limit(**(_parse_limit_string()))
 
+    def __dealloc__(self):
+        if self._trim_event is not None:
+            self._trim_event.set()
+
     cdef _Arena _arena(self, intptr_t stream_ident):
         """Returns appropriate arena of a given stream.
 
@@ -1063,7 +1291,7 @@ cdef class SingleDeviceMemoryPool:
         """
         ret = self._arenas.get(stream_ident, None)
         if ret is None:
-            self._arenas[stream_ident] = ret = _Arena()
+            self._arenas[stream_ident] = ret = _Arena(self._first_fit)
         return ret
 
     cdef MemoryPointer _alloc(self, Py_ssize_t rounded_size):
@@ -1120,6 +1348,7 @@ cdef class SingleDeviceMemoryPool:
         cdef BaseMemory mem
         cdef PooledMemory pmem
         cdef MemoryPointer ret
+        cdef size_t bin_index
         if size == 0:
             return MemoryPointer(Memory(0), 0)
 
@@ -1130,6 +1359,12 @@ cdef class SingleDeviceMemoryPool:
         gc_mode = _lock_no_gc(self._free_lock)
         try:
             chunk = self._get_chunk(size, stream_ident)
+            bin_index = _bin_index_from_size(size)
+            self._bin_counts[bin_index] = self._bin_counts[bin_index] + 1
+            if chunk is None:
+                self._n_pool_misses += 1
+            else:
+                self._n_pool_hits += 1
         finally:
             _unlock_no_gc(self._free_lock, gc_mode)
 
@@ -1142,6 +1377,10 @@ cdef class SingleDeviceMemoryPool:
         rlock.lock_fastrlock(self._in_use_lock, -1, True)
         try:
             self._in_use[chunk.ptr()] = chunk
+            self._n_malloc += 1
+            self._used_bytes += chunk.size
+            if self._used_bytes > self._peak_used_bytes:
+                self._peak_used_bytes = self._used_bytes
         finally:
             rlock.unlock_fastrlock(self._in_use_lock)
         pmem = PooledMemory.__new__(PooledMemory)
@@ -1152,15 +1391,27 @@ cdef class SingleDeviceMemoryPool:
 
     cpdef free(self, intptr_t ptr, size_t size):
         cdef _Chunk chunk, c
+        cdef bint trim = False
+        cdef size_t released = 0
+        cdef Py_ssize_t free_bytes
+        cdef size_t used_bytes, total_bytes
+        cdef list released_chunks = None
 
         rlock.lock_fastrlock(self._in_use_lock, -1, True)
         try:
             chunk = self._in_use.pop(ptr)
+            self._n_free += 1
+            self._used_bytes -= chunk.size
+            used_bytes = self._used_bytes
         except KeyError:
             raise RuntimeError('Cannot free out-of-pool memory')
         finally:
             rlock.unlock_fastrlock(self._in_use_lock)
         stream_ident = chunk.stream_ident
+        # `_total_bytes_lock` must not be acquired with `_free_lock` held.
+        rlock.lock_fastrlock(self._total_bytes_lock, -1, True)
+        total_bytes = self._total_bytes
+        rlock.unlock_fastrlock(self._total_bytes_lock)
 
         gc_mode = _lock_no_gc(self._free_lock)
         try:
@@ -1176,8 +1427,38 @@ cdef class SingleDeviceMemoryPool:
                 chunk = c
 
             arena.append_to_free_list(chunk)
+            if self._trim_idle_time > 0 or self._trim_max_free_bytes >= 0:
+                chunk._free_time = _monotonic()
+                if self._trim_idle_time > 0:
+                    trim = chunk._free_time >= self._next_idle_trim
+            if self._trim_max_free_bytes >= 0:
+                # Only a block which is not split can be released.
+                if chunk.prev is None and chunk.next is None:
+                    self._unsplit_free[chunk] = None
+                # Releases the least recently freed blocks without scanning
+                # all the free blocks as `trim()` does. The two counters are
+                # read under different locks, so that they are compared as
+                # signed.
+                free_bytes = (
+                    <Py_ssize_t>total_bytes - <Py_ssize_t>used_bytes)
+                if free_bytes > self._trim_max_free_bytes:
+                    released_chunks = []
+                while (free_bytes > self._trim_max_free_bytes
+                       and self._unsplit_free):
+                    c = self._unsplit_free.popitem(last=False)[0]
+                    self._arenas[c.stream_ident].remove_from_free_list(c)
+                    released_chunks.append(c)
+                    free_bytes -= c.size
+                    released += c.size
         finally:
             _unlock_no_gc(self._free_lock, gc_mode)
+        if released > 0:
+            # The memory is released when `released_chunks` is discarded.
+            with LockAndNoGc(self._total_bytes_lock):
+                self._total_bytes -= released
+                self._trimmed_bytes += released
+        if trim:
+            self.trim()
 
     cpdef free_all_blocks(self, stream=None):
         """Free all **non-split** chunks"""
@@ -1270,6 +1551,124 @@ cdef class SingleDeviceMemoryPool:
         with LockAndNoGc(self._total_bytes_lock):
             return self._total_bytes_limit
 
+    cpdef set_trim_policy(
+            self, idle_time=None, max_free_bytes=None, interval=None):
+        """Sets the policy to release cached free blocks to the device.
+
+        Only the blocks which are not split are released, as
+        :meth:`free_all_blocks` does. The policy is applied by :meth:`trim`,
+        which is called when a block is freed to the pool if a block may
+        have been idle longer than ``idle_time``, and also every
+        ``interval`` seconds if given. When a block is freed while the free
+        bytes exceed ``max_free_bytes``, the least recently freed blocks are
+        released right away.
+
+        Calling this method without arguments disables the trimming.
+
+        Args:
+            idle_time (float): Releases the blocks that have been free for
+                longer than this number of seconds.
+            max_free_bytes (int): Releases the least recently freed blocks
+                until the bytes cached but not used by the pool become equal
+                to or less than this value.
+            interval (float): If given, :meth:`trim` is called from a
+                background daemon thread every ``interval`` seconds, so that
+                idle blocks are released even when the application does not
+                free memory.
+        """
+        cdef _Arena arena
+        cdef set free_list
+        cdef _Chunk chunk
+        if idle_time is not None and idle_time <= 0:
+            raise ValueError(
+                'idle_time must be positive: {}'.format(idle_time))
+        if max_free_bytes is not None and max_free_bytes < 0:
+            raise ValueError(
+                'max_free_bytes out of range: {}'.format(max_free_bytes))
+        if interval is not None and interval <= 0:
+            raise ValueError(
+                'interval must be positive: {}'.format(interval))
+
+        now = _monotonic()
+        with LockAndNoGc(self._free_lock):
+            self._trim_idle_time = 0 if idle_time is None else idle_time
+            self._trim_max_free_bytes = (
+                -1 if max_free_bytes is None else max_free_bytes)
+            self._next_idle_trim = now + self._trim_idle_time
+            self._unsplit_free = (
+                None if max_free_bytes is None else collections.OrderedDict())
+            # The blocks freed so far are considered idle from now.
+            for arena in self._arenas.itervalues():
+                for free_list in arena._free:
+                    if free_list is None:
+                        continue
+                    for chunk in free_list:
+                        chunk._free_time = now
+                        if (self._unsplit_free is not None and
+                                chunk.prev is None and chunk.next is None):
+                            self._unsplit_free[chunk] = None
+            if self._trim_event is not None:
+                self._trim_event.set()
+                self._trim_event = None
+            if interval is not None:
+                self._trim_event = threading.Event()
+                threading.Thread(
+                    target=_trim_periodically,
+                    args=(self._weakref, interval, self._trim_event),
+                    name='cupy-memory-pool-trim', daemon=True).start()
+
+    cpdef size_t trim(self):
+        """Releases cached free blocks according to the trim policy.
+
+        See :meth:`set_trim_policy` for the policy. This method does nothing
+        if no policy is set.
+
+        Returns:
+            int: The number of bytes released.
+        """
+        cdef _Arena arena
+        cdef set free_list
+        cdef _Chunk chunk
+        cdef list candidates = []
+        cdef size_t free_bytes = 0
+        cdef size_t released = 0
+        cdef double now = _monotonic()
+
+        with LockAndNoGc(self._free_lock):
+            if self._trim_idle_time <= 0 and self._trim_max_free_bytes < 0:
+                return 0
+            self._next_idle_trim = now + self._trim_idle_time
+            for arena in self._arenas.itervalues():
+                for free_list in arena._free:
+                    if free_list is None:
+                        continue
+                    for chunk in free_list:
+                        free_bytes += chunk.size
+                        if chunk.prev is None and chunk.next is None:
+                            candidates.append(
+                                (chunk._free_time, chunk.ptr(), chunk))
+            # Releases the least recently freed blocks first.
+            candidates.sort()
+            for _, _, chunk in candidates:
+                if not (
+                        (self._trim_idle_time > 0 and
+                         now - chunk._free_time >= self._trim_idle_time) or
+                        (self._trim_max_free_bytes >= 0 and
+                         free_bytes > <size_t>self._trim_max_free_bytes)):
+                    break
+                arena = self._arenas[chunk.stream_ident]
+                arena.remove_from_free_list(chunk)
+                if self._unsplit_free is not None:
+                    self._unsplit_free.pop(chunk, None)
+                free_bytes -= chunk.size
+                released += chunk.size
+        # The memory is released when `candidates` is discarded.
+        if released > 0:
+            with LockAndNoGc(self._total_bytes_lock):
+                self._total_bytes -= released
+                self._trimmed_bytes += released
+        return released
+
     cdef _compact_index(self, intptr_t stream_ident, bint free):
         # need self._free_lock
         cdef _Arena arena
@@ -1294,6 +1693,10 @@ cdef class SingleDeviceMemoryPool:
                         keep_list.add(chunk)
                     else:
                         size_to_free += chunk.size
+                        if arena._first_fit:
+                            arena._remove_from_ordered(chunk)
+                        if self._unsplit_free is not None:
+                            self._unsplit_free.pop(chunk, None)
                 if len(keep_list) == 0:
                     continue
                 free_list = keep_list
@@ -1317,6 +1720,17 @@ cdef class SingleDeviceMemoryPool:
         cdef _Chunk chunk
         cdef size_t bin_index = _bin_index_from_size(size)
         cdef _Arena a = self._arena(stream_ident)
+        if a._first_fit:
+            chunk = a.pop_first_fit(size)
+            if chunk is None:
+                return None
+            if self._unsplit_free is not None:
+                self._unsplit_free.pop(chunk, None)
+            remaining = chunk.split(size)
+            if remaining is not None:
+                a.append_to_free_list(remaining)
+            assert chunk.stream_ident == stream_ident
+            return chunk
         index = <size_t>(
             algorithm.lower_bound(a._index.begin(), a._index.end(), bin_index)
             - a._index.begin())
@@ -1331,6 +1745,8 @@ cdef class SingleDeviceMemoryPool:
                 a._free[i] = None
             if i - index >= _index_compaction_threshold:
                 self._compact_index(stream_ident, False)
+            if self._unsplit_free is not None:
+                self._unsplit_free.pop(chunk, None)
             remaining = chunk.split(size)
             if remaining is not None:
                 a.append_to_free_list(remaining)
@@ -1346,15 +1762,19 @@ cdef class SingleDeviceMemoryPool:
             if limit != 0:
                 limit_ok = (self._total_bytes + size) <= limit
                 if not limit_ok:
+                    self._n_oom_retries += 1
                     self.free_all_blocks()
                     limit_ok = (self._total_bytes + size) <= limit
                 if not limit_ok:
+                    self._n_oom_retries += 1
                     gc.collect()
                     self.free_all_blocks()
                     limit_ok = (self._total_bytes + size) <= limit
                 if not limit_ok:
                     raise OutOfMemoryError(size, self._total_bytes, limit)
             self._total_bytes += size
+            if self._total_bytes > self._peak_total_bytes:
+                self._peak_total_bytes = self._total_bytes
 
         mem = None
         oom_error = False
@@ -1363,12 +1783,14 @@ cdef class SingleDeviceMemoryPool:
         except CUDARuntimeError as e:
             if e.status != runtime.errorMemoryAllocation:
                 raise
+            self._count_oom_retry()
             self.free_all_blocks()
             try:
                 mem = self._alloc(size).mem
             except CUDARuntimeError as e:
                 if e.status != runtime.errorMemoryAllocation:
                     raise
+                self._count_oom_retry()
                 gc.collect()
                 self.free_all_blocks()
                 try:
@@ -1386,6 +1808,122 @@ cdef class SingleDeviceMemoryPool:
 
         return mem
 
+    cdef _count_oom_retry(self):
+        with LockAndNoGc(self._total_bytes_lock):
+            self._n_oom_retries += 1
+
+    cpdef dict get_stats(self):
+        """Returns the statistics of the pool.
+
+        Returns:
+            dict: A dictionary with the following keys.
+
+            - ``'used_bytes'``, ``'free_bytes'``, ``'total_bytes'``: the same
+              values as :meth:`used_bytes`, :meth:`free_bytes` and
+              :meth:`total_bytes`.
+            - ``'peak_used_bytes'``, ``'peak_total_bytes'``: the maximum of
+              ``used_bytes`` and ``total_bytes`` since the creation of the
+              pool or the last call to :meth:`reset_peak_stats`.
+            - ``'n_malloc'``, ``'n_free'``: the number of non-zero sized
+              allocations and deallocations.
+            - ``'n_pool_hits'``: the number of allocations served from the
+              cached free blocks.
+            - ``'n_pool_misses'``: the number of allocations that fell back
+              to the underlying allocator (e.g., ``cudaMalloc``).
+            - ``'n_oom_retries'``: the number of times cached free blocks
+              were released to retry an allocation that exceeded the limit
+              or failed with out-of-memory.
+            - ``'trimmed_bytes'``: the number of bytes released by
+              :meth:`trim`.
+            - ``'n_free_blocks'``: the same value as :meth:`n_free_blocks`.
+            - ``'bins'``: a dictionary mapping the size of each bin in bytes
+              (i.e., the rounded allocation size) to the number of
+              allocations requested for that size.
+            - ``'arenas'``: a dictionary mapping each stream identifier to a
+              dictionary describing the free blocks of the arena for the
+              stream: ``'free_bytes'``, ``'n_free_blocks'``,
+              ``'largest_free_block'`` and ``'fragmentation'``, which is
+              ``1 - largest_free_block / free_bytes`` (``0`` if there are
+              no free blocks).
+        """
+        cdef _Arena arena
+        cdef _Chunk chunk
+        cdef set free_list
+        cdef size_t free_bytes, n_blocks, largest
+        cdef size_t total_free_bytes = 0
+        cdef size_t total_n_blocks = 0
+        cdef dict stats
+        cdef dict arenas = {}
+        cdef dict bins = {}
+        cdef pair[size_t, size_t] item
+
+        with LockAndNoGc(self._free_lock):
+            for stream_ident, arena in self._arenas.items():
+                free_bytes = n_blocks = largest = 0
+                for free_list in arena._free:
+                    if free_list is None:
+                        continue
+                    for chunk in free_list:
+                        free_bytes += chunk.size
+                        n_blocks += 1
+                        if chunk.size > largest:
+                            largest = chunk.size
+                arenas[stream_ident] = {
+                    'free_bytes': free_bytes,
+                    'n_free_blocks': n_blocks,
+                    'largest_free_block': largest,
+                    'fragmentation': (
+                        1.0 - <double>largest / free_bytes
+                        if free_bytes > 0 else 0.0),
+                }
+                total_free_bytes += free_bytes
+                total_n_blocks += n_blocks
+            for item in self._bin_counts:
+                bins[(item.first + 1) * ALLOCATION_UNIT_SIZE] = item.second
+            n_pool_hits = self._n_pool_hits
+            n_pool_misses = self._n_pool_misses
+
+        with LockAndNoGc(self._in_use_lock):
+            stats = {
+                'used_bytes': self._used_bytes,
+                'peak_used_bytes': self._peak_used_bytes,
+                'n_malloc': self._n_malloc,
+                'n_free': self._n_free,
+            }
+        with LockAndNoGc(self._total_bytes_lock):
+            stats['total_bytes'] = self._total_bytes
+            stats['peak_total_bytes'] = self._peak_total_bytes
+            stats['n_oom_retries'] = self._n_oom_retries
+            stats['trimmed_bytes'] = self._trimmed_bytes
+        stats['free_bytes'] = total_free_bytes
+        stats['n_free_blocks'] = total_n_blocks
+        stats['n_pool_hits'] = n_pool_hits
+        stats['n_pool_misses'] = n_pool_misses
+        stats['bins'] = bins
+        stats['arenas'] = arenas
+        return stats
+
+    cpdef reset_peak_stats(self):
+        """Resets the peak values reported by :meth:`get_stats`.
+
+        The peaks are set to the current ``used_bytes`` and ``total_bytes``.
+        """
+        with LockAndNoGc(self._in_use_lock):
+            self._peak_used_bytes = self._used_bytes
+        with LockAndNoGc(self._total_bytes_lock):
+            self._peak_total_bytes = self._total_bytes
+
+
+def _trim_periodically(pool_ref, interval, event):
+    # Runs in a daemon thread until the pool is destroyed or the policy is
+    # changed.
+    while not event.wait(interval):
+        pool = pool_ref()
+        if pool is None:
+            return
+        pool.trim()
+        del pool
+
 
 cdef class MemoryPool:
 
@@ -1412,14 +1950,21 @@ cdef class MemoryPool:
         allocator (function): The base CuPy memory allocator. It is used for
             allocating new blocks when the blocks of the required size are all
             in use.
+        policy (str): The policy to choose a cached block for an allocation,
+            either ``'bin'`` (default) or ``'first_fit'``. ``'first_fit'``
+            may reduce the memory reserved by workloads alternating large and
+            medium allocations. See :class:`SingleDeviceMemoryPool` for
+            details.
 
     """
 
-    def __init__(self, allocator=None):
+    def __init__(self, allocator=None, policy='bin'):
         if allocator is None:
             allocator = _malloc
+        if policy not in ('bin', 'first_fit'):
+            raise ValueError('Invalid policy: {}'.format(policy))
         self._pools = collections.defaultdict(
-            lambda: SingleDeviceMemoryPool(allocator))
+            lambda: SingleDeviceMemoryPool(allocator, policy))
 
     cpdef MemoryPointer malloc(self, size_t size):
         """Allocates the memory, from the pool if possible.
@@ -1542,6 +2087,58 @@ cdef class MemoryPool:
         mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
         return mp.get_limit()
 
+    cpdef set_trim_policy(
+            self, idle_time=None, max_free_bytes=None, interval=None):
+        """Sets the policy to release cached free blocks of the current device.
+
+        By default, free blocks are cached until :meth:`free_all_blocks` is
+        called or an allocation fails. A trim policy returns idle blocks to
+        the device so that other processes sharing the GPU can use them.
+        See :meth:`SingleDeviceMemoryPool.set_trim_policy` for the details.
+
+        Args:
+            idle_time (float): Releases the blocks that have been free for
+                longer than this number of seconds.
+            max_free_bytes (int): Upper limit of the bytes cached but not
+                used by the pool.
+            interval (float): Interval in seconds to apply the policy from a
+                background thread.
+        """
+        mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
+        mp.set_trim_policy(idle_time, max_free_bytes, interval)
+
+    cpdef size_t trim(self):
+        """Releases cached free blocks of the current device according to
+        the trim policy.
+
+        Returns:
+            int: The number of bytes released.
+        """
+        mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
+        return mp.trim()
+
+    cpdef dict get_stats(self):
+        """Gets the statistics of the pool for the current device.
+
+        The statistics are cheap to collect and suitable to be polled
+        periodically, e.g., by a metrics agent. See
+        :meth:`SingleDeviceMemoryPool.get_stats` for the keys.
+
+        Returns:
+            dict: The statistics of the pool.
+        """
+        mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
+        return mp.get_stats()
+
+    cpdef reset_peak_stats(self):
+        """Resets the peak memory usage recorded for the current device.
+
+        ``'peak_used_bytes'`` and ``'peak_total_bytes'`` reported by
+        :meth:`get_stats` are reset to the current usage.
+        """
+        mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
+        mp.reset_peak_stats()
+
 
 cdef class MemoryAsyncPool:
     """(Experimental) CUDA memory pool for all GPU devices on the host.
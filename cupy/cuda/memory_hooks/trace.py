@@ -0,0 +1,162 @@
+import collections
+import os
+import struct
+import sys
+import time
+
+from cupy.cuda import memory_hook
+from cupy.cuda import stream as stream_module
+
+
+_MAGIC = b'CUPYMTR1'
+
+# kind, device_id, callsite, size, stream, alloc_id, timestamp
+_record = struct.Struct('<BxHIQQQQ')
+
+MALLOC = 0
+FREE = 1
+_CALLSITE = 2
+
+
+TraceEvent = collections.namedtuple(
+    'TraceEvent',
+    ['kind', 'device_id', 'size', 'stream', 'alloc_id', 'timestamp',
+     'callsite'])
+
+
+class TraceHook(memory_hook.MemoryHook):
+    """Memory hook that records a binary trace of allocations.
+
+    This memory hook appends a fixed-size record to the output file for
+    each ``malloc`` and ``free`` of the memory pool. The trace can be read
+    with :func:`read_trace` and replayed offline, without a GPU, with
+    :mod:`cupyx.tools.simulate_pool` to tune the pool for a workload.
+
+    Each event has the following fields:
+
+    - ``kind``: :data:`MALLOC` or :data:`FREE`.
+    - ``device_id``: CUDA device ID.
+    - ``size``: requested size for ``malloc``, and the size of the block
+      for ``free``.
+    - ``stream``: pointer of the current stream at ``malloc``. A ``free``
+      has the stream of the corresponding ``malloc``.
+    - ``alloc_id``: sequential ID of the allocation, which pairs a
+      ``free`` with its ``malloc``.
+    - ``timestamp``: time in nanoseconds since the hook was created.
+    - ``callsite``: the ``filename:lineno:funcname`` of the innermost frame
+      outside CuPy that requested the allocation, or ``None`` if
+      ``callsite`` is ``False``.
+
+    Blocks allocated before entering the hook are not recorded, and their
+    ``free`` events are skipped.
+
+    Example:
+        Code example::
+
+            from cupy.cuda import memory_hooks
+            with open('trace.bin', 'wb') as f:
+                with memory_hooks.TraceHook(f):
+                    # some CuPy codes
+            events = memory_hooks.trace.read_trace('trace.bin')
+
+    Args:
+        file: Binary file-like object to write the trace to.
+        callsite (bool): If ``True``, records the callsite of each
+            allocation. It makes ``malloc`` slower as the Python stack has
+            to be walked. The default is ``True``.
+    """
+
+    name = 'TraceHook'
+
+    def __init__(self, file, callsite=True):
+        self.file = file
+        self.callsite = callsite
+        self._start = time.perf_counter_ns()
+        self._alloc_ids = {}
+        self._streams = {}
+        self._next_alloc_id = 0
+        self._callsites = {}
+        root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__)))))
+        self._cupy_dirs = tuple(
+            os.path.join(root, name) + os.sep
+            for name in ('cupy', 'cupyx', 'cupy_backends'))
+        self.file.write(_MAGIC)
+
+    def _get_callsite_id(self):
+        frame = sys._getframe(2)
+        while frame is not None and frame.f_code.co_filename.startswith(
+                self._cupy_dirs):
+            frame = frame.f_back
+        if frame is None:
+            return 0
+        code = frame.f_code
+        key = (code.co_filename, frame.f_lineno, code.co_name)
+        callsite_id = self._callsites.get(key)
+        if callsite_id is None:
+            callsite_id = self._callsites[key] = len(self._callsites) + 1
+            name = '{}:{}:{}'.format(*key).encode('utf-8')
+            self.file.write(_record.pack(
+                _CALLSITE, 0, callsite_id, len(name), 0, 0, 0))
+            self.file.write(name)
+        return callsite_id
+
+    def malloc_postprocess(self, **kwargs):
+        pmem_id = kwargs['pmem_id']
+        if pmem_id == 0 or kwargs['mem_size'] == 0:
+            # error, or zero-sized allocation not served by the pool
+            return
+        callsite_id = self._get_callsite_id() if self.callsite else 0
+        alloc_id = self._next_alloc_id
+        self._next_alloc_id += 1
+        stream = stream_module.get_current_stream().ptr
+        self._alloc_ids[pmem_id] = alloc_id
+        self._streams[pmem_id] = stream
+        self.file.write(_record.pack(
+            MALLOC, kwargs['device_id'], callsite_id, kwargs['size'],
+            stream, alloc_id, time.perf_counter_ns() - self._start))
+
+    def free_postprocess(self, **kwargs):
+        pmem_id = kwargs['pmem_id']
+        alloc_id = self._alloc_ids.pop(pmem_id, None)
+        if alloc_id is None:
+            return
+        stream = self._streams.pop(pmem_id)
+        self.file.write(_record.pack(
+            FREE, kwargs['device_id'], 0, kwargs['mem_size'],
+            stream, alloc_id, time.perf_counter_ns() - self._start))
+
+
+def read_trace(file):
+    """Reads a trace recorded by :class:`TraceHook`.
+
+    Args:
+        file (str or file-like object): Path or binary file-like object of
+            the trace.
+
+    Returns:
+        list of TraceEvent: The events in the recorded order.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f:
+            return read_trace(f)
+    data = file.read()
+    if not data.startswith(_MAGIC):
+        raise ValueError('Not a CuPy allocation trace')
+    events = []
+    callsites = {0: None}
+    offset = len(_MAGIC)
+    size = _record.size
+    while offset + size <= len(data):
+        (kind, device_id, callsite_id, nbytes, stream, alloc_id,
+         timestamp) = _record.unpack_from(data, offset)
+        offset += size
+        if kind == _CALLSITE:
+            callsites[callsite_id] = data[offset:offset + nbytes].decode(
+                'utf-8')
+            offset += nbytes
+            continue
+        events.append(TraceEvent(
+            kind, device_id, nbytes, stream, alloc_id, timestamp,
+            callsites.get(callsite_id)))
+    return events
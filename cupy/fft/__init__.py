@@ -1,24 +1,28 @@
 from cupy.fft._fft import fft  # NOQA
 from cupy.fft._fft import fft2  # NOQA
+from cupy.fft._fft import fft_batch  # NOQA
 from cupy.fft._fft import fftfreq  # NOQA
 from cupy.fft._fft import fftn  # NOQA
 from cupy.fft._fft import fftshift  # NOQA
 from cupy.fft._fft import hfft  # NOQA
 from cupy.fft._fft import ifft  # NOQA
 from cupy.fft._fft import ifft2  # NOQA
+from cupy.fft._fft import ifft_batch  # NOQA
 from cupy.fft._fft import ifftn  # NOQA
 from cupy.fft._fft import ifftshift  # NOQA
 from cupy.fft._fft import ihfft  # NOQA
 from cupy.fft._fft import irfft  # NOQA
 from cupy.fft._fft import irfft2  # NOQA
+from cupy.fft._fft import irfft_batch  # NOQA
 from cupy.fft._fft import irfftn  # NOQA
 from cupy.fft._fft import rfft  # NOQA
 from cupy.fft._fft import rfft2  # NOQA
+from cupy.fft._fft import rfft_batch  # NOQA
 from cupy.fft._fft import rfftfreq  # NOQA
 from cupy.fft._fft import rfftn  # NOQA
 from cupy.fft import config  # NOQA
 
-__all__ = ["fft", "fft2", "fftfreq", "fftn", "fftshift", "hfft",
-           "ifft", "ifft2", "ifftn", "ifftshift", "ihfft",
-           "irfft", "irfft2", "irfftn",
-           "rfft", "rfft2", "rfftfreq", "rfftn", "config"]
+__all__ = ["fft", "fft2", "fft_batch", "fftfreq", "fftn", "fftshift", "hfft",
+           "ifft", "ifft2", "ifft_batch", "ifftn", "ifftshift", "ihfft",
+           "irfft", "irfft2", "irfft_batch", "irfftn",
+           "rfft", "rfft2", "rfft_batch", "rfftfreq", "rfftn", "config"]
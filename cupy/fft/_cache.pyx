@@ -1,9 +1,13 @@
 # distutils: language = c++
 
 import gc
+import itertools
 import weakref
 
+from libc.stdint cimport intptr_t
+
 from cupy_backends.cuda.api cimport runtime
+from cupy.cuda cimport stream as stream_module
 
 import threading
 
@@ -16,6 +20,26 @@ from cupy import _util
 
 cdef object _thread_local = threading.local()
 
+# The process-wide caches shared by all threads, enabled by
+# set_plan_cache_shared(). A single lock guards the caches of all devices so
+# that the operations on multi-device plans cannot deadlock.
+cdef bint _shared = False
+cdef list _shared_caches = None
+cdef object _shared_lock = threading.RLock()
+
+# Tokens identifying threads in the shared caches. Unlike thread identifiers,
+# they are not reused after threads exit, whose work may still be running on
+# the per-thread default streams.
+cdef object _thread_tokens = itertools.count()
+
+
+cdef object _get_thread_token():
+    try:
+        return _thread_local.thread_token
+    except AttributeError:
+        token = _thread_local.thread_token = next(_thread_tokens)
+        return token
+
 
 cdef class _ThreadLocal:
 
@@ -187,6 +211,11 @@ cdef class PlanCache:
             the cache will use for their work areas. Default is ``-1``, meaning
             it is unlimited.
         dev (int): The ID of the device that the cache targets.
+        shared (bool): Whether the cache is shared by threads. A shared cache
+            is guarded by a lock, and the key of a plan is suffixed with the
+            pointer of the current stream, so that the work area of a plan is
+            not used by concurrent streams. Multi-GPU plans cannot be cached
+            in a shared cache.
 
     .. note::
         1. By setting either ``size`` to ``0`` (by calling :meth:`set_size`) or
@@ -215,7 +244,9 @@ cdef class PlanCache:
         3. This class is thread-safe since by default it is created on a
            per-thread basis. When starting a new thread, a new cache is not
            initialized until :func:`~cupy.fft.config.get_plan_cache` is
-           called or when the constructor is manually invoked.
+           called or when the constructor is manually invoked. Instead, a
+           single cache per device can be shared by all threads by
+           :func:`~cupy.fft.config.set_plan_cache_shared`.
 
         4. For multi-GPU plans, the plan will be added to each participating
            GPU's cache. Upon removal (by any of the caches), the plan will
@@ -244,6 +275,7 @@ cdef class PlanCache:
     # for collecting statistics
     cdef size_t hits
     cdef size_t misses
+    cdef size_t evictions
 
     # whether the cache is enabled (True) or disabled (False)
     cdef bint is_enabled
@@ -251,6 +283,11 @@ cdef class PlanCache:
     # the ID of the device on which the cached plans are allocated
     cdef int dev
 
+    # whether the cache is shared by threads, and the lock guarding it
+    # (None if not shared)
+    cdef readonly bint shared
+    cdef object _lock
+
     # key: all arguments used to construct Plan1d or PlanNd
     # value: the node that holds the plan corresponding to the key
     cdef dict cache
@@ -262,16 +299,80 @@ cdef class PlanCache:
 
     # ---------------------- Python methods ---------------------- #
 
-    def __init__(self, Py_ssize_t size=16, Py_ssize_t memsize=-1, int dev=-1):
+    def __init__(self, Py_ssize_t size=16, Py_ssize_t memsize=-1, int dev=-1,
+                 *, bint shared=False):
         self._validate_size_memsize(size, memsize)
         self._set_size_memsize(size, memsize)
         self._reset()
         self.dev = dev if dev != -1 else runtime.getDevice()
+        self.shared = shared
+        self._lock = _shared_lock if shared else None
 
     def __dealloc__(self):
         self._cleanup()
 
     def __getitem__(self, tuple key):
+        if self._lock is None:
+            return self._getitem(key)
+        with self._lock:
+            return self._getitem(self._shared_key(key))
+
+    def __setitem__(self, tuple key, plan):
+        if self._lock is None:
+            self._setitem(key, plan)
+            return
+        if plan.gpus is not None:
+            raise ValueError(
+                'multi-GPU plans cannot be cached in a shared cache')
+        # the plan may be executed by multiple threads from now on
+        plan._enable_exec_lock()
+        with self._lock:
+            self._setitem(self._shared_key(key), plan)
+
+    def __delitem__(self, tuple key):
+        if self._lock is None:
+            self._delitem(key)
+            return
+        with self._lock:
+            self._delitem(self._shared_key(key))
+
+    def __repr__(self):
+        if self._lock is None:
+            return self._repr()
+        with self._lock:
+            return self._repr()
+
+    def __iter__(self):
+        # Traverse from the end (LRU). Unlike dict and other map-like
+        # containers, we also return the node (value) here for inspecting
+        # and testing the data structure without accidentally changing the
+        # cache order.
+        if self._lock is None:
+            return self._iter()
+        with self._lock:
+            # take a snapshot as other threads may modify the cache
+            return iter(list(self._iter()))
+
+    def _iter(self):
+        cdef _Node node = self.lru.tail
+
+        while node.prev is not self.lru.head:
+            node = node.prev
+            yield (node.key, node)
+
+    # --------------------- internal helpers --------------------- #
+
+    cdef tuple _shared_key(self, tuple key):
+        # A plan holds a single work area, so that threads executing on
+        # different streams must use different plans. The per-thread default
+        # stream is a different stream in each thread despite its common
+        # pointer value, so the thread is also added to the key for it.
+        cdef intptr_t ptr = stream_module.get_current_stream_ptr()
+        if ptr == runtime.streamPerThread:
+            return key + (ptr, _get_thread_token())
+        return key + (ptr,)
+
+    cdef _getitem(self, tuple key):
         # no-op if cache is disabled
         if not self.is_enabled:
             assert (self.size == 0 or self.memsize == 0)
@@ -294,7 +395,7 @@ cdef class PlanCache:
             self.misses += 1
             raise KeyError('plan not found for key: {}'.format(key))
 
-    def __setitem__(self, tuple key, plan):
+    cdef _setitem(self, tuple key, plan):
         # no-op if cache is disabled
         if not self.is_enabled:
             assert (self.size == 0 or self.memsize == 0)
@@ -313,7 +414,7 @@ cdef class PlanCache:
             # collectively add the plan to all devices' caches
             _add_multi_gpu_plan(gpus, key, plan)
 
-    def __delitem__(self, tuple key):
+    cdef _delitem(self, tuple key):
         cdef _Node node
         cdef list gpus
 
@@ -334,7 +435,7 @@ cdef class PlanCache:
             self.misses += 1
             raise KeyError('plan not found for key: {}'.format(key))
 
-    def __repr__(self):
+    cdef str _repr(self):
         # we also validate data when the cache information is needed
         assert len(self.cache) == int(self.lru.count) == self.curr_size
         if self.size >= 0:
@@ -346,43 +447,32 @@ cdef class PlanCache:
         output += '------------------- cuFFT plan cache '
         output += '(device {}) -------------------\n'.format(self.dev)
         output += 'cache enabled? {}\n'.format(self.is_enabled)
+        output += 'shared by threads? {}\n'.format(self.shared)
         output += 'current / max size   : {0} / {1} (counts)\n'.format(
             self.curr_size,
             '(unlimited)' if self.size == -1 else self.size)
         output += 'current / max memsize: {0} / {1} (bytes)\n'.format(
             self.curr_memsize,
             '(unlimited)' if self.memsize == -1 else self.memsize)
-        output += 'hits / misses: {0} / {1} (counts)\n'.format(
-            self.hits, self.misses)
+        output += 'hits / misses / evictions: {0} / {1} / {2} (counts)\n'
+        output = output.format(self.hits, self.misses, self.evictions)
         output += '\ncached plans (most recently used first):\n'
 
         cdef tuple key
         cdef _Node node
         cdef size_t count = 0
-        for key, node in self:
+        for key, node in self._iter():
             output += str(node) + '\n'
             count += 1
         assert count == self.lru.count
         return output
 
-    def __iter__(self):
-        # Traverse from the end (LRU). Unlike dict and other map-like
-        # containers, we also return the node (value) here for inspecting
-        # and testing the data structure without accidentally changing the
-        # cache order.
-        cdef _Node node = self.lru.tail
-
-        while node.prev is not self.lru.head:
-            node = node.prev
-            yield (node.key, node)
-
-    # --------------------- internal helpers --------------------- #
-
     cdef void _reset(self):
         self.curr_size = 0
         self.curr_memsize = 0
         self.hits = 0
         self.misses = 0
+        self.evictions = 0
         self.cache = {}
         self.lru = _LinkedList()
 
@@ -468,6 +558,7 @@ cdef class PlanCache:
                 # remove from the front to free up space
                 unwanted_node = self.lru.head.next
                 if unwanted_node is not self.lru.tail:
+                    self.evictions += 1
                     gpus = unwanted_node.gpus
                     if gpus is None:
                         self._remove_plan(key=None, node=unwanted_node)
@@ -477,6 +568,13 @@ cdef class PlanCache:
     # -------------- helpers also exposed to Python -------------- #
 
     cpdef set_size(self, Py_ssize_t size):
+        if self._lock is not None:
+            with self._lock:
+                self._set_size(size)
+        else:
+            self._set_size(size)
+
+    cdef _set_size(self, Py_ssize_t size):
         self._validate_size_memsize(size, self.memsize)
         self._eject_until_fit(size, self.memsize)
         self._set_size_memsize(size, self.memsize)
@@ -488,6 +586,13 @@ cdef class PlanCache:
         return self.curr_size
 
     cpdef set_memsize(self, Py_ssize_t memsize):
+        if self._lock is not None:
+            with self._lock:
+                self._set_memsize(memsize)
+        else:
+            self._set_memsize(memsize)
+
+    cdef _set_memsize(self, Py_ssize_t memsize):
         self._validate_size_memsize(self.size, memsize)
         self._eject_until_fit(self.size, memsize)
         self._set_size_memsize(self.size, memsize)
@@ -511,15 +616,42 @@ cdef class PlanCache:
         return plan
 
     cpdef clear(self):
-        self._cleanup()
-        self._reset()
+        if self._lock is not None:
+            with self._lock:
+                self._cleanup()
+                self._reset()
+        else:
+            self._cleanup()
+            self._reset()
+
+    cpdef dict get_stats(self):
+        """Returns the statistics of the cache.
+
+        Returns:
+            dict: A dictionary with the following keys.
+
+            - ``'hits'``, ``'misses'``: the number of the lookups that found
+              and did not find a plan.
+            - ``'evictions'``: the number of the plans removed to make room
+              for new ones or to fit in a reduced size or memsize.
+            - ``'curr_size'``, ``'curr_memsize'``: the current number of
+              the cached plans and the memory used by their work areas.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'curr_size': self.curr_size,
+            'curr_memsize': self.curr_memsize,
+        }
 
     cpdef show_info(self):
         print(self)
 
 
 # The three functions below are used to collectively add, remove, or move a
-# a multi-GPU plan in all devices' caches (per thread). Therefore, they're
+# a multi-GPU plan in all devices' caches (per thread, as multi-GPU plans are
+# not cached in the shared caches). Therefore, they're
 # not PlanCache's methods, which focus on the current (device's) cache. This
 # module-level definition has an additional benefit that "cdef inline ..."
 # can work.
@@ -534,7 +666,7 @@ cdef inline void _add_multi_gpu_plan(list gpus, tuple key, plan) except*:
             prev_device = runtime.getDevice()
             try:
                 runtime.setDevice(dev)
-                cache = get_plan_cache()
+                cache = _get_local_plan_cache()
                 cache._add_plan(key, plan)
             finally:
                 runtime.setDevice(prev_device)
@@ -559,7 +691,7 @@ cdef inline void _remove_multi_gpu_plan(list gpus, tuple key) except*:
         prev_device = runtime.getDevice()
         try:
             runtime.setDevice(dev)
-            cache = get_plan_cache()
+            cache = _get_local_plan_cache()
             cache._remove_plan(key=key)
         finally:
             runtime.setDevice(prev_device)
@@ -573,7 +705,7 @@ cdef inline void _remove_append_multi_gpu_plan(list gpus, tuple key) except *:
         prev_device = runtime.getDevice()
         try:
             runtime.setDevice(dev)
-            cache = get_plan_cache()
+            cache = _get_local_plan_cache()
             cache._move_plan_to_end(key=key)
         finally:
             runtime.setDevice(prev_device)
@@ -588,7 +720,7 @@ cdef inline void _check_multi_gpu_plan_fit(list gpus, plan) except*:
             prev_device = runtime.getDevice()
             try:
                 runtime.setDevice(dev)
-                cache = get_plan_cache()
+                cache = _get_local_plan_cache()
                 cache._check_plan_fit(plan)
             finally:
                 runtime.setDevice(prev_device)
@@ -604,10 +736,21 @@ cdef inline void _check_multi_gpu_plan_fit(list gpus, plan) except*:
 cpdef inline PlanCache get_plan_cache():
     """Get the per-thread, per-device plan cache, or create one if not found.
 
+    If the cache shared by threads is enabled by
+    :func:`~cupy.fft.config.set_plan_cache_shared`, the shared cache of the
+    current device is returned instead.
+
     .. seealso::
         :class:`~cupy.fft._cache.PlanCache`
 
     """
+    if _shared:
+        return _get_shared_plan_cache()
+    return _get_local_plan_cache()
+
+
+cpdef PlanCache _get_local_plan_cache():
+    # Returns the per-thread cache regardless of the shared cache.
     cdef _ThreadLocal tls = _ThreadLocal.get()
     cdef int dev = runtime.getDevice()
     cdef PlanCache cache = tls.per_device_cufft_cache[dev]
@@ -618,6 +761,46 @@ cpdef inline PlanCache get_plan_cache():
     return cache
 
 
+cdef PlanCache _get_shared_plan_cache():
+    global _shared_caches
+    cdef int dev = runtime.getDevice()
+    cdef PlanCache cache
+    with _shared_lock:
+        if _shared_caches is None:
+            _shared_caches = [None] * runtime.getDeviceCount()
+        cache = _shared_caches[dev]
+        if cache is None:
+            cache = PlanCache(dev=dev, shared=True)
+            _shared_caches[dev] = cache
+    return cache
+
+
+cpdef set_plan_cache_shared(bint shared=True):
+    """Enables or disables the plan cache shared by all threads.
+
+    By default, each thread has its own plan cache, so that the same plans
+    are created in every thread. When enabled,
+    :func:`~cupy.fft.config.get_plan_cache` returns a process-wide cache
+    per device, which is guarded by a lock and is still LRU by the number
+    of plans and their memory usage. A plan is shared by the threads using
+    the same stream, and the threads on different streams create their own
+    plans so that the work areas are not used concurrently.
+
+    Multi-GPU plans and the plans with cuFFT callbacks are still cached per
+    thread. Disabling the shared cache does not release the plans in it;
+    clear the cache beforehand to do so.
+
+    Args:
+        shared (bool): Whether to use the shared cache.
+
+    .. seealso::
+        :class:`~cupy.fft._cache.PlanCache`
+
+    """
+    global _shared
+    _shared = shared
+
+
 # TODO(leofang): remove experimental warning when scipy/scipy#12512 is merged
 cpdef Py_ssize_t get_plan_cache_size():
     _util.experimental('cupy.fft.cache.get_plan_cache_size')
@@ -654,15 +837,23 @@ cpdef clear_plan_cache():
 
 
 cpdef show_plan_cache_info():
-    """Show all of the plan caches' info on this thread.
+    """Show all of the plan caches' info on this thread, or the shared caches
+    if enabled.
 
     .. seealso::
         :class:`~cupy.fft._cache.PlanCache`
 
     """
 
-    cdef _ThreadLocal tls = _ThreadLocal.get()
-    cdef list caches = tls.per_device_cufft_cache
+    cdef _ThreadLocal tls
+    cdef list caches
+    if _shared:
+        with _shared_lock:
+            caches = list(_shared_caches or
+                          [None] * runtime.getDeviceCount())
+    else:
+        tls = _ThreadLocal.get()
+        caches = tls.per_device_cufft_cache
     cdef int dev
     cdef PlanCache cache
 
@@ -6,6 +6,7 @@ import numpy as np
 import cupy
 from cupy.fft import config
 from cupy.fft._cache import get_plan_cache
+from cupy.fft._cache import _get_local_plan_cache
 
 
 _reduce = functools.reduce
@@ -150,7 +151,11 @@ def _exec_fft(a, direction, value_type, norm, axis, overwrite_x,
             keys += (mgr.cb_load, mgr.cb_store,
                      0 if load_aux is None else load_aux.data.ptr,
                      0 if store_aux is None else store_aux.data.ptr)
-        cache = get_plan_cache()
+        if mgr is None and devices is None:
+            cache = get_plan_cache()
+        else:
+            # multi-GPU and callback plans are not in the shared cache
+            cache = _get_local_plan_cache()
         cached_plan = cache.get(keys)
         if cached_plan is not None:
             plan = cached_plan
@@ -454,7 +459,10 @@ def _get_cufft_plan_nd(
         keys += (mgr.cb_load, mgr.cb_store,
                  0 if load_aux is None else load_aux.data.ptr,
                  0 if store_aux is None else store_aux.data.ptr)
-    cache = get_plan_cache()
+        # callback plans are not in the shared cache
+        cache = _get_local_plan_cache()
+    else:
+        cache = get_plan_cache()
     cached_plan = cache.get(keys)
     if cached_plan is not None:
         plan = cached_plan
@@ -1050,6 +1058,148 @@ def ihfft(a, n=None, axis=-1, norm=None):
     return rfft(a, n, axis, _swap_direction(norm)).conj()
 
 
+def _fft_batch(arrays, n, axis, norm, direction, value_type='C2C',
+               overwrite_x=False):
+    # Transforms the arrays of the same shape, dtype and device at once: they
+    # are packed into a buffer with the transformed axis last and a leading
+    # batch axis, so that a single batched plan is executed for each group.
+    arrays = list(arrays)
+    groups = {}
+    for i, a in enumerate(arrays):
+        if not isinstance(a, cupy.ndarray):
+            raise TypeError('The input arrays must be cupy.ndarray')
+        key = (a.shape, a.dtype, a.data.device_id)
+        groups.setdefault(key, []).append(i)
+
+    results = [None] * len(arrays)
+    for (shape, _, device_id), indices in groups.items():
+        if len(indices) == 1:
+            i = indices[0]
+            results[i] = _fft(arrays[i], (n,), (axis,), norm, direction,
+                              value_type, overwrite_x)
+            continue
+        ax = cupy._core.internal._normalize_axis_index(axis, len(shape))
+        with cupy.cuda.Device(device_id):
+            packed = cupy.stack(
+                [cupy.moveaxis(arrays[i], ax, -1) for i in indices])
+            # the packed buffer is a copy, which can be overwritten
+            out = _fft(packed, (n,), (-1,), norm, direction, value_type,
+                       overwrite_x=True)
+        for j, i in enumerate(indices):
+            results[i] = cupy.moveaxis(out[j], -1, ax)
+    return results
+
+
+def fft_batch(arrays, n=None, axis=-1, norm=None):
+    """Compute the one-dimensional FFTs of many arrays at once.
+
+    The arrays of the same shape, dtype and device are packed into a single
+    buffer and transformed by a single batched cuFFT plan, which is much
+    faster than calling :func:`fft` for each of many small arrays. The plans
+    are cached in the plan cache by the number of the arrays in each group.
+
+    Args:
+        arrays (sequence of cupy.ndarray): Arrays to be transformed. They
+            may have different shapes and dtypes.
+        n (None or int): Length of the transformed axis of the outputs. If
+            ``n`` is not given, the length of each input along the axis
+            specified by ``axis`` is used.
+        axis (int): Axis over which to compute the FFTs.
+        norm (``"backward"``, ``"ortho"``, or ``"forward"``): Optional keyword
+            to specify the normalization mode. Default is ``None``, which is
+            an alias of ``"backward"``.
+
+    Returns:
+        list of cupy.ndarray:
+            The transformed arrays in the order of the inputs, which are
+            the same as :func:`fft` of each input. The arrays transformed
+            together are views of a shared buffer.
+
+    .. seealso:: :func:`fft`
+    """
+    from cupy.cuda import cufft
+    return _fft_batch(arrays, n, axis, norm, cufft.CUFFT_FORWARD)
+
+
+def ifft_batch(arrays, n=None, axis=-1, norm=None):
+    """Compute the one-dimensional inverse FFTs of many arrays at once.
+
+    See :func:`fft_batch` for how the arrays are transformed.
+
+    Args:
+        arrays (sequence of cupy.ndarray): Arrays to be transformed.
+        n (None or int): Length of the transformed axis of the outputs. If
+            ``n`` is not given, the length of each input along the axis
+            specified by ``axis`` is used.
+        axis (int): Axis over which to compute the FFTs.
+        norm (``"backward"``, ``"ortho"``, or ``"forward"``): Optional keyword
+            to specify the normalization mode. Default is ``None``, which is
+            an alias of ``"backward"``.
+
+    Returns:
+        list of cupy.ndarray:
+            The transformed arrays in the order of the inputs, which are
+            the same as :func:`ifft` of each input.
+
+    .. seealso:: :func:`ifft`
+    """
+    from cupy.cuda import cufft
+    return _fft_batch(arrays, n, axis, norm, cufft.CUFFT_INVERSE)
+
+
+def rfft_batch(arrays, n=None, axis=-1, norm=None):
+    """Compute the one-dimensional FFTs of many real arrays at once.
+
+    See :func:`fft_batch` for how the arrays are transformed.
+
+    Args:
+        arrays (sequence of cupy.ndarray): Arrays to be transformed.
+        n (None or int): Number of points along transformation axis in the
+            inputs to use. If ``n`` is not given, the length of each input
+            along the axis specified by ``axis`` is used.
+        axis (int): Axis over which to compute the FFTs.
+        norm (``"backward"``, ``"ortho"``, or ``"forward"``): Optional keyword
+            to specify the normalization mode. Default is ``None``, which is
+            an alias of ``"backward"``.
+
+    Returns:
+        list of cupy.ndarray:
+            The transformed arrays in the order of the inputs, which are
+            the same as :func:`rfft` of each input.
+
+    .. seealso:: :func:`rfft`
+    """
+    from cupy.cuda import cufft
+    return _fft_batch(arrays, n, axis, norm, cufft.CUFFT_FORWARD, 'R2C')
+
+
+def irfft_batch(arrays, n=None, axis=-1, norm=None):
+    """Compute the inverses of :func:`rfft_batch` of many arrays at once.
+
+    See :func:`fft_batch` for how the arrays are transformed.
+
+    Args:
+        arrays (sequence of cupy.ndarray): Arrays to be transformed.
+        n (None or int): Length of the transformed axis of the outputs. For
+            ``n`` output points, ``n//2+1`` input points are necessary. If
+            ``n`` is not given, it is determined from the length of each
+            input along the axis specified by ``axis``.
+        axis (int): Axis over which to compute the FFTs.
+        norm (``"backward"``, ``"ortho"``, or ``"forward"``): Optional keyword
+            to specify the normalization mode. Default is ``None``, which is
+            an alias of ``"backward"``.
+
+    Returns:
+        list of cupy.ndarray:
+            The transformed arrays in the order of the inputs, which are
+            the same as :func:`irfft` of each input.
+
+    .. seealso:: :func:`irfft`
+    """
+    from cupy.cuda import cufft
+    return _fft_batch(arrays, n, axis, norm, cufft.CUFFT_INVERSE, 'C2R')
+
+
 def fftfreq(n, d=1.0):
     """Return the FFT sample frequencies.
 
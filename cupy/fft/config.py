@@ -1,3 +1,5 @@
+import numpy
+
 from cupy import _util
 
 # expose cache handles to this module
@@ -8,6 +10,7 @@ from cupy.fft._cache import set_plan_cache_size  # NOQA
 from cupy.fft._cache import get_plan_cache_max_memsize  # NOQA
 from cupy.fft._cache import set_plan_cache_max_memsize  # NOQA
 from cupy.fft._cache import show_plan_cache_info  # NOQA
+from cupy.fft._cache import set_plan_cache_shared  # NOQA
 
 # on Linux, expose callback handles to this module
 import sys as _sys
@@ -59,3 +62,52 @@ def set_cufft_gpus(gpus):
 
     # make it hashable
     _devices = tuple(devs)
+
+
+def warm_up_plan_cache(specs):
+    """Creates the cuFFT plans of the given transforms in the plan cache.
+
+    Call this at startup so that the first transforms do not pay for
+    creating the plans. The plans are created by running the transforms on
+    the current device and stream, and are cached in the cache returned by
+    :func:`get_plan_cache`. They are created once for all threads using the
+    same stream if the shared cache is enabled by
+    :func:`set_plan_cache_shared`.
+
+    Args:
+        specs (iterable of tuple): The transforms to create plans for. Each
+            item is ``(shape, dtype)`` or ``(shape, dtype, axes)``, where
+            ``shape`` and ``dtype`` are those of the input array. ``axes``
+            is an int for the 1-D transforms (:func:`cupy.fft.fft`, etc.),
+            or a tuple of ints or ``None`` (the default, all axes) for the
+            N-D transforms (:func:`cupy.fft.fftn`, etc.). The axes not
+            transformed are batched. For a complex ``dtype``, the plan of
+            the forward and inverse complex transforms is created. For a
+            real ``dtype``, the plans of the real transform (e.g.,
+            :func:`cupy.fft.rfft`) and its inverse (e.g.,
+            :func:`cupy.fft.irfft`) restoring the shape are created.
+
+    .. seealso:: :ref:`fft_plan_cache`
+    """
+    import cupy
+
+    for spec in specs:
+        shape, dtype = spec[:2]
+        axes = spec[2] if len(spec) > 2 else None
+        a = cupy.empty(shape, dtype)
+        complex_input = numpy.dtype(dtype).kind == 'c'
+        if isinstance(axes, int):
+            if complex_input:
+                cupy.fft.fft(a, axis=axes)
+            else:
+                out = cupy.fft.rfft(a, axis=axes)
+                cupy.fft.irfft(out, n=a.shape[axes], axis=axes)
+        else:
+            if complex_input:
+                cupy.fft.fftn(a, axes=axes)
+            else:
+                if axes is None:
+                    axes = tuple(range(a.ndim))
+                out = cupy.fft.rfftn(a, axes=axes)
+                cupy.fft.irfftn(
+                    out, s=[a.shape[i] for i in axes], axes=axes)
@@ -5,7 +5,6 @@ import numpy
 
 import cupy
 from cupy.exceptions import RankWarning
-import cupyx.scipy.fft
 
 
 def _wraps_polyroutine(func):
@@ -170,6 +169,7 @@ def _polypow(x, n):
     if method == 'direct':
         return _polypow_direct(x, n)
     elif method == 'fft':
+        import cupyx.scipy.fft
         if x.dtype.kind == 'c':
             fft, ifft = cupy.fft.fft, cupy.fft.ifft
         else:
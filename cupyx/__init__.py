@@ -5,10 +5,7 @@ from cupyx._scatter import scatter_add  # NOQA
 from cupyx._scatter import scatter_max  # NOQA
 from cupyx._scatter import scatter_min  # NOQA
 
-from cupyx import linalg  # NOQA
 from cupyx import time  # NOQA
-from cupyx import scipy  # NOQA
-from cupyx import optimizing  # NOQA
 
 from cupyx._ufunc_config import errstate  # NOQA
 from cupyx._ufunc_config import geterr  # NOQA
@@ -20,14 +17,26 @@ from cupyx._pinned_array import empty_pinned  # NOQA
 from cupyx._pinned_array import empty_like_pinned  # NOQA
 from cupyx._pinned_array import zeros_pinned  # NOQA
 from cupyx._pinned_array import zeros_like_pinned  # NOQA
+from cupyx._pipelined_copy import copy_pipelined  # NOQA
 
 from cupyx._gufunc import GeneralizedUFunc  # NOQA
 
+from cupy._core._fusion_lazy import lazy_fusion  # NOQA
+
+
+# Submodules imported on first access to reduce the import time.
+_lazy_submodules = ('lapack', 'linalg', 'optimizing', 'scipy')
+
 
 def __getattr__(key):
-    if key == 'lapack':
-        import cupyx.lapack
-        return cupyx.lapack
+    if key in _lazy_submodules:
+        import importlib
+        return importlib.import_module('cupyx.' + key)
 
     raise AttributeError(
         "module '{}' has no attribute '{}'".format(__name__, key))
+
+
+def __dir__():
+    return list(globals()) + [
+        name for name in _lazy_submodules if name not in globals()]
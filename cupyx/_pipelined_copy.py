@@ -0,0 +1,118 @@
+import numpy
+
+import cupy
+from cupy import cuda
+from cupy.cuda import _pinned_staging
+from cupy.cuda import pinned_memory
+
+
+def copy_pipelined(a, chunk_bytes=4 * 1024 * 1024, stream=None, out=None):
+    """Copies an array between host and device in pipelined chunks.
+
+    A NumPy array is copied to the current device, and a CuPy array is
+    copied to the host. Unless the host array is already backed by pinned
+    memory, the data is split into chunks of ``chunk_bytes`` which are
+    copied through two pinned buffers taken from the pinned memory pool, so
+    that the host-side copy of a chunk between the host array and a pinned
+    buffer overlaps with the DMA transfer of the other chunk.
+
+    A host-to-device copy returns as soon as the last chunk is packed into
+    the pinned buffer, so the host array can then be modified while the
+    transfer may still be running (a host array in pinned memory is copied
+    directly and must be kept intact until the copy completes). A
+    device-to-host copy into pageable
+    memory waits for all the chunks, while one into pinned memory (e.g.,
+    ``out`` created by :func:`cupyx.empty_pinned`) is fully asynchronous.
+
+    Args:
+        a (numpy.ndarray or cupy.ndarray): The array to copy.
+        chunk_bytes (int): Size of the chunks in bytes.
+        stream (cupy.cuda.Stream): The stream to perform the copy on. The
+            current stream is used by default.
+        out (cupy.ndarray or numpy.ndarray): The output array. Its shape and
+            dtype must be the same as ``a`` and it must be contiguous. By
+            default, a new array is allocated in the same memory layout as
+            ``a`` (C-contiguous unless ``a`` is F-contiguous).
+
+    Returns:
+        tuple: The output array and a :class:`cupy.cuda.Event` recorded on
+        the stream after the copy. Synchronize the event before using the
+        output array outside the stream.
+
+    .. seealso:: :func:`cupy.asarray`, :func:`cupy.asnumpy`
+    """
+    if chunk_bytes <= 0:
+        raise ValueError(
+            'chunk_bytes must be positive: {}'.format(chunk_bytes))
+    if stream is None:
+        stream = cuda.get_current_stream()
+
+    if isinstance(a, numpy.ndarray):
+        return _copy_to_device(a, chunk_bytes, stream, out)
+    if isinstance(a, cupy.ndarray):
+        return _copy_to_host(a, chunk_bytes, stream, out)
+    raise TypeError(
+        'Unsupported type {}: numpy.ndarray or cupy.ndarray is '
+        'expected'.format(type(a)))
+
+
+def _get_order(a):
+    return 'F' if a.flags.f_contiguous and not a.flags.c_contiguous else 'C'
+
+
+def _check_out(a, out, order, xp):
+    if not isinstance(out, xp.ndarray):
+        raise TypeError('out must be {}.ndarray'.format(xp.__name__))
+    if out.shape != a.shape or out.dtype != a.dtype:
+        raise ValueError(
+            'out must have the same shape and dtype as the input: '
+            '{} {} != {} {}'.format(out.shape, out.dtype, a.shape, a.dtype))
+    contiguous = (out.flags.c_contiguous if order == 'C'
+                  else out.flags.f_contiguous)
+    if not contiguous:
+        raise ValueError(
+            'out must be {}-contiguous'.format(order))
+
+
+def _copy_to_device(a, chunk_bytes, stream, out):
+    order = _get_order(a)
+    if order == 'C':
+        a = numpy.ascontiguousarray(a)
+    if out is None:
+        out = cupy.empty(a.shape, a.dtype, order)
+    else:
+        _check_out(a, out, order, cupy)
+
+    with out.device:
+        event = None
+        ptr = a.ctypes.data
+        if a.nbytes > 0 and not pinned_memory.is_memory_pinned(ptr):
+            event = _pinned_staging._copy_from_host_chunked(
+                out.data, ptr, a.nbytes, stream, chunk_bytes)
+        if event is None:
+            if a.nbytes > 0:
+                out.data.copy_from_host_async(ptr, a.nbytes, stream)
+            event = stream.record()
+    return out, event
+
+
+def _copy_to_host(a, chunk_bytes, stream, out):
+    order = _get_order(a)
+    if out is None:
+        out = numpy.empty(a.shape, a.dtype, order)
+    else:
+        _check_out(a, out, order, numpy)
+
+    with a.device:
+        with stream:
+            if order == 'C':
+                a = cupy.ascontiguousarray(a)
+        ptr = out.ctypes.data
+        staged = False
+        if a.nbytes > 0 and not pinned_memory.is_memory_pinned(ptr):
+            staged = _pinned_staging._copy_to_host_chunked(
+                a.data, ptr, a.nbytes, stream, chunk_bytes)
+        if not staged and a.nbytes > 0:
+            a.data.copy_to_host_async(ptr, a.nbytes, stream)
+        event = stream.record()
+    return out, event
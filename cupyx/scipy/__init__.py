@@ -1,7 +1,6 @@
 import sys as _sys
 
 from cupy._core import ndarray as _ndarray
-from cupyx.scipy.sparse._base import spmatrix as _spmatrix
 
 
 try:
@@ -14,6 +13,26 @@ except ImportError:
 _cupyx_scipy = _sys.modules[__name__]
 
 
+# Subpackages are imported on first access to reduce the import time.
+_lazy_submodules = (
+    'fft', 'fftpack', 'interpolate', 'linalg', 'ndimage', 'signal',
+    'sparse', 'spatial', 'special', 'stats')
+
+
+def __getattr__(key):
+    if key in _lazy_submodules:
+        import importlib
+        return importlib.import_module('cupyx.scipy.' + key)
+
+    raise AttributeError(
+        "module '{}' has no attribute '{}'".format(__name__, key))
+
+
+def __dir__():
+    return list(globals()) + [
+        name for name in _lazy_submodules if name not in globals()]
+
+
 def get_array_module(*args):
     """Returns the array module for arguments.
 
@@ -29,7 +48,12 @@ def get_array_module(*args):
         types of the arguments.
 
     """
+    # Sparse matrices cannot exist unless `cupyx.scipy.sparse` is imported,
+    # so avoid importing it here.
+    sparse = _sys.modules.get('cupyx.scipy.sparse')
     for arg in args:
-        if isinstance(arg, (_ndarray, _spmatrix)):
+        if isinstance(arg, _ndarray):
+            return _cupyx_scipy
+        if sparse is not None and isinstance(arg, sparse.spmatrix):
             return _cupyx_scipy
     return _scipy
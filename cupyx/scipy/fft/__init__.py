@@ -4,6 +4,9 @@ from cupyx.scipy.fft._fft import (
     rfft, irfft, rfft2, irfft2, rfftn, irfftn,
     hfft, ihfft, hfft2, ihfft2, hfftn, ihfftn
 )
+from cupyx.scipy.fft._fft import (
+    fft_batch, ifft_batch, rfft_batch, irfft_batch
+)
 from cupyx.scipy.fft._fft import (
     __ua_domain__, __ua_convert__, __ua_function__)
 from cupyx.scipy.fft._fft import _scipy_150, _scipy_160
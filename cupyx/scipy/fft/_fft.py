@@ -5,8 +5,8 @@ import numpy as np
 
 import cupy
 
-from cupy.fft._fft import (_fft, _default_fft_func, hfft as _hfft,
-                           ihfft as _ihfft, _swap_direction)
+from cupy.fft._fft import (_fft, _fft_batch, _default_fft_func,
+                           hfft as _hfft, ihfft as _ihfft, _swap_direction)
 
 _scipy_150 = False
 _scipy_160 = False
@@ -681,3 +681,111 @@ def ihfftn(x, s=None, axes=None, norm=None, overwrite_x=False, *,
     if plan is not None:
         raise NotImplementedError('ihfftn plan is currently not yet supported')
     return rfftn(x, s, axes, _swap_direction(norm)).conj()
+
+
+def fft_batch(arrays, n=None, axis=-1, norm=None, overwrite_x=False):
+    """Compute the one-dimensional FFTs of many arrays at once.
+
+    The arrays of the same shape, dtype and device are packed into a single
+    buffer and transformed by a single batched cuFFT plan.
+
+    Args:
+        arrays (sequence of cupy.ndarray): Arrays to be transformed.
+        n (None or int): Length of the transformed axis of the outputs. If
+            ``n`` is not given, the length of each input along the axis
+            specified by ``axis`` is used.
+        axis (int): Axis over which to compute the FFTs.
+        norm (``"backward"``, ``"ortho"``, or ``"forward"``): Optional keyword
+            to specify the normalization mode. Default is ``None``, which is
+            an alias of ``"backward"``.
+        overwrite_x (bool): If True, the contents of the arrays can be
+            destroyed.
+
+    Returns:
+        list of cupy.ndarray:
+            The transformed arrays in the order of the inputs.
+
+    .. seealso:: :func:`cupy.fft.fft_batch`
+    """
+    from cupy.cuda import cufft
+    return _fft_batch(arrays, n, axis, norm, cufft.CUFFT_FORWARD,
+                      overwrite_x=overwrite_x)
+
+
+def ifft_batch(arrays, n=None, axis=-1, norm=None, overwrite_x=False):
+    """Compute the one-dimensional inverse FFTs of many arrays at once.
+
+    Args:
+        arrays (sequence of cupy.ndarray): Arrays to be transformed.
+        n (None or int): Length of the transformed axis of the outputs. If
+            ``n`` is not given, the length of each input along the axis
+            specified by ``axis`` is used.
+        axis (int): Axis over which to compute the FFTs.
+        norm (``"backward"``, ``"ortho"``, or ``"forward"``): Optional keyword
+            to specify the normalization mode. Default is ``None``, which is
+            an alias of ``"backward"``.
+        overwrite_x (bool): If True, the contents of the arrays can be
+            destroyed.
+
+    Returns:
+        list of cupy.ndarray:
+            The transformed arrays in the order of the inputs.
+
+    .. seealso:: :func:`cupy.fft.ifft_batch`
+    """
+    from cupy.cuda import cufft
+    return _fft_batch(arrays, n, axis, norm, cufft.CUFFT_INVERSE,
+                      overwrite_x=overwrite_x)
+
+
+def rfft_batch(arrays, n=None, axis=-1, norm=None, overwrite_x=False):
+    """Compute the one-dimensional FFTs of many real arrays at once.
+
+    Args:
+        arrays (sequence of cupy.ndarray): Arrays to be transformed.
+        n (None or int): Number of points along transformation axis in the
+            inputs to use. If ``n`` is not given, the length of each input
+            along the axis specified by ``axis`` is used.
+        axis (int): Axis over which to compute the FFTs.
+        norm (``"backward"``, ``"ortho"``, or ``"forward"``): Optional keyword
+            to specify the normalization mode. Default is ``None``, which is
+            an alias of ``"backward"``.
+        overwrite_x (bool): If True, the contents of the arrays can be
+            destroyed.
+
+    Returns:
+        list of cupy.ndarray:
+            The transformed arrays in the order of the inputs.
+
+    .. seealso:: :func:`cupy.fft.rfft_batch`
+    """
+    from cupy.cuda import cufft
+    return _fft_batch(arrays, n, axis, norm, cufft.CUFFT_FORWARD, 'R2C',
+                      overwrite_x=overwrite_x)
+
+
+def irfft_batch(arrays, n=None, axis=-1, norm=None, overwrite_x=False):
+    """Compute the inverses of :func:`rfft_batch` of many arrays at once.
+
+    Args:
+        arrays (sequence of cupy.ndarray): Arrays to be transformed.
+        n (None or int): Length of the transformed axis of the outputs. For
+            ``n`` output points, ``n//2+1`` input points are necessary. If
+            ``n`` is not given, it is determined from the length of each
+            input along the axis specified by ``axis``.
+        axis (int): Axis over which to compute the FFTs.
+        norm (``"backward"``, ``"ortho"``, or ``"forward"``): Optional keyword
+            to specify the normalization mode. Default is ``None``, which is
+            an alias of ``"backward"``.
+        overwrite_x (bool): If True, the contents of the arrays can be
+            destroyed.
+
+    Returns:
+        list of cupy.ndarray:
+            The transformed arrays in the order of the inputs.
+
+    .. seealso:: :func:`cupy.fft.irfft_batch`
+    """
+    from cupy.cuda import cufft
+    return _fft_batch(arrays, n, axis, norm, cufft.CUFFT_INVERSE, 'C2R',
+                      overwrite_x=overwrite_x)
@@ -37,7 +37,6 @@ import operator
 
 import cupy
 from cupy import _core
-from cupy.fft._fft import _cook_shape
 from cupyx.scipy.fft import _fft
 from cupy.exceptions import AxisError
 
@@ -86,47 +85,66 @@ def _get_dct_norm_factor(n, inorm, dct_type=2):
     return fct
 
 
-def _reshuffle_dct2(x, n, axis, dst=False):
-    """Reorder entries to allow computation of DCT/DST-II via FFT."""
-    sl_even = [slice(None)] * x.ndim
-    sl_even[axis] = slice(0, None, 2)
-    sl_even = tuple(sl_even)
-    sl_odd = [slice(None)] * x.ndim
-    if n % 2:
-        sl_odd[axis] = slice(-2, None, -2)
-        sl_odd = tuple(sl_odd)
-    else:
-        sl_odd[axis] = slice(None, None, -2)
-        sl_odd = tuple(sl_odd)
-    if dst:
-        x = cupy.concatenate((x[sl_even], -x[sl_odd]), axis=axis)
-    else:
-        x = cupy.concatenate((x[sl_even], x[sl_odd]), axis=axis)
-    return x
+# The reordering of the entries, the twiddle factors and the normalization
+# are fused into a single pre-processing kernel and a single post-processing
+# kernel around the complex FFT. The kernels gather from (or scatter to) the
+# transformed axis of the input (output) in place, so the FFT is always
+# computed along the last axis of a C-contiguous array without transposing
+# the input. The input is zero-padded or truncated to ``n`` on the fly.
+
+_dct2_preprocess = _core.ElementwiseKernel(
+    'raw T x, int64 m, int64 n, bool dst',
+    'C v',
+    '''
+    ptrdiff_t k = i % n;
+    bool odd = k >= (n + 1) / 2;
+    ptrdiff_t src = odd ? 2 * (n - k) - 1 : 2 * k;
+    T t = src < m ? x[i / n * m + src] : (T)0;
+    v = C(dst && odd ? -t : t);
+    ''',
+    'cupyx_scipy_fft_dct2_preprocess',
+)
 
 
-_mult_factor_dct2 = _core.ElementwiseKernel(
-    in_params='R xr, int32 N, R norm_factor',
-    out_params='C y',
-    operation="""
-    C j(0., -1.);
-    y = (R)2.0 * norm_factor * exp(j * (R)(i * M_PI / (2 * N)));""",
+_dct2_postprocess = _core.ElementwiseKernel(
+    'raw C v, int64 n, float64 norm_factor, float64 scale0, bool dst',
+    'T y',
+    '''
+    ptrdiff_t k = i % n;
+    ptrdiff_t src = dst ? n - 1 - k : k;
+    C a = v[i - k + src];
+    T theta = (T)(src * M_PI / (2 * n));
+    T scale = (T)(2.0 * norm_factor * (src == 0 ? scale0 : 1.0));
+    y = scale * (a.real() * cos(theta) + a.imag() * sin(theta));
+    ''',
+    'cupyx_scipy_fft_dct2_postprocess',
 )
 
 
-def _exp_factor_dct2(x, n, axis, norm_factor, n_truncate=None):
-    """Twiddle & scaling factors for computation of DCT/DST-II via FFT."""
-    if n_truncate is None:
-        n_truncate = n
-    tmp = cupy.empty((n_truncate,), dtype=x.dtype)
-    _mult_factor_dct2(tmp.real, n, norm_factor, tmp)
+def _check_r2r_args(x, n, axis):
+    if axis < -x.ndim or axis >= x.ndim:
+        raise AxisError('axis out of range')
+    if axis < 0:
+        axis += x.ndim
+    if n is not None and n < 1:
+        raise ValueError(
+            f'invalid number of data points ({n}) specified'
+        )
+    if n is None:
+        n = x.shape[axis]
+    return n, axis
+
 
-    if x.ndim == 1:
-        return tmp
-    tmp_shape = [1] * x.ndim
-    tmp_shape[axis] = n_truncate
-    tmp_shape = tuple(tmp_shape)
-    return tmp.reshape(tmp_shape)
+def _r2r_work_array(x, n, axis):
+    """Complex array with the transformed axis last to run the FFT on."""
+    shape = x.shape[:axis] + x.shape[axis + 1:] + (n,)
+    return cupy.empty(shape, dtype=cupy.promote_types(x.dtype, cupy.complex64))
+
+
+def _r2r_output_array(x, n, axis):
+    """Real output array and its view with the transformed axis last."""
+    out = cupy.empty(x.shape[:axis] + (n,) + x.shape[axis + 1:], x.dtype)
+    return out, cupy.moveaxis(out, axis, -1)
 
 
 def _dct_or_dst_type2(
@@ -160,93 +178,54 @@ def _dct_or_dst_type2(
     y: cupy.ndarray
         The transformed array.
     """
-    if axis < -x.ndim or axis >= x.ndim:
-        raise AxisError('axis out of range')
-    if axis < 0:
-        axis += x.ndim
-    if n is not None and n < 1:
-        raise ValueError(
-            f'invalid number of data points ({n}) specified'
-        )
-
-    x = _cook_shape(x, (n,), (axis,), 'R2R')
-    n = x.shape[axis]
-
-    x = _reshuffle_dct2(x, x.shape[axis], axis, dst)
+    n, axis = _check_r2r_args(x, n, axis)
 
     if norm == 'ortho':
         inorm = 'sqrt'
+        scale0 = math.sqrt(0.5)
     elif norm == 'forward':
         inorm = 'full' if forward else 'none'
+        scale0 = 1.0
     else:
         inorm = 'none' if forward else 'full'
+        scale0 = 1.0
     norm_factor = _get_dct_norm_factor(n, inorm=inorm, dct_type=2)
 
-    x = _fft.fft(x, n=n, axis=axis, overwrite_x=True)
-    tmp = _exp_factor_dct2(x, n, axis, norm_factor)
-
-    x *= tmp  # broadcasting
-    x = cupy.real(x)
-
-    if norm == 'ortho':
-        sl0 = [slice(None)] * x.ndim
-        sl0[axis] = slice(1)
-        x[tuple(sl0)] *= math.sqrt(2) * 0.5
-
-    if dst:
-        slrev = [slice(None)] * x.ndim
-        slrev[axis] = slice(None, None, -1)
-        x = x[tuple(slrev)]
-    return x
-
-
-def _reshuffle_dct3(y, n, axis, dst):
-    """Reorder entries to allow computation of DCT/DST-II via FFT."""
-    x = cupy.empty_like(y)
-    n_half = (n + 1) // 2
-
-    # Store first half of y in the even entries of the output
-    sl_even = [slice(None)] * y.ndim
-    sl_even[axis] = slice(0, None, 2)
-    sl_even = tuple(sl_even)
-
-    sl_half = [slice(None)] * y.ndim
-    sl_half[axis] = slice(0, n_half)
-    x[sl_even] = y[tuple(sl_half)]
-
-    # Store the second half of y in the odd entries of the output
-    sl_odd = [slice(None)] * y.ndim
-    sl_odd[axis] = slice(1, None, 2)
-    sl_odd = tuple(sl_odd)
-
-    sl_half[axis] = slice(-1, n_half - 1, -1)
-    if dst:
-        x[sl_odd] = -y[tuple(sl_half)]
-    else:
-        x[sl_odd] = y[tuple(sl_half)]
-    return x
-
-
-_mult_factor_dct3 = _core.ElementwiseKernel(
-    in_params='R xr, int32 N, R norm_factor',
-    out_params='C y',
-    operation="""
-    C j(0., 1.);
-    y = (R)(2 * N * norm_factor) * exp(j * (R)(i * M_PI / (2 * N)));""",
+    v = _r2r_work_array(x, n, axis)
+    _dct2_preprocess(cupy.moveaxis(x, axis, -1), x.shape[axis], n, dst, v)
+    v = _fft.fft(v, axis=-1, overwrite_x=True)
+    out, out_view = _r2r_output_array(x, n, axis)
+    _dct2_postprocess(v, n, norm_factor, scale0, dst, out_view)
+    return out
+
+
+_dct3_preprocess = _core.ElementwiseKernel(
+    'raw T x, int64 m, int64 n, float64 norm_factor, float64 scale0, '
+    'bool dst',
+    'C v',
+    '''
+    ptrdiff_t k = i % n;
+    ptrdiff_t src = dst ? n - 1 - k : k;
+    T t = src < m ? x[i / n * m + src] : (T)0;
+    t *= (T)(2 * n * norm_factor * (k == 0 ? scale0 : 1.0));
+    T theta = (T)(k * M_PI / (2 * n));
+    v = C(t * cos(theta), t * sin(theta));
+    ''',
+    'cupyx_scipy_fft_dct3_preprocess',
 )
 
 
-def _exp_factor_dct3(x, n, axis, dtype, norm_factor):
-    """Twiddle & scaling factors for computation of DCT/DST-III via FFT."""
-    tmp = cupy.empty((n,), dtype=dtype)
-    _mult_factor_dct3(tmp.real, n, norm_factor, tmp)
-    if x.ndim == 1:
-        return tmp
-    # prepare shape for broadcasting along non-transformed axes
-    tmp_shape = [1] * x.ndim
-    tmp_shape[axis] = n
-    tmp_shape = tuple(tmp_shape)
-    return tmp.reshape(tmp_shape)
+_dct3_postprocess = _core.ElementwiseKernel(
+    'raw C v, int64 n, bool dst',
+    'T y',
+    '''
+    ptrdiff_t k = i % n;
+    bool odd = k % 2 == 1;
+    T t = v[i - k + (odd ? n - 1 - k / 2 : k / 2)].real();
+    y = dst && odd ? -t : t;
+    ''',
+    'cupyx_scipy_fft_dct3_postprocess',
+)
 
 
 def _dct_or_dst_type3(
@@ -281,61 +260,31 @@ def _dct_or_dst_type3(
         The transformed array.
 
     """
-    if axis < -x.ndim or axis >= x.ndim:
-        raise AxisError('axis out of range')
-    if axis < 0:
-        axis += x.ndim
-    if n is not None and n < 1:
-        raise ValueError(
-            f'invalid number of data points ({n}) specified'
-        )
-
-    x = _cook_shape(x, (n,), (axis,), 'R2R')
-    n = x.shape[axis]
+    n, axis = _check_r2r_args(x, n, axis)
 
     # determine normalization factor
     if norm == 'ortho':
-        sl0_scale = 0.5 * math.sqrt(2)
+        # for DST, the first entry is also scaled by sqrt(2) in advance
+        scale0 = 0.5 * math.sqrt(2)
         inorm = 'sqrt'
     elif norm == 'forward':
-        sl0_scale = 0.5
+        scale0 = 0.5
         inorm = 'full' if forward else 'none'
     elif norm == 'backward' or norm is None:
-        sl0_scale = 0.5
+        scale0 = 0.5
         inorm = 'none' if forward else 'full'
     else:
         raise ValueError(f'Invalid norm value "{norm}", should be "backward", '
                          '"ortho" or "forward"')
     norm_factor = _get_dct_norm_factor(n, inorm=inorm, dct_type=3)
-    dtype = cupy.promote_types(x, cupy.complex64)
-
-    sl0 = [slice(None)] * x.ndim
-    sl0[axis] = slice(1)
-
-    if dst:
-        slrev = [slice(None)] * x.ndim
-        slrev[axis] = slice(None, None, -1)
-        x = x[tuple(slrev)]
-        if norm == 'ortho':
-            float_dtype = cupy.promote_types(x.dtype, cupy.float32)
-            if x.dtype != float_dtype:
-                x = x.astype(float_dtype)
-            elif not overwrite_x:
-                x = x.copy()
-            x[tuple(sl0)] *= math.sqrt(2)
-            sl0_scale = 0.5
-
-    # scale by exponentials and normalization factor
-    tmp = _exp_factor_dct3(x, n, axis, dtype, norm_factor)
-    x = x * tmp  # broadcasting
-    x[tuple(sl0)] *= sl0_scale
-
-    # inverse fft
-    x = _fft.ifft(x, n=n, axis=axis, overwrite_x=True)
-    x = cupy.real(x)
-
-    # reorder entries
-    return _reshuffle_dct3(x, n, axis, dst)
+
+    v = _r2r_work_array(x, n, axis)
+    _dct3_preprocess(cupy.moveaxis(x, axis, -1), x.shape[axis], n,
+                     norm_factor, scale0, dst, v)
+    v = _fft.ifft(v, axis=-1, overwrite_x=True)
+    out, out_view = _r2r_output_array(x, n, axis)
+    _dct3_postprocess(v, n, dst, out_view)
+    return out
 
 
 @_fft._implements(_fft._scipy_fft.dct)
@@ -6,6 +6,7 @@ from cupy.fft._fft import (_convert_fft_type, _default_fft_func, _fft,
                            _get_cufft_plan_nd, _get_fftn_out_size,
                            _output_dtype)
 from cupy.fft._cache import get_plan_cache
+from cupy.fft._cache import _get_local_plan_cache
 
 
 def get_fft_plan(a, shape=None, axes=None, value_type='C2C'):
@@ -150,7 +151,11 @@ def get_fft_plan(a, shape=None, axes=None, value_type='C2C'):
             keys += (mgr.cb_load, mgr.cb_store,
                      0 if load_aux is None else load_aux.data.ptr,
                      0 if store_aux is None else store_aux.data.ptr)
-        cache = get_plan_cache()
+        if mgr is None and devices is None:
+            cache = get_plan_cache()
+        else:
+            # multi-GPU and callback plans are not in the shared cache
+            cache = _get_local_plan_cache()
         cached_plan = cache.get(keys)
         if cached_plan is not None:
             plan = cached_plan
@@ -1,3 +1,5 @@
+import functools
+
 import numpy
 
 import cupy
@@ -39,6 +41,12 @@ def correlate(input, weights, output=None, mode='reflect', cval=0.0, origin=0):
         When the output data type is integral (or when no output is provided
         and input is integral) the results may not perfectly match the results
         from SciPy due to floating-point rounding of intermediate results.
+
+    .. note::
+        When ``weights`` is the outer product of 1D weights and the output
+        is floating, the filter is computed as a sequence of 1D filters.
+        Checking this for large ``weights`` on the device synchronizes with
+        the device.
     """
     return _correlate_or_convolve(input, weights, output, mode, cval, origin)
 
@@ -73,6 +81,12 @@ def convolve(input, weights, output=None, mode='reflect', cval=0.0, origin=0):
         When the output data type is integral (or when no output is provided
         and input is integral) the results may not perfectly match the results
         from SciPy due to floating-point rounding of intermediate results.
+
+    .. note::
+        When ``weights`` is the outer product of 1D weights and the output
+        is floating, the filter is computed as a sequence of 1D filters.
+        Checking this for large ``weights`` on the device synchronizes with
+        the device.
     """
     return _correlate_or_convolve(input, weights, output, mode, cval, origin,
                                   True)
@@ -171,15 +185,108 @@ def _correlate_or_convolve(input, weights, output, mode, cval, origin,
     elif weights.dtype.kind == "c":
         # numpy.correlate conjugates weights rather than input.
         weights = weights.conj()
+    if _can_use_separable(input, weights, output, modes, cval):
+        factors = _get_separable_weights(weights)
+        if factors is not None:
+            return _filters_core._run_1d_filters(
+                [None if w is None else correlate1d for w in factors],
+                input, axes, factors, output, modes, cval, origins)
     weights_dtype = _util._get_weights_dtype(input, weights)
     offsets = _filters_core._origins_to_offsets(origins, weights.shape)
-    kernel = _get_correlate_kernel(modes, weights.shape, int_type,
-                                   offsets, cval)
+    kernel = None
+    if (weights.size >= _TILED_MIN_WEIGHTS and input.size > 0
+            and len(set(modes)) == 1):
+        config = _filters_core._get_tiled_launch_config(
+            input.shape, weights.shape, numpy.dtype(weights_dtype).itemsize)
+        if config is not None:
+            output = _util._get_output(
+                output, input, None,
+                input.dtype.kind == 'c' or weights.dtype.kind == 'c')
+            tiled = _filters_core._get_tiled_correlate_kernel(
+                tuple(modes), weights.shape, int_type, offsets, cval,
+                input.dtype, numpy.dtype(weights_dtype), output.dtype)
+            kernel = functools.partial(
+                _filters_core._call_tiled_correlate, tiled, config)
+    if kernel is None:
+        kernel = _get_correlate_kernel(modes, weights.shape, int_type,
+                                       offsets, cval)
     output = _filters_core._call_kernel(kernel, input, weights, output,
                                         weights_dtype=weights_dtype)
     return output
 
 
+# Minimum number of weights from which a tiled kernel, that stages the input
+# in shared memory, is used.
+_TILED_MIN_WEIGHTS = 64
+
+# Minimum number of weights from which the weights are checked for being
+# separable.
+_SEPARABLE_MIN_WEIGHTS = 25
+
+
+def _can_use_separable(input, weights, output, modes, cval):
+    if weights.size < _SEPARABLE_MIN_WEIGHTS:
+        return False
+    if sum(s > 1 for s in weights.shape) < 2:
+        return False
+    if weights.dtype.kind not in 'iuf' or input.dtype.kind == 'c':
+        return False
+    # Intermediate results are stored in the output, so that they must not
+    # be rounded to integers or half precision.
+    if isinstance(output, cupy.ndarray):
+        out_dtype = output.dtype
+    else:
+        out_dtype = input.dtype if output is None else numpy.dtype(output)
+    if out_dtype.kind != 'f' or out_dtype.itemsize < 4:
+        return False
+    # The constant pads of the intermediate results would be wrong.
+    return cval == 0 or 'constant' not in modes
+
+
+def _get_separable_weights(weights):
+    """Returns 1D weights whose outer product is the given weights.
+
+    Returns None if the weights are not separable to the precision of their
+    dtype, or contain non-finite values. Axes of size 1 are given None as
+    their 1D weights. The weights on the device are checked on the device,
+    and only the result of the check is copied to the host.
+    """
+    xp = cupy.get_array_module(weights)
+    w = xp.ascontiguousarray(weights, dtype=numpy.float64)
+    flat = w.ravel()
+    center = xp.argmax(xp.abs(flat))
+    # The slices through the largest weight are scaled by it. The scales
+    # of all the slices but one are folded into the first slice.
+    scale = flat[center] ** (sum(s > 1 for s in w.shape) - 1)
+    factors = []
+    stride = w.size
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        for n in w.shape:
+            stride //= n
+            if n == 1:
+                factors.append(None)
+                continue
+            start = center - (center // stride) % n * stride
+            factor = xp.take(flat, start + xp.arange(n) * stride)
+            if scale is not None:
+                factor, scale = factor / scale, None
+            factors.append(factor)
+        expected = functools.reduce(
+            xp.multiply.outer, [f if f is not None else xp.ones(1)
+                                for f in factors])
+    # The outer product of the slices of exactly separable weights differs
+    # from the weights by the rounding of each of the factors.
+    if weights.dtype.kind == 'f':
+        eps = numpy.finfo(weights.dtype).eps
+    else:
+        eps = numpy.finfo(numpy.float64).eps
+    rtol = 2 * w.ndim * eps
+    if not bool(xp.all(xp.isfinite(w))
+                & xp.all(xp.abs(expected - w) <= rtol * xp.abs(w))):
+        return None
+    return [None if f is None else cupy.asarray(f) for f in factors]
+
+
 @cupy._util.memoize(for_each_device=True)
 def _get_correlate_kernel(modes, w_shape, int_type, offsets, cval):
     return _filters_core._generate_nd_kernel(
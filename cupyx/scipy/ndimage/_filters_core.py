@@ -359,3 +359,156 @@ def _generate_nd_kernel(name, pre, found, post, modes, w_shape, int_type,
     return cupy.ElementwiseKernel(in_params, out_params, operation, name,
                                   reduce_dims=False, preamble=preamble,
                                   options=options)
+
+
+# Block shapes of the tiled kernels for each number of dimensions. The last
+# axis is mapped to threadIdx.x.
+_TILED_BLOCK_SHAPES = {2: (16, 16), 3: (8, 8, 8)}
+_TILED_MAX_SHARED_MEMORY = 48 * 1024
+_TILED_MAX_GRID_YZ = 65535
+
+
+def _get_tiled_launch_config(shape, w_shape, w_itemsize):
+    """Returns the grid, block and shared memory size of a tiled kernel.
+
+    Returns None if no tiled kernel is available for the shapes.
+    """
+    block = _TILED_BLOCK_SHAPES.get(len(shape))
+    if block is None:
+        return None
+    tile_size = internal.prod([b + w - 1 for b, w in zip(block, w_shape)])
+    shared_mem = tile_size * w_itemsize
+    if shared_mem > _TILED_MAX_SHARED_MEMORY:
+        return None
+    grid = tuple([(s + b - 1) // b for s, b in zip(shape, block)])
+    if any(g > _TILED_MAX_GRID_YZ for g in grid[:-1]):
+        return None
+    return grid[::-1], block[::-1], shared_mem
+
+
+@cupy._util.memoize(for_each_device=True)
+def _get_tiled_correlate_kernel(modes, w_shape, int_type, offsets, cval,
+                                x_dtype, w_dtype, y_dtype):
+    """Returns a RawKernel of correlation staging the input in shared memory.
+
+    Each block computes a tile of the output. The block first copies the
+    input of the tile with its halo, with the boundary conditions applied,
+    to shared memory, so that each input element is read from global memory
+    once per block instead of once per weight. The weights are visited in
+    the same order as the kernel of ``_generate_nd_kernel``, so that the
+    results are identical.
+    """
+    ndim = len(w_shape)
+    block = _TILED_BLOCK_SHAPES[ndim]
+    tile = [b + w - 1 for b, w in zip(block, w_shape)]
+    thread_idx = ['threadIdx.{}'.format(c) for c in 'zyx'[3 - ndim:]]
+    block_idx = ['blockIdx.{}'.format(c) for c in 'zyx'[3 - ndim:]]
+    modes = tuple('grid-wrap' if m == 'wrap' else m for m in modes)
+
+    if cval is numpy.nan:
+        cval = 'CUDART_NAN'
+    elif cval == numpy.inf:
+        cval = 'CUDART_INF'
+    elif cval == -numpy.inf:
+        cval = '-CUDART_INF'
+
+    params = ['const unsigned char* data', 'const W* w',
+              'unsigned char* ydata']
+    params += ['long long xsize_{}'.format(j) for j in range(ndim)]
+    params += ['long long xstride_{}'.format(j) for j in range(ndim)]
+    params += ['long long ystride_{}'.format(j) for j in range(ndim)]
+
+    load = []
+    for j in range(ndim - 1, -1, -1):
+        load.append('''
+        {T} ix_{j} = ({T}){start} * {b} + _t % {s} - {offset};
+        _t /= {s};
+        {boundary}'''.format(
+            T=int_type, j=j, start=block_idx[j], b=block[j], s=tile[j],
+            offset=offsets[j], boundary=_util._generate_boundary_condition_ops(
+                modes[j], f'ix_{j}', f'xsize_{j}', int_type)))
+    cond = ' || '.join(['(ix_{} < 0)'.format(j) for j in range(ndim)
+                        if modes[j] in ('constant', 'grid-constant')])
+    ptr = ' + '.join(['ix_{0} * xstride_{0}'.format(j) for j in range(ndim)])
+    value = 'cast<W>(*(const X*)&data[{}])'.format(ptr)
+    if cond:
+        value = '({}) ? cast<W>({}) : {}'.format(cond, cval, value)
+
+    out_index = ['{0} o_{1} = ({0}){2} * {3} + {4};'.format(
+        int_type, j, block_idx[j], block[j], thread_idx[j])
+        for j in range(ndim)]
+    out_cond = ' || '.join(['(o_{0} >= xsize_{0})'.format(j)
+                            for j in range(ndim)])
+    loops = ['for (int iw_{0} = 0; iw_{0} < {1}; iw_{0}++) {{'.format(
+        j, w_shape[j]) for j in range(ndim)]
+    tile_index = '{}'.format(thread_idx[0] + ' + iw_0')
+    for j in range(1, ndim):
+        tile_index = '({}) * {} + {} + iw_{}'.format(
+            tile_index, tile[j], thread_idx[j], j)
+    out_ptr = ' + '.join(['o_{0} * ystride_{0}'.format(j)
+                         for j in range(ndim)])
+
+    code = '''
+    #include <cupy/carray.cuh>
+    #include <cupy/complex.cuh>
+    {includes}
+    {cast_function}
+    typedef {X} X;
+    typedef {W} W;
+    typedef {Y} Y;
+
+    extern "C" __global__ void {name}({params}) {{
+        extern __shared__ __align__(16) unsigned char _smem[];
+        W* tile = reinterpret_cast<W*>(_smem);
+        const int n_threads = blockDim.x * blockDim.y * blockDim.z;
+        const int tid = (threadIdx.z * blockDim.y + threadIdx.y) * blockDim.x
+                        + threadIdx.x;
+        for (int t = tid; t < {tile_size}; t += n_threads) {{
+            int _t = t;
+            {load}
+            tile[t] = {value};
+        }}
+        __syncthreads();
+
+        {out_index}
+        if ({out_cond}) {{
+            return;
+        }}
+        W sum = (W)0;
+        int iws = 0;
+        {loops}
+            W wval = w[iws];
+            if (nonzero(wval)) {{
+                sum += tile[{tile_index}] * wval;
+            }}
+            iws++;
+        {end_loops}
+        *(Y*)&ydata[{out_ptr}] = cast<Y>(sum);
+    }}
+    '''
+    mode_str = '_'.join(m.replace('-', '_') for m in modes)
+    name = 'cupyx_scipy_ndimage_correlate_tiled_{}d_{}_w{}'.format(
+        ndim, mode_str, '_'.join([f'{x}' for x in w_shape]))
+    code = code.format(
+        includes=includes, cast_function=_CAST_FUNCTION,
+        X=_core._scalar.get_typename(x_dtype),
+        W=_core._scalar.get_typename(w_dtype),
+        Y=_core._scalar.get_typename(y_dtype), name=name,
+        params=', '.join(params),
+        tile_size=internal.prod(tile), load='\n'.join(load), value=value,
+        out_index='\n'.join(out_index), out_cond=out_cond,
+        loops='\n'.join(loops), tile_index=tile_index, end_loops='}' * ndim,
+        out_ptr=out_ptr)
+    return cupy.RawKernel(code, name, options=('--std=c++11',))
+
+
+def _call_tiled_correlate(kernel, config, input, weights, output):
+    """Launches a kernel of ``_get_tiled_correlate_kernel``.
+
+    The arguments are the same as the ones passed to the kernel by
+    ``_call_kernel``.
+    """
+    grid, block, shared_mem = config
+    args = (input, weights, output) + input.shape + input.strides + \
+        output.strides
+    kernel(grid, block, args, shared_mem=shared_mem)
@@ -99,14 +99,16 @@ def _label(x, structure, y):
     dirs = cupy.array(dirs, dtype=numpy.int32)
     ndirs = indxs.shape[0]
     y_shape = cupy.array(y.shape, dtype=numpy.int32)
-    count = cupy.zeros(2, dtype=numpy.int32)
+    # Each feature is a tree of union-find whose root is its first element
+    # in the C order, so that the labels are numbered in the same order as
+    # SciPy by the prefix sum of the roots.
     _kernel_init()(x, y)
     _kernel_connect()(y_shape, dirs, ndirs, x.ndim, y, size=y.size)
-    _kernel_count()(y, count, size=y.size)
-    maxlabel = int(count[0])
-    labels = cupy.empty(maxlabel, dtype=numpy.int32)
-    _kernel_labels()(y, count, labels, size=y.size)
-    _kernel_finalize()(maxlabel, cupy.sort(labels), y, size=y.size)
+    roots = cupy.empty(y.size, dtype=numpy.int32)
+    _kernel_flatten()(y, roots, size=y.size)
+    labels = cupy.cumsum(roots, dtype=numpy.int32)
+    maxlabel = int(labels[-1])
+    _kernel_finalize()(labels, y)
     return maxlabel
 
 
@@ -116,6 +118,23 @@ def _kernel_init():
         'cupyx_scipy_ndimage_label_init')
 
 
+# Finds the root of `j` halving the path, i.e., replacing the parent of each
+# visited element with its grandparent. This is safe without atomic
+# operations since a parent always points to a smaller index, and the
+# grandparent is also an ancestor.
+_find_root_preamble = '''
+template<typename A>
+__device__ int _find_root(A& y, int j) {
+    while (j != y[j]) {
+        int p = y[y[j]];
+        y[j] = p;
+        j = p;
+    }
+    return j;
+}
+'''
+
+
 def _kernel_connect():
     return _core.ElementwiseKernel(
         'raw int32 shape, raw int32 dirs, int32 ndirs, int32 ndim',
@@ -140,8 +159,8 @@ def _kernel_connect():
             if (k < 0) continue;
             if (y[k] < 0) continue;
             while (1) {
-                while (j != y[j]) { j = y[j]; }
-                while (k != y[k]) { k = y[k]; }
+                j = _find_root(y, j);
+                k = _find_root(y, k);
                 if (j == k) break;
                 if (j < k) {
                     int old = atomicCAS( &y[k], k, j );
@@ -156,53 +175,32 @@ def _kernel_connect():
             }
         }
         ''',
-        'cupyx_scipy_ndimage_label_connect')
+        'cupyx_scipy_ndimage_label_connect',
+        preamble=_find_root_preamble)
 
 
-def _kernel_count():
+def _kernel_flatten():
     return _core.ElementwiseKernel(
-        '', 'raw Y y, raw int32 count',
+        '', 'raw Y y, raw int32 roots',
         '''
-        if (y[i] < 0) continue;
-        int j = i;
-        while (j != y[j]) { j = y[j]; }
-        if (j != i) y[i] = j;
-        else atomicAdd(&count[0], 1);
-        ''',
-        'cupyx_scipy_ndimage_label_count')
-
-
-def _kernel_labels():
-    return _core.ElementwiseKernel(
-        '', 'raw Y y, raw int32 count, raw int32 labels',
-        '''
-        if (y[i] != i) continue;
-        int j = atomicAdd(&count[1], 1);
-        labels[j] = i;
+        int is_root = 0;
+        if (y[i] >= 0) {
+            // Only the element itself is updated, so that the path to the
+            // root of the other elements is not broken.
+            int j = i;
+            while (j != y[j]) { j = y[j]; }
+            y[i] = j;
+            is_root = (j == i);
+        }
+        roots[i] = is_root;
         ''',
-        'cupyx_scipy_ndimage_label_labels')
+        'cupyx_scipy_ndimage_label_flatten')
 
 
 def _kernel_finalize():
     return _core.ElementwiseKernel(
-        'int32 maxlabel', 'raw int32 labels, raw Y y',
-        '''
-        if (y[i] < 0) {
-            y[i] = 0;
-            continue;
-        }
-        int yi = y[i];
-        int j_min = 0;
-        int j_max = maxlabel - 1;
-        int j = (j_min + j_max) / 2;
-        while (j_min < j_max) {
-            if (yi == labels[j]) break;
-            if (yi < labels[j]) j_max = j - 1;
-            else j_min = j + 1;
-            j = (j_min + j_max) / 2;
-        }
-        y[i] = j + 1;
-        ''',
+        'raw int32 labels', 'Y y',
+        'y = (y < 0) ? 0 : labels[y];',
         'cupyx_scipy_ndimage_label_finalize')
 
 
@@ -579,6 +577,129 @@ def _get_positions(arrays, position_arrays, arg_func):
     )
 
 
+_order_key_preambles = {
+    # Maps a value to an unsigned integer with the same order. NaN is mapped
+    # to the largest key, and -0.0 to the key of 0.0, to order them in the
+    # same way as sorting.
+    'f': r'''
+    __device__ unsigned long long _order_key(double x) {
+        if (x != x) {
+            return 0xffffffffffffffffULL;
+        }
+        if (x == 0) {
+            x = 0.0;
+        }
+        long long bits = __double_as_longlong(x);
+        if (bits < 0) {
+            return ~(unsigned long long)bits;
+        }
+        return (unsigned long long)bits | 0x8000000000000000ULL;
+    }
+    ''',
+    'i': r'''
+    __device__ unsigned long long _order_key(long long x) {
+        return (unsigned long long)x ^ 0x8000000000000000ULL;
+    }
+    ''',
+    'u': r'''
+    __device__ unsigned long long _order_key(unsigned long long x) {
+        return x;
+    }
+    ''',
+}
+
+
+@_util.memoize(for_each_device=True)
+def _get_segmented_extrema_kernels(dtype, find_min, find_max):
+    # The keys and the positions are accumulated by atomicMax on zeros, so
+    # that zero means no element. The minimum is found as the maximum of
+    # the inverted keys, and its position ``i`` is stored as ``n - i``,
+    # where ``n`` is the number of elements, to find the first position.
+    kind = dtype.kind
+    preamble = _order_key_preambles['u' if kind == 'b' else kind]
+    # float16 has no direct conversion to double.
+    cast = '(float)' if dtype == numpy.float16 else ''
+    keys_code = []
+    positions_code = []
+    if find_min:
+        keys_code.append('atomicMax(&min_keys[labels], ~key);')
+        positions_code.append("""
+        if (~key == min_keys[labels]) {
+            atomicMax(&min_pos[labels], (unsigned long long)(_ind.size() - i));
+        }""")
+    if find_max:
+        keys_code.append('atomicMax(&max_keys[labels], key);')
+        positions_code.append("""
+        if (key == max_keys[labels]) {
+            atomicMax(&max_pos[labels], (unsigned long long)(i + 1));
+        }""")
+    code = 'unsigned long long key = _order_key({}input);\n'.format(cast)
+    keys_kernel = _core.ElementwiseKernel(
+        'T input, L labels',
+        'raw uint64 min_keys, raw uint64 max_keys',
+        code + '\n'.join(keys_code),
+        'cupyx_scipy_ndimage_segmented_extrema_keys',
+        preamble=preamble)
+    positions_kernel = _core.ElementwiseKernel(
+        'T input, L labels, raw uint64 min_keys, raw uint64 max_keys',
+        'raw uint64 min_pos, raw uint64 max_pos',
+        code + '\n'.join(positions_code),
+        'cupyx_scipy_ndimage_segmented_extrema_positions',
+        preamble=preamble)
+    return keys_kernel, positions_kernel
+
+
+def _select_segmented(input, labels, idxs, n_labels, find_min,
+                      find_min_positions, find_max, find_max_positions):
+    """Internal helper routine for _select.
+
+    Computes the extrema and their positions of all the labels at once by
+    two passes of atomic operations, regardless of the number of labels.
+    ``input`` and ``labels`` must be 1-D, and the labels must be integers in
+    ``[0, n_labels)``. ``idxs`` may contain ``n_labels`` for the labels not
+    found. For repeated extrema, the first position of the minimum and the
+    last position of the maximum are returned, as in the implementation
+    based on cupy.lexsort.
+    """
+    need_min = find_min or find_min_positions
+    need_max = find_max or find_max_positions
+    keys_kernel, positions_kernel = _get_segmented_extrema_kernels(
+        input.dtype, need_min, need_max)
+
+    # The extra element is for the labels not found.
+    min_keys = cupy.zeros(n_labels + 1, cupy.uint64)
+    max_keys = cupy.zeros(n_labels + 1, cupy.uint64)
+    min_pos = cupy.zeros(n_labels + 1, cupy.uint64)
+    max_pos = cupy.zeros(n_labels + 1, cupy.uint64)
+    keys_kernel(input, labels, min_keys, max_keys)
+    positions_kernel(input, labels, min_keys, max_keys, min_pos, max_pos)
+
+    def gather(stored, first):
+        stored = stored[idxs].astype(cupy.int64)
+        found = stored != 0
+        pos = input.size - stored if first else stored - 1
+        pos = cupy.where(found, pos, 0)
+        values = cupy.where(found, input[pos], 0).astype(input.dtype)
+        return values, pos
+
+    if need_min:
+        min_values, min_positions = gather(min_pos, True)
+    if need_max:
+        max_values, max_positions = gather(max_pos, False)
+
+    result = []
+    # the order below matches the order expected by cupy.ndimage.extrema
+    if find_min:
+        result += [min_values]
+    if find_min_positions:
+        result += [min_positions]
+    if find_max:
+        result += [max_values]
+    if find_max_positions:
+        result += [max_positions]
+    return result
+
+
 def _select_via_looping(input, labels, idxs, positions, find_min,
                         find_min_positions, find_max, find_max_positions,
                         find_median):
@@ -682,15 +803,25 @@ def _select(input, labels=None, index=None, find_min=False, find_max=False,
         # Make all of idxs valid
         idxs[idxs >= unique_labels.size] = 0
         found = unique_labels[idxs] == index
+        n_labels = unique_labels.size
     else:
         # Labels are an integer type, and there aren't too many
         idxs = cupy.asanyarray(index, int).copy()
         found = (idxs >= 0) & (idxs <= max_label)
-
-    idxs[~found] = max_label + 1
+        n_labels = None
 
     input = input.ravel()
     labels = labels.ravel()
+
+    if not find_median and input.dtype.kind in 'biuf':
+        if n_labels is None:
+            n_labels = int(max_label) + 1
+        idxs[~found] = n_labels
+        return _select_segmented(
+            input, labels, idxs, n_labels, find_min, find_min_positions,
+            find_max, find_max_positions)
+
+    idxs[~found] = max_label + 1
     if find_positions:
         positions = positions.ravel()
 
@@ -698,12 +829,9 @@ def _select(input, labels=None, index=None, find_min=False, find_max=False,
         cupy._core.get_routine_accelerators()
 
     if using_cub:
-        # Cutoff values below were determined empirically for relatively large
+        # Cutoff value below was determined empirically for relatively large
         # input arrays.
-        if find_positions or find_median:
-            n_label_cutoff = 15
-        else:
-            n_label_cutoff = 30
+        n_label_cutoff = 15
     else:
         n_label_cutoff = 0
 
@@ -1074,7 +1202,8 @@ def center_of_mass(input, labels=None, index=None):
 
 
 def labeled_comprehension(
-    input, labels, index, func, out_dtype, default, pass_positions=False
+    input, labels, index, func, out_dtype, default, pass_positions=False,
+    *, batched=False
 ):
     """Array resulting from applying ``func`` to each labeled region.
 
@@ -1099,6 +1228,18 @@ def labeled_comprehension(
             `index` does not exist in `labels`.
         pass_positions (bool, optional): If True, pass linear indices to `func`
             as a second argument.
+        batched (bool, optional): If True, `func` is called only once for all
+            the labels. The values of the labels are sorted by label into a
+            single array, and `func` is called as ``func(values, offsets)``
+            (``func(values, positions, offsets)`` if `pass_positions` is
+            True), where the values of the ``i``-th unique label of `index`
+            in sorted order are ``values[offsets[i]:offsets[i + 1]]``. `func`
+            must return an array (or a sequence if `out_dtype` is
+            ``object``) of the results of the unique labels in that order,
+            which are then arranged in the order of `index`. The results of
+            the labels not found in `labels`, whose segments are empty, are
+            replaced with `default`.
+            This avoids the overhead of calling `func` per label.
 
     Returns:
         cupy.ndarray: Result of applying `func` to each of `labels` to `input`
@@ -1112,6 +1253,9 @@ def labeled_comprehension(
     if pass_positions:
         positions = cupy.arange(input.size).reshape(input.shape)
 
+    if batched:
+        func = _batched_single_segment(func)
+
     if labels is None:
         if index is not None:
             raise ValueError('index without defined labels')
@@ -1144,6 +1288,11 @@ def labeled_comprehension(
 
     index = index.astype(labels.dtype)
 
+    if batched:
+        return _labeled_comprehension_batched(
+            input, labels, index, func.__wrapped__, out_dtype, default,
+            positions if pass_positions else None, as_scalar)
+
     # optimization: find min/max in index, and select those parts of labels,
     #               input, and positions
     lo = index.min()
@@ -1205,6 +1354,53 @@ def labeled_comprehension(
     return output
 
 
+def _batched_single_segment(func):
+    # Wraps a batched function to apply it to a single segment.
+    def wrapper(*inputs):
+        offsets = cupy.asarray([0, inputs[0].size], cupy.int64)
+        return func(*inputs, offsets)[0]
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def _labeled_comprehension_batched(input, labels, index, func, out_dtype,
+                                   default, positions, as_scalar):
+    # Partitions the values into segments of the labels in a CSR layout, and
+    # calls `func` once for all the segments.
+    unique_index, inverse = cupy.unique(index, return_inverse=True)
+    labels = labels.ravel()
+    input = input.ravel()
+
+    # Selects the values of the requested labels, and sorts them by label.
+    i = cupy.searchsorted(unique_index, labels)
+    i[i == unique_index.size] = 0
+    mask = unique_index[i] == labels
+    i = i[mask]
+    label_order = cupy.argsort(i)
+    inputs = [input[mask][label_order]]
+    if positions is not None:
+        inputs.append(positions.ravel()[mask][label_order])
+
+    counts = cupy.bincount(i, minlength=unique_index.size)
+    offsets = cupy.zeros(unique_index.size + 1, cupy.int64)
+    cupy.cumsum(counts, out=offsets[1:])
+    results = func(*inputs, offsets)
+
+    if out_dtype == object:
+        counts = cupy.asnumpy(counts)
+        results = [r if n else default for r, n in zip(results, counts)]
+        output = [results[j] for j in cupy.asnumpy(inverse).ravel()]
+    else:
+        if default is None and numpy.dtype(out_dtype).kind in 'fc':
+            default = numpy.nan  # match NumPy floating-point None behavior
+        results = cupy.where(counts > 0, cupy.asarray(results), default)
+        output = results.astype(out_dtype, copy=False)[inverse.ravel()]
+        output = output.reshape(index.shape)
+    if as_scalar:
+        output = output[0]
+    return output
+
+
 def histogram(input, min, max, bins, labels=None, index=None):
     """Calculate the histogram of the values of an array, optionally at labels.
 
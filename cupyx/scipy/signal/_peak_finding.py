@@ -303,13 +303,49 @@ __global__ void peak_widths<half>(
     left_ips[idx] = left_ip;
     right_ips[idx] = right_ip;
 }
+
+__global__ void select_by_peak_distance(
+        const long long n_peaks, const double distance,
+        const long long* __restrict__ peaks,
+        const long long* __restrict__ priority_to_position, bool* keep) {
+
+    // Whether a peak is kept depends on all the peaks of higher priority,
+    // so a single thread visits the peaks in the order of priority.
+    if(blockIdx.x != 0 || threadIdx.x != 0) {
+        return;
+    }
+
+    // Round up because actual peak distance can only be natural number
+    const double distance_ = ceil(distance);
+
+    for(long long i = n_peaks - 1; i >= 0; i--) {
+        const long long j = priority_to_position[i];
+        if(!keep[j]) {
+            continue;
+        }
+
+        const long long peak = peaks[j];
+        long long k = j - 1;
+        while(0 <= k && peak - peaks[k] < distance_) {
+            keep[k] = false;
+            k--;
+        }
+
+        k = j + 1;
+        while(k < n_peaks && peaks[k] - peak < distance_) {
+            keep[k] = false;
+            k++;
+        }
+    }
+}
 """  # NOQA
 
 PEAKS_MODULE = cupy.RawModule(
     code=PEAKS_KERNEL, options=('-std=c++11',),
     name_expressions=[f'local_maxima_1d<{x}>' for x in TYPE_NAMES] +
     [f'peak_prominences<{x}>' for x in TYPE_NAMES] +
-    [f'peak_widths<{x}>' for x in TYPE_NAMES])
+    [f'peak_widths<{x}>' for x in TYPE_NAMES] +
+    ['select_by_peak_distance'])
 
 
 ARGREL_KERNEL = r"""
@@ -656,43 +692,27 @@ def _select_by_peak_distance(peaks, priority, distance):
     advantages.
     """
     peaks_size = peaks.shape[0]
-    # Round up because actual peak distance can only be natural number
-    distance_ = cupy.ceil(distance)
     keep = cupy.ones(peaks_size, dtype=cupy.bool_)  # Prepare array of flags
+    if peaks_size == 0:
+        return keep
 
     # Create map from `i` (index for `peaks` sorted by `priority`) to `j`
     # (index for `peaks` sorted by position). This allows to iterate `peaks`
     # and `keep` with `j` by order of `priority` while still maintaining the
     # ability to step to neighbouring peaks with (`j` + 1) or (`j` - 1).
-    priority_to_position = cupy.argsort(priority)
-
-    # Highest priority first -> iterate in reverse order (decreasing)
+    priority_to_position = cupy.argsort(priority).astype(
+        cupy.int64, copy=False)
+    peaks = cupy.ascontiguousarray(peaks, dtype=cupy.int64)
 
     # NOTE: There's not an alternative way to do this procedure in a parallel
     # fashion, since discarding a peak requires to know if there's a valid
     # neighbour that subsumes it, which in turn requires to know
-    # if that neighbour is valid. If it was to done in parallel, there would be
-    # tons of repeated computations per peak, thus increasing the total runtime
-    # per peak compared to a sequential implementation.
-    for i in range(peaks_size - 1, -1, -1):
-        # "Translate" `i` to `j` which points to current peak whose
-        # neighbours are to be evaluated
-        j = priority_to_position[i]
-        if keep[j] == 0:
-            # Skip evaluation for peak already marked as "don't keep"
-            continue
-
-        k = j - 1
-        # Flag "earlier" peaks for removal until minimal distance is exceeded
-        while 0 <= k and peaks[j] - peaks[k] < distance_:
-            keep[k] = 0
-            k -= 1
-
-        k = j + 1
-        # Flag "later" peaks for removal until minimal distance is exceeded
-        while k < peaks_size and peaks[k] - peaks[j] < distance_:
-            keep[k] = 0
-            k += 1
+    # if that neighbour is valid. The peaks are therefore evaluated by a
+    # single device thread, which avoids the synchronization of the host
+    # with the device on every peak.
+    select_kernel = _get_module_func(PEAKS_MODULE, 'select_by_peak_distance')
+    select_kernel((1,), (1,), (peaks_size, float(distance), peaks,
+                               priority_to_position, keep))
     return keep
 
 
@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+
+"""
+Memory Pool Simulator
+
+Replays an allocation trace recorded with
+:class:`cupy.cuda.memory_hooks.TraceHook` against a pure-Python model of the
+binning, splitting and merging of :class:`cupy.cuda.SingleDeviceMemoryPool`.
+No GPU is needed, so the rounding of allocation sizes, the allocation policy
+and the memory limit can be tuned offline for a workload, and fragmentation
+regressions can be checked in CI::
+
+    python -m cupyx.tools.simulate_pool trace.bin --policy first_fit
+"""
+
+import argparse
+import bisect
+import json
+import sys
+
+from cupy.cuda.memory_hooks import trace as _trace
+
+
+class _Chunk:
+
+    __slots__ = ('ptr', 'size', 'stream', 'prev', 'next', 'free')
+
+    def __init__(self, ptr, size, stream):
+        self.ptr = ptr
+        self.size = size
+        self.stream = stream
+        self.prev = None
+        self.next = None
+        self.free = False
+
+    def split(self, size):
+        if self.size <= size:
+            return None
+        remaining = _Chunk(self.ptr + size, self.size - size, self.stream)
+        self.size = size
+        if self.next is not None:
+            remaining.next = self.next
+            remaining.next.prev = remaining
+        self.next = remaining
+        remaining.prev = self
+        return remaining
+
+    def merge(self, remaining):
+        self.size += remaining.size
+        self.next = remaining.next
+        if remaining.next is not None:
+            self.next.prev = self
+
+
+class _Arena:
+
+    def __init__(self):
+        # Map from the size to the list of free chunks of that size.
+        self.free = {}
+        # Sorted list of the keys of `free`.
+        self.sizes = []
+        self.free_bytes = 0
+
+    def append(self, chunk):
+        chunks = self.free.get(chunk.size)
+        if chunks is None:
+            chunks = self.free[chunk.size] = []
+            bisect.insort(self.sizes, chunk.size)
+        chunks.append(chunk)
+        chunk.free = True
+        self.free_bytes += chunk.size
+
+    def remove(self, chunk):
+        chunks = self.free[chunk.size]
+        chunks.remove(chunk)
+        if not chunks:
+            del self.free[chunk.size]
+            del self.sizes[bisect.bisect_left(self.sizes, chunk.size)]
+        chunk.free = False
+        self.free_bytes -= chunk.size
+
+    def pop(self, size, first_fit):
+        i = bisect.bisect_left(self.sizes, size)
+        if i == len(self.sizes):
+            return None
+        if first_fit:
+            chunk = min([c for s in self.sizes[i:] for c in self.free[s]],
+                        key=lambda c: c.ptr)
+        else:
+            # The pool takes an arbitrary chunk from the bin.
+            chunk = self.free[self.sizes[i]][-1]
+        self.remove(chunk)
+        return chunk
+
+    def largest_free_block(self):
+        return self.sizes[-1] if self.sizes else 0
+
+
+class PoolSimulator:
+    """Pure-Python model of :class:`cupy.cuda.SingleDeviceMemoryPool`.
+
+    Args:
+        allocation_unit_size (int): The unit to round the allocation sizes
+            up to. Ignored if ``round_size`` is given.
+        limit (int): The limit of the total bytes allocated from the device,
+            as :meth:`cupy.cuda.MemoryPool.set_limit`. ``0`` means no limit.
+        policy (str): The allocation policy, ``'bin'`` or ``'first_fit'``.
+            See :class:`cupy.cuda.SingleDeviceMemoryPool`. With ``'bin'``,
+            the most recently freed block of the bin is reused, while the
+            actual pool takes an arbitrary one. The blocks allocated from
+            the device are placed at increasing addresses.
+        round_size (callable): A function that rounds a requested size to
+            the size to be allocated, to try rounding schemes other than
+            the multiples of ``allocation_unit_size``.
+    """
+
+    def __init__(self, allocation_unit_size=512, limit=0, policy='bin',
+                 round_size=None):
+        if policy not in ('bin', 'first_fit'):
+            raise ValueError('Invalid policy: {}'.format(policy))
+        if round_size is None:
+            unit = allocation_unit_size
+
+            def round_size(size):
+                return (size + unit - 1) // unit * unit
+
+        self._round_size = round_size
+        self._limit = limit
+        self._first_fit = policy == 'first_fit'
+        self._arenas = {}
+        self._next_ptr = 0
+        self.used_bytes = 0
+        self.total_bytes = 0
+        self.peak_used_bytes = 0
+        self.peak_total_bytes = 0
+        self.peak_fragmented_bytes = 0
+        self.n_malloc = 0
+        self.n_free = 0
+        self.n_pool_hits = 0
+        self.n_pool_misses = 0
+        self.n_oom_retries = 0
+        self.n_oom_errors = 0
+
+    def _arena(self, stream):
+        arena = self._arenas.get(stream)
+        if arena is None:
+            arena = self._arenas[stream] = _Arena()
+        return arena
+
+    def malloc(self, size, stream=0):
+        """Allocates a block, or returns ``None`` if the limit is exceeded.
+        """
+        size = self._round_size(size)
+        if size == 0:
+            return None
+        arena = self._arena(stream)
+        chunk = arena.pop(size, self._first_fit)
+        if chunk is not None:
+            self.n_pool_hits += 1
+            remaining = chunk.split(size)
+            if remaining is not None:
+                arena.append(remaining)
+        else:
+            self.n_pool_misses += 1
+            if not self._try_malloc(size):
+                self.n_oom_errors += 1
+                return None
+            chunk = _Chunk(self._next_ptr, size, stream)
+            self._next_ptr += size
+        self.n_malloc += 1
+        self.used_bytes += chunk.size
+        self.peak_used_bytes = max(self.peak_used_bytes, self.used_bytes)
+        self.peak_fragmented_bytes = max(
+            self.peak_fragmented_bytes, self.fragmented_bytes())
+        return chunk
+
+    def _try_malloc(self, size):
+        limit = self._limit
+        if limit != 0 and self.total_bytes + size > limit:
+            # The pool retries twice (the second time after running GC,
+            # which does not change anything here) before giving up.
+            for _ in range(2):
+                self.n_oom_retries += 1
+                self.free_all_blocks()
+                if self.total_bytes + size <= limit:
+                    break
+            else:
+                return False
+        self.total_bytes += size
+        self.peak_total_bytes = max(self.peak_total_bytes, self.total_bytes)
+        return True
+
+    def free(self, chunk):
+        """Returns a block allocated by :meth:`malloc` to the pool."""
+        self.n_free += 1
+        self.used_bytes -= chunk.size
+        arena = self._arena(chunk.stream)
+        c = chunk.next
+        if c is not None and c.free:
+            arena.remove(c)
+            chunk.merge(c)
+        c = chunk.prev
+        if c is not None and c.free:
+            arena.remove(c)
+            c.merge(chunk)
+            chunk = c
+        arena.append(chunk)
+
+    def free_all_blocks(self):
+        """Releases all the non-split free blocks."""
+        for arena in self._arenas.values():
+            for size in list(arena.sizes):
+                for chunk in list(arena.free[size]):
+                    if chunk.prev is None and chunk.next is None:
+                        arena.remove(chunk)
+                        self.total_bytes -= chunk.size
+
+    def fragmented_bytes(self):
+        """Returns the free bytes not in the largest free block of each
+        arena."""
+        return sum(arena.free_bytes - arena.largest_free_block()
+                   for arena in self._arenas.values())
+
+    def get_stats(self):
+        """Returns the statistics of the simulated pool.
+
+        The keys are the same as :meth:`cupy.cuda.MemoryPool.get_stats`
+        except ``'bins'``, and in addition:
+
+        - ``'fragmented_bytes'``: the value of :meth:`fragmented_bytes`,
+          and ``'peak_fragmented_bytes'``, its maximum after an allocation.
+        - ``'n_oom_errors'``: the number of allocations that failed as the
+          limit was exceeded. The pool raises
+          :class:`cupy.cuda.memory.OutOfMemoryError` for them.
+        """
+        arenas = {}
+        for stream, arena in self._arenas.items():
+            largest = arena.largest_free_block()
+            arenas[stream] = {
+                'free_bytes': arena.free_bytes,
+                'n_free_blocks': sum(len(c) for c in arena.free.values()),
+                'largest_free_block': largest,
+                'fragmentation': (
+                    1.0 - largest / arena.free_bytes
+                    if arena.free_bytes > 0 else 0.0),
+            }
+        return {
+            'used_bytes': self.used_bytes,
+            'free_bytes': sum(a['free_bytes'] for a in arenas.values()),
+            'total_bytes': self.total_bytes,
+            'peak_used_bytes': self.peak_used_bytes,
+            'peak_total_bytes': self.peak_total_bytes,
+            'fragmented_bytes': self.fragmented_bytes(),
+            'peak_fragmented_bytes': self.peak_fragmented_bytes,
+            'n_malloc': self.n_malloc,
+            'n_free': self.n_free,
+            'n_pool_hits': self.n_pool_hits,
+            'n_pool_misses': self.n_pool_misses,
+            'n_oom_retries': self.n_oom_retries,
+            'n_oom_errors': self.n_oom_errors,
+            'n_free_blocks': sum(
+                a['n_free_blocks'] for a in arenas.values()),
+            'arenas': arenas,
+        }
+
+
+def simulate(events, **kwargs):
+    """Replays the events of a trace against simulated memory pools.
+
+    Args:
+        events (list of TraceEvent): Events read by
+            :func:`cupy.cuda.memory_hooks.trace.read_trace`.
+        kwargs: Arguments passed to :class:`PoolSimulator`.
+
+    Returns:
+        dict: A dictionary mapping each device ID to the statistics of its
+        pool (see :meth:`PoolSimulator.get_stats`).
+    """
+    pools = {}
+    chunks = {}
+    for event in events:
+        pool = pools.get(event.device_id)
+        if pool is None:
+            pool = pools[event.device_id] = PoolSimulator(**kwargs)
+        if event.kind == _trace.MALLOC:
+            chunk = pool.malloc(event.size, event.stream)
+            if chunk is not None:
+                chunks[event.alloc_id] = chunk
+        elif event.kind == _trace.FREE:
+            chunk = chunks.pop(event.alloc_id, None)
+            if chunk is not None:
+                pool.free(chunk)
+    return {device_id: pool.get_stats() for device_id, pool in pools.items()}
+
+
+def main(args):
+    parser = argparse.ArgumentParser(
+        description='Replay a memory allocation trace (TraceHook) against '
+                    'a simulated memory pool.')
+
+    parser.add_argument('trace', type=str,
+                        help='Path to the trace file')
+    parser.add_argument('--unit', type=int, default=512,
+                        help='Allocation unit size (default: 512)')
+    parser.add_argument('--limit', type=int, default=0,
+                        help='Memory limit in bytes (default: no limit)')
+    parser.add_argument('--policy', choices=('bin', 'first_fit'),
+                        default='bin',
+                        help='Allocation policy (default: bin)')
+    params = parser.parse_args(args)
+
+    events = _trace.read_trace(params.trace)
+    stats = simulate(events, allocation_unit_size=params.unit,
+                     limit=params.limit, policy=params.policy)
+    print(json.dumps(
+        {str(device_id): s for device_id, s in stats.items()}, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
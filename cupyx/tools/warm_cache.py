@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+
+"""
+Kernel Cache Warm-up
+
+Compiles the kernels recorded in a manifest to populate the kernel cache
+ahead of time.
+
+A manifest is recorded by running the application with the
+``CUPY_CACHE_RECORD`` environment variable set to the path of the manifest
+file; every kernel compiled through the kernel cache is then appended to it
+as a line of JSON. Running ``python -m cupyx.tools.warm_cache manifest.json``
+on the deployment target compiles all the recorded kernels in parallel, so
+that the application finds them in the cache on the first call.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import sys
+
+
+def load_manifest(path):
+    """Loads a manifest recorded with ``CUPY_CACHE_RECORD``.
+
+    Both JSON Lines (as recorded) and a JSON list of entries are accepted.
+    Duplicated entries are removed.
+    """
+    with open(path) as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        entries = json.loads(text)
+    else:
+        entries = [json.loads(line) for line in text.splitlines()
+                   if line.strip()]
+    seen = set()
+    unique = []
+    for entry in entries:
+        key = json.dumps(entry, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            unique.append(entry)
+    return unique
+
+
+def _init_worker():
+    # Replaying must not record the entries again.
+    os.environ.pop('CUPY_CACHE_RECORD', None)
+
+
+def _compile_entry(entry, cache_dir):
+    from cupy._core import core
+    from cupy.cuda import compiler
+
+    extra_source = entry.get('extra_source')
+    if entry.get('cupy_headers', False):
+        extra_source = core._get_header_source()
+    compiler._compile_module_with_cache(
+        entry['source'], tuple(entry.get('options', ())), entry.get('arch'),
+        cache_dir, extra_source, entry.get('backend', 'nvrtc'),
+        enable_cooperative_groups=entry.get(
+            'enable_cooperative_groups', False),
+        jitify=entry.get('jitify', False))
+
+
+def warm_cache(entries, cache_dir=None, workers=None):
+    """Compiles the given manifest entries into the kernel cache.
+
+    Args:
+        entries (list of dict): Entries loaded by :func:`load_manifest`.
+        cache_dir (str): Path to the cache directory. If ``None``, the
+            default cache directory is used.
+        workers (int): Number of worker processes. If ``None``, the number
+            of CPUs is used. If ``1``, the kernels are compiled in the
+            current process.
+
+    Returns:
+        list of tuple: Pairs of the index of an entry which failed to
+        compile and the error message.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    failures = []
+    if workers == 1 or len(entries) <= 1:
+        record = os.environ.pop('CUPY_CACHE_RECORD', None)
+        try:
+            for i, entry in enumerate(entries):
+                try:
+                    _compile_entry(entry, cache_dir)
+                except Exception as e:
+                    failures.append((i, '{}: {}'.format(type(e).__name__, e)))
+        finally:
+            if record is not None:
+                os.environ['CUPY_CACHE_RECORD'] = record
+        return failures
+
+    # CUDA cannot be used in a forked process once initialized.
+    ctx = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=ctx,
+            initializer=_init_worker) as executor:
+        futures = {
+            executor.submit(_compile_entry, entry, cache_dir): i
+            for i, entry in enumerate(entries)}
+        for future in concurrent.futures.as_completed(futures):
+            e = future.exception()
+            if e is not None:
+                failures.append(
+                    (futures[future], '{}: {}'.format(type(e).__name__, e)))
+    failures.sort()
+    return failures
+
+
+def main(args):
+    parser = argparse.ArgumentParser(
+        description='Compile the kernels recorded in a manifest '
+                    '(CUPY_CACHE_RECORD) into the kernel cache.')
+
+    parser.add_argument('manifest', type=str,
+                        help='Path to the manifest file')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Kernel cache directory '
+                             '(default: CUPY_CACHE_DIR)')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='Number of worker processes '
+                             '(default: number of CPUs)')
+    params = parser.parse_args(args)
+
+    entries = load_manifest(params.manifest)
+    failures = warm_cache(entries, params.cache_dir, params.workers)
+    for i, msg in failures:
+        print('Failed to compile entry {}: {}'.format(i, msg),
+              file=sys.stderr)
+    print('Compiled {} of {} kernels.'.format(
+        len(entries) - len(failures), len(entries)))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
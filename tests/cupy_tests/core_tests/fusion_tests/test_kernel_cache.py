@@ -5,6 +5,7 @@ import numpy
 
 import cupy
 from cupy import testing
+from cupy._core import new_fusion
 
 
 class CreateMock(object):
@@ -174,3 +175,63 @@ class TestFusionCache(unittest.TestCase):
         m.check_call_count(xp, 3)
 
         return result
+
+
+class TestFusionFastPath(unittest.TestCase):
+
+    def test_fast_path_hit(self):
+        def f(x, y):
+            return x * y + 1
+
+        f = new_fusion.Fusion(f)
+        x = testing.shaped_random((3, 4), cupy, 'float32', seed=0)
+        y = testing.shaped_random((3, 4), cupy, 'float32', seed=1)
+        testing.assert_allclose(f(x, y), x * y + 1)
+        assert len(f._fast_cache) == 1
+
+        with mock.patch.object(
+                new_fusion, '_get_fused_kernel',
+                wraps=new_fusion._get_fused_kernel) as m:
+            x = testing.shaped_random((3, 4), cupy, 'float32', seed=2)
+            testing.assert_allclose(f(x, y), x * y + 1)
+            assert m.call_count == 0
+            testing.assert_allclose(f(x, 2.0), x * 2.0 + 1)
+            testing.assert_allclose(f(x, 3.0), x * 3.0 + 1)
+            assert m.call_count == 1
+        assert len(f._fast_cache) == 2
+
+    def test_aliasing(self):
+        def f(x, y):
+            return x + y
+
+        f = new_fusion.Fusion(f)
+        x = testing.shaped_random((3, 3), cupy, 'int32', scale=10, seed=0)
+        y = testing.shaped_random((3, 3), cupy, 'int32', scale=10, seed=1)
+        testing.assert_array_equal(f(x, y), x + y)
+        testing.assert_array_equal(f(x, x), x + x)
+        testing.assert_array_equal(f(x, x.T), x + x.T)
+        testing.assert_array_equal(f(y, y.T), y + y.T)
+        assert len(f._fast_cache) == 3
+
+    def test_contiguity(self):
+        def f(x):
+            return x * 2
+
+        f = new_fusion.Fusion(f)
+        a = testing.shaped_arange((10,), cupy, 'float32')
+        testing.assert_array_equal(f(a[:5]), a[:5] * 2)
+        testing.assert_array_equal(f(a[::2]), a[::2] * 2)
+        b = testing.shaped_arange((4, 6), cupy, 'float32')
+        testing.assert_array_equal(f(b), b * 2)
+        testing.assert_array_equal(f(b[:, ::2]), b[:, ::2] * 2)
+
+    def test_clear_cache(self):
+        def f(x):
+            return x + 1
+
+        f = new_fusion.Fusion(f)
+        x = testing.shaped_arange((3,), cupy, 'int32')
+        f(x)
+        f.clear_cache()
+        assert len(f._fast_cache) == 0
+        testing.assert_array_equal(f(x), x + 1)
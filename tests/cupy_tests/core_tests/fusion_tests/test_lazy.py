@@ -0,0 +1,292 @@
+import collections
+import threading
+import unittest
+from unittest import mock
+
+import numpy
+
+import cupy
+import cupyx
+from cupy import testing
+from cupy._core import _fusion_lazy
+
+
+class TestLazyFusion(unittest.TestCase):
+
+    def setUp(self):
+        self.x = testing.shaped_arange((3, 4), cupy, numpy.float32)
+        self.y = testing.shaped_random((3, 4), cupy, numpy.float32, seed=1)
+
+    def test_deferred(self):
+        x = self.x
+        with cupyx.lazy_fusion():
+            z = x * 2 + 1
+            assert not isinstance(z, cupy.ndarray)
+            assert z.shape == (3, 4)
+            assert z.dtype == numpy.float32
+        testing.assert_allclose(cupy.asarray(z), self.x * 2 + 1)
+
+    def test_get(self):
+        x, y = self.x, self.y
+        with cupyx.lazy_fusion():
+            z = (x - y) * (x + y) / 3
+            testing.assert_allclose(z.get(), ((x - y) * (x + y) / 3).get())
+
+    def test_ufunc_call(self):
+        x = self.x
+        with cupyx.lazy_fusion():
+            assert isinstance(cupy.exp(x), cupy.ndarray)
+            z = cupy.exp(x + 1)
+            assert not isinstance(z, cupy.ndarray)
+        testing.assert_allclose(cupy.asarray(z), cupy.exp(self.x + 1))
+
+    def test_ndarray_operand(self):
+        x, y = self.x, self.y
+        with cupyx.lazy_fusion():
+            z = y + x * 2
+            assert not isinstance(z, cupy.ndarray)
+        testing.assert_allclose(cupy.asarray(z), self.y + self.x * 2)
+
+    def test_dtype_promotion(self):
+        x = testing.shaped_arange((3, 4), cupy, numpy.int32)
+        with cupyx.lazy_fusion():
+            z = x / 2 + 1
+            assert z.dtype == (x / 2 + 1).dtype
+        testing.assert_allclose(cupy.asarray(z), x / 2 + 1)
+
+    def test_broadcast(self):
+        x = self.x
+        v = testing.shaped_arange((4,), cupy, numpy.float32)
+        with cupyx.lazy_fusion():
+            z = x * v - v
+            assert z.shape == (3, 4)
+        testing.assert_allclose(cupy.asarray(z), self.x * v - v)
+
+    def test_reduction(self):
+        x = self.x
+        with cupyx.lazy_fusion():
+            s = ((x - 1) * (x - 1)).sum()
+            t = cupy.sum(x * 2, axis=1)
+            assert t.shape == (3,)
+            u = (x + 1).max(axis=0)
+        testing.assert_allclose(cupy.asarray(s), ((x - 1) * (x - 1)).sum())
+        testing.assert_allclose(cupy.asarray(t), cupy.sum(x * 2, axis=1))
+        testing.assert_allclose(cupy.asarray(u), (x + 1).max(axis=0))
+
+    def test_reduction_then_elementwise(self):
+        x = self.x
+        with cupyx.lazy_fusion():
+            z = (x * x).sum(axis=1) + 1
+        testing.assert_allclose(cupy.asarray(z), (x * x).sum(axis=1) + 1)
+
+    def test_internal_calls_eager(self):
+        x = self.x
+        with cupyx.lazy_fusion():
+            assert isinstance(x.std(), cupy.ndarray)
+            assert isinstance(cupy.mean(x, axis=0), cupy.ndarray)
+
+    def test_inplace(self):
+        x = self.x.copy()
+        with cupyx.lazy_fusion():
+            x += 1
+            assert isinstance(x, cupy.ndarray)
+        testing.assert_allclose(x, self.x + 1)
+
+    def test_write_input(self):
+        x = self.x.copy()
+        with cupyx.lazy_fusion():
+            y = x + 1
+            z = (x * 2) * 3
+            x += 1
+            w = x * 2
+        testing.assert_allclose(cupy.asarray(y), self.x + 1)
+        testing.assert_allclose(cupy.asarray(z), self.x * 6)
+        testing.assert_allclose(cupy.asarray(w), (self.x + 1) * 2)
+
+    def test_write_input_setitem_and_out(self):
+        x = self.x.copy()
+        v = self.x.copy()
+        with cupyx.lazy_fusion():
+            y = x - 1
+            z = v[1] * 2
+            x[...] = 0
+            cupy.add(self.x, self.y, out=v)
+        testing.assert_allclose(cupy.asarray(y), self.x - 1)
+        testing.assert_allclose(cupy.asarray(z), self.x[1] * 2)
+        testing.assert_allclose(x, cupy.zeros_like(self.x))
+
+    def test_write_input_fill(self):
+        x = self.x.copy()
+        with cupyx.lazy_fusion():
+            y = x * 2
+            x.fill(0)
+        testing.assert_allclose(cupy.asarray(y), self.x * 2)
+        testing.assert_allclose(x, cupy.zeros_like(self.x))
+
+    def test_write_input_set(self):
+        x = self.x.copy()
+        with cupyx.lazy_fusion():
+            y = x * 2
+            x.set(numpy.zeros(x.shape, x.dtype))
+        testing.assert_allclose(cupy.asarray(y), self.x * 2)
+
+    def test_write_input_reduction_out(self):
+        x = self.x[0].copy()
+        with cupyx.lazy_fusion():
+            y = x * 2
+            cupy.sum(self.y, axis=0, out=x)
+        testing.assert_allclose(cupy.asarray(y), self.x[0] * 2)
+        testing.assert_allclose(x, self.y.sum(axis=0))
+
+    def test_write_input_after_context(self):
+        x = self.x.copy()
+        with cupyx.lazy_fusion():
+            y = x + 1
+        x += 1
+        testing.assert_allclose(cupy.asarray(y), self.x + 1)
+
+    def test_write_materialized_input(self):
+        x = self.x
+        with cupyx.lazy_fusion():
+            y = x + 1
+            z = y * 2
+            a = cupy.asarray(y)
+            a += 1
+        testing.assert_allclose(cupy.asarray(z), (self.x + 1) * 2)
+
+    def test_materialize_once(self):
+        x = self.x
+        with cupyx.lazy_fusion():
+            z = x * 3
+            a = cupy.asarray(z)
+            b = cupy.asarray(z)
+        assert a is b
+
+    def test_outside_context(self):
+        x = self.x
+        with cupyx.lazy_fusion():
+            z = x + 1
+        w = z * 2
+        assert isinstance(w, cupy.ndarray)
+        testing.assert_allclose(w, (self.x + 1) * 2)
+        testing.assert_allclose(z[1], (self.x + 1)[1])
+
+    def test_nested(self):
+        x = self.x
+        with cupyx.lazy_fusion():
+            with cupyx.lazy_fusion():
+                z = x + 1
+            w = z * 2
+            assert not isinstance(w, cupy.ndarray)
+        assert isinstance(x + 1, cupy.ndarray)
+        testing.assert_allclose(cupy.asarray(w), (self.x + 1) * 2)
+
+    def test_max_ops(self):
+        x = self.x
+        with mock.patch.object(_fusion_lazy, '_max_ops', 4):
+            with cupyx.lazy_fusion():
+                z = x
+                for _ in range(10):
+                    z = z + 1
+            assert z._n_ops <= 4
+        testing.assert_allclose(cupy.asarray(z), self.x + 10)
+
+    def test_array_protocol(self):
+        x = self.x
+        with cupyx.lazy_fusion():
+            z = x + 1
+            with self.assertRaises(TypeError):
+                numpy.asarray(z)
+        testing.assert_allclose(cupy.asnumpy(cupy.asarray(z)),
+                                (self.x + 1).get())
+
+    def _patch_caches(self):
+        return mock.patch.multiple(
+            _fusion_lazy, _fused_cache=collections.OrderedDict(),
+            _unfusable_cache=collections.OrderedDict())
+
+    def test_fallback(self):
+        x = self.x
+        with self._patch_caches(), \
+                mock.patch('cupy._core.fusion.Fusion.__call__',
+                           side_effect=TypeError) as call:
+            with cupyx.lazy_fusion():
+                z = x * 2 + x
+            testing.assert_allclose(cupy.asarray(z), self.x * 3)
+            assert len(_fusion_lazy._unfusable_cache) == 1
+            # The failure is remembered for the same input types only.
+            with cupyx.lazy_fusion():
+                z = x * 2 + x
+            testing.assert_allclose(cupy.asarray(z), self.x * 3)
+            assert call.call_count == 1
+            y = self.x.astype(numpy.float64)
+            with cupyx.lazy_fusion():
+                z = y * 2 + y
+            testing.assert_allclose(cupy.asarray(z), y * 3)
+            assert call.call_count == 2
+            assert len(_fusion_lazy._unfusable_cache) == 2
+            assert len(_fusion_lazy._fused_cache) == 1
+
+    def test_fallback_unexpected_error(self):
+        x = self.x
+        with self._patch_caches(), \
+                mock.patch('cupy._core.fusion.Fusion.__call__',
+                           side_effect=RuntimeError):
+            with cupyx.lazy_fusion():
+                z = x * 2 + x
+            with self.assertRaises(RuntimeError):
+                cupy.asarray(z)
+            assert len(_fusion_lazy._unfusable_cache) == 0
+
+    def test_cache_size(self):
+        x = self.x
+        with self._patch_caches(), \
+                mock.patch.object(_fusion_lazy, '_max_cache_size', 2):
+            with cupyx.lazy_fusion():
+                zs = [x + 1, x * 2, x - 3]
+            for z, expected in zip(zs, [self.x + 1, self.x * 2, self.x - 3]):
+                testing.assert_allclose(cupy.asarray(z), expected)
+            assert len(_fusion_lazy._fused_cache) == 2
+
+    def test_cache_threads(self):
+        x, y = self.x, self.y
+        errors = []
+
+        def run():
+            try:
+                for i in range(50):
+                    with cupyx.lazy_fusion():
+                        z = x * 2 + y if i % 2 else x - y
+                    cupy.asarray(z)
+            except Exception as e:
+                errors.append(e)
+
+        with self._patch_caches(), \
+                mock.patch.object(_fusion_lazy, '_max_cache_size', 1):
+            threads = [threading.Thread(target=run) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert errors == []
+
+    def test_comparison(self):
+        x, y = self.x, self.y
+        with cupyx.lazy_fusion():
+            z = (x * 2) > y
+            w = x <= y
+            assert not isinstance(w, cupy.ndarray)
+            assert w.dtype == numpy.bool_
+        testing.assert_array_equal(cupy.asarray(z), self.x * 2 > self.y)
+        testing.assert_array_equal(cupy.asarray(w), self.x <= self.y)
+
+    def test_context_counter(self):
+        x = self.x
+        with cupyx.lazy_fusion():
+            pass
+        with cupyx.lazy_fusion():
+            with self.assertRaises(ValueError):
+                with cupyx.lazy_fusion():
+                    raise ValueError
+            assert not isinstance(x + 1, cupy.ndarray)
+        assert isinstance(x + 1, cupy.ndarray)
@@ -0,0 +1,54 @@
+import io
+import unittest
+
+import cupy.cuda
+from cupy.cuda import memory
+from cupy.cuda import memory_hooks
+from cupy.cuda.memory_hooks import trace
+
+
+class TestTraceHook(unittest.TestCase):
+
+    def setUp(self):
+        self.io = io.BytesIO()
+        self.pool = memory.MemoryPool()
+
+    def test_trace(self):
+        p0 = self.pool.malloc(100)
+        with memory_hooks.TraceHook(self.io):
+            p1 = self.pool.malloc(1000)
+            with cupy.cuda.Stream() as stream:
+                p2 = self.pool.malloc(2000)
+            self.pool.malloc(0)
+            del p1
+            del p0  # allocated before the hook
+        del p2  # freed after the hook
+        self.io.seek(0)
+        events = trace.read_trace(self.io)
+        assert [(e.kind, e.size, e.alloc_id) for e in events] == [
+            (trace.MALLOC, 1000, 0),
+            (trace.MALLOC, 2000, 1),
+            (trace.FREE, 1024, 0),
+        ]
+        assert events[0].stream == 0
+        assert events[1].stream == stream.ptr
+        assert events[2].stream == 0
+        assert events[0].timestamp <= events[1].timestamp
+        assert events[1].timestamp <= events[2].timestamp
+        assert events[0].callsite.endswith(':test_trace')
+        assert events[1].callsite.endswith(':test_trace')
+        assert events[0].callsite != events[1].callsite
+        assert events[2].callsite is None
+
+    def test_no_callsite(self):
+        with memory_hooks.TraceHook(self.io, callsite=False):
+            p = self.pool.malloc(1000)
+            del p
+        self.io.seek(0)
+        events = trace.read_trace(self.io)
+        assert len(events) == 2
+        assert all(e.callsite is None for e in events)
+
+    def test_read_invalid(self):
+        with self.assertRaises(ValueError):
+            trace.read_trace(io.BytesIO(b'invalid'))
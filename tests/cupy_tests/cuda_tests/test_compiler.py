@@ -2,6 +2,8 @@ import pickle
 import unittest
 from unittest import mock
 
+import pytest
+
 import cupy
 from cupy.cuda import compiler
 
@@ -128,3 +130,78 @@ class TestExceptionPicklable(unittest.TestCase):
 class TestCompileWithCache:
     def test_compile_module_with_cache(self):
         compiler._compile_module_with_cache('__device__ void func() {}')
+
+    def test_toolchain_fingerprint_persisted(self, tmp_path):
+        source = '__device__ void func() {}'
+        cache_dir = str(tmp_path)
+        with mock.patch.object(compiler, '_empty_file_preprocess_cache', {}):
+            compiler._compile_module_with_cache(source, cache_dir=cache_dir)
+        # A fresh process reuses the fingerprint stored on disk.
+        target = ('_preprocess_hiprtc' if cupy.cuda.runtime.is_hip
+                  else '_preprocess')
+        with mock.patch.object(compiler, '_empty_file_preprocess_cache', {}), \
+                mock.patch.object(compiler, target) as preprocess:
+            compiler._compile_module_with_cache(source, cache_dir=cache_dir)
+        preprocess.assert_not_called()
+        assert compiler.get_cache_info(cache_dir)['hits'] == 1
+
+    def test_toolchain_fingerprint_upgraded(self, tmp_path):
+        source = '__device__ void func() {}'
+        cache_dir = str(tmp_path)
+        with mock.patch.object(compiler, '_empty_file_preprocess_cache', {}):
+            compiler._compile_module_with_cache(source, cache_dir=cache_dir)
+        # The toolchain is upgraded in place.
+        target = ('_preprocess_hiprtc' if cupy.cuda.runtime.is_hip
+                  else '_preprocess')
+        with mock.patch.object(compiler, '_empty_file_preprocess_cache', {}), \
+                mock.patch.object(compiler, '_get_toolchain_identity',
+                                  return_value=('upgraded',)), \
+                mock.patch.object(compiler, target,
+                                  return_value='// upgraded') as preprocess:
+            compiler._compile_module_with_cache(source, cache_dir=cache_dir)
+        preprocess.assert_called_once()
+
+    @pytest.mark.parametrize('backend', ['nvrtc', 'nvcc'])
+    def test_toolchain_identity_cached(self, backend):
+        if backend == 'nvcc' and cupy.cuda.runtime.is_hip:
+            backend = 'hipcc'
+        with mock.patch.object(compiler, '_toolchain_identity_cache', {}), \
+                mock.patch.object(
+                    compiler, '_get_toolchain_files',
+                    wraps=compiler._get_toolchain_files) as files, \
+                mock.patch('subprocess.check_output') as check_output:
+            identity = compiler._get_toolchain_identity(backend, None)
+            assert compiler._get_toolchain_identity(backend, None) == identity
+        # The compiler is not run to identify it.
+        check_output.assert_not_called()
+        files.assert_called_once()
+
+
+class TestCompileMany:
+
+    _source = '''
+    extern "C" __global__ void compile_many_test_kernel(int* x) {
+        x[threadIdx.x] = %d;
+    }
+    '''
+
+    @pytest.mark.parametrize('max_workers', [None, 1, 2])
+    def test_compile_many(self, tmp_path, max_workers):
+        sources = [self._source % i for i in range(4)]
+        mods = compiler.compile_many(
+            sources, cache_dir=str(tmp_path), max_workers=max_workers)
+        assert len(mods) == 4
+        for i, mod in enumerate(mods):
+            x = cupy.zeros(1, dtype=cupy.int32)
+            mod.get_function('compile_many_test_kernel')((1,), (1,), (x,))
+            assert int(x[0]) == i
+        info = compiler.get_cache_info(str(tmp_path))
+        assert info['entries'] == 4
+
+    def test_compile_many_empty(self):
+        assert compiler.compile_many([]) == []
+
+    def test_compile_many_error(self, tmp_path):
+        sources = [self._source % 0, 'invalid']
+        with pytest.raises(compiler.CompileException):
+            compiler.compile_many(sources, cache_dir=str(tmp_path))
@@ -0,0 +1,196 @@
+import hashlib
+import os
+
+import pytest
+
+from cupy.cuda import _kernel_cache
+
+
+def _name(i):
+    return _kernel_cache._hash_hexdigest(str(i).encode()) + '.cubin'
+
+
+class TestDiskCache:
+
+    def test_store_load(self, tmp_path):
+        cache = _kernel_cache._DiskCache(str(tmp_path))
+        name = _name(0)
+        path = cache.store(name, b'binary')
+        assert path == os.path.join(str(tmp_path), name[:2], name)
+        assert cache.load(name) == b'binary'
+        assert cache.load(_name(1)) is None
+        info = cache.get_info()
+        assert info['hits'] == 1
+        assert info['misses'] == 1
+        assert info['entries'] == 1
+        assert info['bytes'] == os.path.getsize(path)
+
+    def test_load_corrupted(self, tmp_path):
+        cache = _kernel_cache._DiskCache(str(tmp_path))
+        name = _name(0)
+        path = cache.store(name, b'binary')
+        with open(path, 'rb+') as f:
+            f.truncate(os.path.getsize(path) - 1)
+        assert cache.load(name) is None
+
+    def test_load_legacy(self, tmp_path):
+        cache = _kernel_cache._DiskCache(str(tmp_path))
+        name = _name(0)
+        legacy_path = os.path.join(str(tmp_path), name)
+        with open(legacy_path, 'wb') as f:
+            f.write(_kernel_cache._pack(b'binary'))
+        assert cache.load(name) == b'binary'
+        assert not os.path.exists(legacy_path)
+        assert os.path.exists(cache.get_path(name))
+
+    def test_evict_max_entries(self, tmp_path):
+        cache = _kernel_cache._DiskCache(str(tmp_path), max_entries=10)
+        for i in range(10):
+            path = cache.store(_name(i), b'binary')
+            os.utime(path, (i, i))
+        # Touch the oldest entry so that it survives the eviction.
+        assert cache.load(_name(0)) == b'binary'
+        cache.store(_name(10), b'binary')
+        info = cache.get_info()
+        assert info['entries'] == 9
+        assert info['evictions'] == 2
+        assert cache.load(_name(0)) == b'binary'
+        assert cache.load(_name(1)) is None
+        assert cache.load(_name(2)) is None
+        assert cache.load(_name(3)) == b'binary'
+
+    def test_evict_max_bytes(self, tmp_path):
+        size = len(_kernel_cache._pack(b'x' * 100))
+        cache = _kernel_cache._DiskCache(str(tmp_path), max_bytes=size * 4)
+        for i in range(5):
+            cache.store(_name(i), b'x' * 100)
+        info = cache.get_info()
+        assert info['bytes'] <= size * 4
+        assert info['evictions'] > 0
+
+    def test_evict_sidecar(self, tmp_path):
+        cache = _kernel_cache._DiskCache(str(tmp_path), max_entries=1)
+        path = cache.store(_name(0), b'binary')
+        os.utime(path, (0, 0))
+        with open(path + '.cu', 'w') as f:
+            f.write('source')
+        cache.store(_name(1), b'binary')
+        assert not os.path.exists(path)
+        assert not os.path.exists(path + '.cu')
+
+
+class TestPackedCache:
+
+    def test_store_load(self, tmp_path):
+        cache = _kernel_cache._PackedCache(str(tmp_path))
+        assert cache.load(_name(0)) is None
+        for i in range(10):
+            assert cache.store(_name(i), b'binary%d' % i) is None
+        for i in range(10):
+            assert cache.load(_name(i)) == b'binary%d' % i
+        info = cache.get_info()
+        assert info['backend'] == 'packed'
+        assert info['hits'] == 10
+        assert info['misses'] == 1
+        assert info['entries'] == 10
+        assert os.listdir(str(tmp_path)) == ['packed']
+
+    @pytest.mark.skipif(
+        not _kernel_cache._has_usedforsecurity,
+        reason='usedforsecurity is not supported')
+    def test_fips(self, tmp_path, monkeypatch):
+        # SHA1 for security purposes is unavailable in FIPS mode.
+        sha1 = hashlib.sha1
+
+        def fips_sha1(value, usedforsecurity=True):
+            if usedforsecurity:
+                raise ValueError('unsupported hash type')
+            return sha1(value, usedforsecurity=False)
+
+        monkeypatch.setattr(hashlib, 'sha1', fips_sha1)
+        cache = _kernel_cache._PackedCache(str(tmp_path))
+        cache.store(_name(0), b'binary')
+        assert cache.load(_name(0)) == b'binary'
+
+    def test_shared(self, tmp_path):
+        # Entries appended by another writer are found.
+        cache1 = _kernel_cache._PackedCache(str(tmp_path))
+        cache2 = _kernel_cache._PackedCache(str(tmp_path))
+        cache1.store(_name(0), b'binary0')
+        assert cache2.load(_name(0)) == b'binary0'
+        cache2.store(_name(1), b'binary1')
+        assert cache1.load(_name(1)) == b'binary1'
+        # Duplicated stores are not appended.
+        cache1.store(_name(1), b'binary1')
+        assert cache1.get_info()['entries'] == 2
+        assert cache1.get_info()['bytes'] == cache2.get_info()['bytes']
+
+    def test_load_corrupted(self, tmp_path):
+        cache = _kernel_cache._PackedCache(str(tmp_path))
+        cache.store(_name(0), b'binary')
+        blob_path = os.path.join(str(tmp_path), 'packed', 'blobs.bin')
+        with open(blob_path, 'rb+') as f:
+            f.truncate(os.path.getsize(blob_path) - 1)
+        assert cache.load(_name(0)) is None
+
+    def test_clear(self, tmp_path):
+        cache = _kernel_cache._PackedCache(str(tmp_path))
+        cache.store(_name(0), b'binary')
+        cache.clear()
+        assert cache.load(_name(0)) is None
+        assert cache.get_info()['entries'] == 0
+        cache.store(_name(0), b'binary')
+        assert cache.load(_name(0)) == b'binary'
+
+    def test_clear_shared(self, tmp_path):
+        cache1 = _kernel_cache._PackedCache(str(tmp_path))
+        cache2 = _kernel_cache._PackedCache(str(tmp_path))
+        cache1.store(_name(0), b'binary0')
+        assert cache2.load(_name(0)) == b'binary0'
+        cache1.clear()
+        cache1.store(_name(1), b'binary1')
+        assert cache2.load(_name(1)) == b'binary1'
+        assert cache2.load(_name(0)) is None
+
+
+class TestToolchainFingerprint:
+
+    @pytest.mark.parametrize('fingerprint', ['// str', b'bytes'])
+    def test_store_load(self, tmp_path, fingerprint):
+        cache_dir = str(tmp_path)
+        assert _kernel_cache.load_toolchain_fingerprint(
+            cache_dir, 'key') is None
+        _kernel_cache.store_toolchain_fingerprint(
+            cache_dir, 'key', fingerprint)
+        assert _kernel_cache.load_toolchain_fingerprint(
+            cache_dir, 'key') == fingerprint
+        assert _kernel_cache.load_toolchain_fingerprint(
+            cache_dir, 'other_key') is None
+
+    def test_not_counted_as_entry(self, tmp_path):
+        cache = _kernel_cache._DiskCache(str(tmp_path))
+        _kernel_cache.store_toolchain_fingerprint(str(tmp_path), 'key', '//')
+        assert cache.get_info()['entries'] == 0
+
+
+class TestGetDiskCache:
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, monkeypatch):
+        monkeypatch.setattr(_kernel_cache, '_caches', {})
+
+    def test_limits_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('CUPY_CACHE_MAX_BYTES', '1024')
+        monkeypatch.setenv('CUPY_CACHE_MAX_ENTRIES', '16')
+        cache = _kernel_cache.get_disk_cache(str(tmp_path))
+        assert cache.max_bytes == 1024
+        assert cache.max_entries == 16
+        assert _kernel_cache.get_disk_cache(str(tmp_path)) is cache
+
+    def test_backend_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('CUPY_CACHE_BACKEND', 'packed')
+        cache = _kernel_cache.get_disk_cache(str(tmp_path))
+        assert isinstance(cache, _kernel_cache._PackedCache)
+        monkeypatch.setenv('CUPY_CACHE_BACKEND', 'invalid')
+        with pytest.raises(ValueError):
+            _kernel_cache.get_disk_cache(str(tmp_path))
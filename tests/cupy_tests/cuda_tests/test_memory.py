@@ -1,7 +1,9 @@
 import ctypes
 import gc
 import pickle
+import random
 import threading
+import time
 import unittest
 
 import fastrlock
@@ -610,6 +612,174 @@ class TestSingleDeviceMemoryPool(unittest.TestCase):
         assert self.unit * 6 == self.pool.total_bytes()
         del p2
 
+    def test_get_stats(self):
+        p1 = self.pool.malloc(self.unit * 2)
+        p2 = self.pool.malloc(self.unit * 4)
+        del p1
+        p3 = self.pool.malloc(self.unit * 1)
+        stats = self.pool.get_stats()
+        assert stats['used_bytes'] == self.unit * 5
+        assert stats['used_bytes'] == self.pool.used_bytes()
+        assert stats['free_bytes'] == self.pool.free_bytes()
+        assert stats['total_bytes'] == self.pool.total_bytes()
+        assert stats['n_free_blocks'] == self.pool.n_free_blocks()
+        assert stats['peak_used_bytes'] == self.unit * 6
+        assert stats['peak_total_bytes'] == self.unit * 6
+        assert stats['n_malloc'] == 3
+        assert stats['n_free'] == 1
+        assert stats['n_pool_hits'] == 1
+        assert stats['n_pool_misses'] == 2
+        assert stats['n_oom_retries'] == 0
+        assert stats['bins'] == {
+            self.unit: 1, self.unit * 2: 1, self.unit * 4: 1}
+        del p2, p3
+
+    def test_get_stats_zero_size(self):
+        self.pool.malloc(0)
+        stats = self.pool.get_stats()
+        assert stats['n_malloc'] == 0
+        assert stats['bins'] == {}
+
+    def test_get_stats_arenas(self):
+        p1 = self.pool.malloc(self.unit * 4)
+        p2 = self.pool.malloc(self.unit * 1)
+        with self.stream:
+            p3 = self.pool.malloc(self.unit * 2)
+        del p1, p3
+        arenas = self.pool.get_stats()['arenas']
+        assert len(arenas) == 2
+        arena = arenas[self.stream_ident]
+        assert arena['free_bytes'] == self.unit * 2
+        assert arena['n_free_blocks'] == 1
+        assert arena['largest_free_block'] == self.unit * 2
+        assert arena['fragmentation'] == 0
+        del p2
+        for arena in self.pool.get_stats()['arenas'].values():
+            assert 0 <= arena['fragmentation'] < 1
+
+    def test_get_stats_fragmentation(self):
+        p1 = self.pool.malloc(self.unit * 4)
+        del p1
+        p2 = self.pool.malloc(self.unit * 1)
+        p3 = self.pool.malloc(self.unit * 1)
+        p4 = self.pool.malloc(self.unit * 1)
+        del p3
+        # Free blocks: p3 (1 unit) and the remaining tail (1 unit)
+        arenas = self.pool.get_stats()['arenas']
+        assert len(arenas) == 1
+        arena, = arenas.values()
+        assert arena['free_bytes'] == self.unit * 2
+        assert arena['n_free_blocks'] == 2
+        assert arena['largest_free_block'] == self.unit
+        assert arena['fragmentation'] == 0.5
+        del p2, p4
+
+    def test_get_stats_oom_retries(self):
+        self.pool.set_limit(size=self.unit * 4)
+        p1 = self.pool.malloc(self.unit * 2)
+        del p1
+        p2 = self.pool.malloc(self.unit * 4)
+        stats = self.pool.get_stats()
+        assert stats['n_oom_retries'] == 1
+        assert stats['n_pool_misses'] == 2
+        assert stats['total_bytes'] == self.unit * 4
+        del p2
+
+    def test_reset_peak_stats(self):
+        p1 = self.pool.malloc(self.unit * 4)
+        del p1
+        p2 = self.pool.malloc(self.unit * 1)
+        assert self.pool.get_stats()['peak_used_bytes'] == self.unit * 4
+        self.pool.reset_peak_stats()
+        stats = self.pool.get_stats()
+        assert stats['peak_used_bytes'] == self.unit * 1
+        assert stats['peak_total_bytes'] == self.unit * 4
+        del p2
+
+    def test_trim_max_free_bytes(self):
+        self.pool.set_trim_policy(max_free_bytes=self.unit * 2)
+        p1 = self.pool.malloc(self.unit * 4)
+        p2 = self.pool.malloc(self.unit * 1)
+        del p1
+        assert self.pool.total_bytes() == self.unit
+        assert self.pool.get_stats()['trimmed_bytes'] == self.unit * 4
+        del p2
+        assert self.pool.total_bytes() == self.unit
+        assert self.pool.free_bytes() == self.unit
+
+    def test_trim_max_free_bytes_least_recently_freed(self):
+        self.pool.set_trim_policy(max_free_bytes=self.unit * 4)
+        p1 = self.pool.malloc(self.unit * 2)
+        p2 = self.pool.malloc(self.unit * 4)
+        del p1
+        assert self.pool.free_bytes() == self.unit * 2
+        # The cold block is released, and the block just freed stays.
+        del p2
+        assert self.pool.total_bytes() == self.unit * 4
+        assert self.pool.free_bytes() == self.unit * 4
+        assert self.pool.get_stats()['trimmed_bytes'] == self.unit * 2
+        p3 = self.pool.malloc(self.unit * 4)
+        assert self.pool.get_stats()['n_pool_hits'] == 1
+        del p3
+
+    def test_trim_max_free_bytes_split_freed(self):
+        p1 = self.pool.malloc(self.unit * 2)
+        p2 = self.pool.malloc(self.unit * 4)
+        del p2
+        head = self.pool.malloc(self.unit)
+        mid = self.pool.malloc(self.unit)
+        del p1
+        self.pool.set_trim_policy(max_free_bytes=self.unit * 3)
+        # Freeing a split block releases the cold block which is not split.
+        del head
+        assert self.pool.total_bytes() == self.unit * 4
+        assert self.pool.free_bytes() == self.unit * 3
+        del mid
+
+    def test_trim_idle_time(self):
+        self.pool.set_trim_policy(idle_time=0.05)
+        p = self.pool.malloc(self.unit * 4)
+        del p
+        assert self.pool.trim() == 0
+        time.sleep(0.1)
+        assert self.pool.trim() == self.unit * 4
+        assert self.pool.total_bytes() == 0
+
+    def test_trim_split(self):
+        p = self.pool.malloc(self.unit * 4)
+        del p
+        head = self.pool.malloc(self.unit * 2)
+        self.pool.set_trim_policy(max_free_bytes=0)
+        assert self.pool.trim() == 0
+        assert self.pool.free_bytes() == self.unit * 2
+        del head
+        assert self.pool.total_bytes() == 0
+
+    def test_trim_interval(self):
+        self.pool.set_trim_policy(idle_time=0.01, interval=0.01)
+        p = self.pool.malloc(self.unit * 4)
+        del p
+        for _ in range(100):
+            if self.pool.total_bytes() == 0:
+                break
+            time.sleep(0.01)
+        assert self.pool.total_bytes() == 0
+        self.pool.set_trim_policy()
+
+    def test_trim_disabled(self):
+        p = self.pool.malloc(self.unit * 4)
+        del p
+        assert self.pool.trim() == 0
+        assert self.pool.free_bytes() == self.unit * 4
+
+    def test_set_trim_policy_invalid(self):
+        with self.assertRaises(ValueError):
+            self.pool.set_trim_policy(idle_time=0)
+        with self.assertRaises(ValueError):
+            self.pool.set_trim_policy(max_free_bytes=-1)
+        with self.assertRaises(ValueError):
+            self.pool.set_trim_policy(interval=-1)
+
     def test_get_limit(self):
         # limit is disabled by default
         assert 0 == self.pool.get_limit()
@@ -646,6 +816,82 @@ class TestSingleDeviceMemoryPool(unittest.TestCase):
             self.pool.set_limit(fraction=1.1)
 
 
+class TestSingleDeviceMemoryPoolFirstFit(TestSingleDeviceMemoryPool):
+
+    def setUp(self):
+        super().setUp()
+        self.pool = memory.SingleDeviceMemoryPool(
+            allocator=mock_alloc, policy='first_fit')
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            memory.SingleDeviceMemoryPool(policy='best_fit')
+
+    def test_alloc_first_fit(self):
+        p1 = self.pool.malloc(self.unit * 4)
+        p2 = self.pool.malloc(self.unit)
+        p3 = self.pool.malloc(self.unit)
+        ptr1 = p1.ptr
+        ptr3 = p3.ptr
+        assert ptr1 < ptr3
+        del p1, p3
+        # The block with the lowest address is chosen even if a smaller
+        # block fits.
+        q1 = self.pool.malloc(self.unit)
+        assert q1.ptr == ptr1
+        q2 = self.pool.malloc(self.unit * 3)
+        assert q2.ptr == ptr1 + self.unit
+        q3 = self.pool.malloc(self.unit)
+        assert q3.ptr == ptr3
+        assert self.pool.free_bytes() == 0
+        del p2
+
+    def test_alloc_first_fit_no_fit(self):
+        p1 = self.pool.malloc(self.unit)
+        p2 = self.pool.malloc(self.unit * 2)
+        ptr1 = p1.ptr
+        ptr2 = p2.ptr
+        del p1, p2
+        # Smaller blocks at lower addresses are skipped.
+        q1 = self.pool.malloc(self.unit * 2)
+        assert q1.ptr == ptr2
+        q2 = self.pool.malloc(self.unit * 4)
+        assert q2.ptr not in (ptr1, ptr2)
+        assert self.pool.free_bytes() == self.unit
+
+    def test_free_merge_first_fit(self):
+        p = self.pool.malloc(self.unit * 4)
+        ptr = p.ptr
+        del p
+        head = self.pool.malloc(self.unit * 2)
+        tail = self.pool.malloc(self.unit * 2)
+        del head, tail
+        # The merged block is found again.
+        p = self.pool.malloc(self.unit * 4)
+        assert p.ptr == ptr
+        assert self.pool.free_bytes() == 0
+        assert self.pool.total_bytes() == self.unit * 4
+
+    def test_alloc_first_fit_many_free_blocks(self):
+        rs = random.Random(0)
+        ps = [self.pool.malloc(self.unit * rs.randint(1, 8))
+              for _ in range(200)]
+        free = {}
+        for i in rs.sample(range(len(ps)), 100):
+            free[ps[i].ptr] = ps[i].size
+            ps[i] = None
+        for n in range(1, 10):
+            size = self.unit * n
+            fits = [ptr for ptr in sorted(free) if free[ptr] >= size]
+            p = self.pool.malloc(size)
+            if fits:
+                assert p.ptr == fits[0]
+            else:
+                assert p.ptr not in free
+            del p
+        assert self.pool.free_bytes() >= sum(free.values())
+
+
 class TestParseMempoolLimitEnvVar(unittest.TestCase):
     def test_parse_limit_string(self):
         parse_limit_string = memory._parse_limit_string
@@ -759,6 +1005,28 @@ class TestMemoryPool(unittest.TestCase):
         with cupy.cuda.Device():
             assert 0 == self.pool.total_bytes()
 
+    def test_get_stats(self):
+        with cupy.cuda.Device():
+            mem = self.pool.malloc(1).mem
+            stats = self.pool.get_stats()
+            assert stats['used_bytes'] == mem.size
+            assert stats['n_malloc'] == 1
+            mem.free()
+            self.pool.reset_peak_stats()
+            stats = self.pool.get_stats()
+            assert stats['used_bytes'] == 0
+            assert stats['peak_used_bytes'] == 0
+            assert stats['n_free'] == 1
+
+    def test_trim(self):
+        with cupy.cuda.Device():
+            self.pool.set_trim_policy(max_free_bytes=0)
+            mem = self.pool.malloc(1).mem
+            mem.free()
+            assert self.pool.total_bytes() == 0
+            assert self.pool.trim() == 0
+            self.pool.set_trim_policy()
+
 
 # TODO(leofang): test MemoryAsyncPool. We currently remove the test because
 # this test class requires the ability of creating a new pool, which we do
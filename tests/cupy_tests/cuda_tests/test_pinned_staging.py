@@ -0,0 +1,88 @@
+from unittest import mock
+
+import numpy
+import pytest
+
+import cupy
+import cupyx
+from cupy import testing
+from cupy.cuda import _pinned_staging
+
+
+class TestPinnedStaging:
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, monkeypatch):
+        enabled = _pinned_staging._enabled
+        monkeypatch.setattr(_pinned_staging, '_enabled', False)
+        monkeypatch.setattr(_pinned_staging, '_chunk_size', 4 * 1024 * 1024)
+        monkeypatch.setattr(_pinned_staging, '_min_bytes', 64 * 1024)
+        cupy.cuda.reset_pinned_staging_stats()
+        cupy.cuda.set_pinned_staging(chunk_size=1000, min_bytes=0)
+        yield
+        cupy.cuda.set_pinned_staging(enabled)
+
+    @pytest.mark.parametrize('size', [1, 250, 1001, 10000])
+    def test_get(self, size):
+        a = testing.shaped_random((size,), cupy, numpy.float32)
+        testing.assert_array_equal(a.get(), cupy.asnumpy(a))
+        stats = cupy.cuda.get_pinned_staging_stats()
+        assert stats['device_to_host_bytes'] == a.nbytes * 2
+        assert stats['n_device_to_host'] == 2
+
+    @pytest.mark.parametrize('size', [1, 250, 1001, 10000])
+    def test_set(self, size):
+        a_cpu = testing.shaped_random((size,), numpy, numpy.float32)
+        a = cupy.empty_like(a_cpu)
+        a.set(a_cpu)
+        # The source can be modified once `set` returns.
+        expected = a_cpu.copy()
+        a_cpu[:] = 0
+        testing.assert_array_equal(a, expected)
+        stats = cupy.cuda.get_pinned_staging_stats()
+        assert stats['host_to_device_bytes'] == a.nbytes
+        assert stats['n_host_to_device'] == 1
+
+    def test_get_fortran(self):
+        a = testing.shaped_random((30, 40), cupy, numpy.float64)
+        testing.assert_array_equal(a.get(order='F'), a)
+
+    def test_get_pinned_out(self):
+        a = testing.shaped_random((1000,), cupy, numpy.float32)
+        out = cupyx.empty_pinned(a.shape, a.dtype)
+        a.get(out=out)
+        testing.assert_array_equal(out, a)
+        assert cupy.cuda.get_pinned_staging_stats()['n_device_to_host'] == 0
+
+    def test_get_non_blocking(self):
+        a = testing.shaped_random((1000,), cupy, numpy.float32)
+        a_cpu = a.get(blocking=False)
+        cupy.cuda.get_current_stream().synchronize()
+        testing.assert_array_equal(a_cpu, a)
+        assert cupy.cuda.get_pinned_staging_stats()['n_device_to_host'] == 0
+
+    def test_min_bytes(self):
+        cupy.cuda.set_pinned_staging(min_bytes=1024)
+        cupy.arange(10).get()
+        assert cupy.cuda.get_pinned_staging_stats()['n_device_to_host'] == 0
+
+    def test_disabled(self):
+        cupy.cuda.set_pinned_staging(False)
+        cupy.arange(1000).get()
+        assert cupy.cuda.get_pinned_staging_stats()['n_device_to_host'] == 0
+
+    def test_disabled_not_called(self):
+        cupy.cuda.set_pinned_staging(False)
+        a = cupy.arange(1000)
+        with mock.patch.object(_pinned_staging, 'copy_to_host') as to_host, \
+                mock.patch.object(
+                    _pinned_staging, 'copy_from_host') as from_host:
+            a.set(a.get())
+        to_host.assert_not_called()
+        from_host.assert_not_called()
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            cupy.cuda.set_pinned_staging(chunk_size=0)
+        with pytest.raises(ValueError):
+            cupy.cuda.set_pinned_staging(min_bytes=-1)
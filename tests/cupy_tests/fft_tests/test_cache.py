@@ -491,3 +491,120 @@ class TestPlanCache(unittest.TestCase):
         assert cache.get_curr_memsize() == 2048 == cache.get_memsize()
         plan2 = next(iter(cache))[1].plan
         assert plan2 is not plan
+
+    def test_stats(self):
+        cache = config.get_plan_cache()
+        assert cache.get_stats() == {
+            'hits': 0, 'misses': 0, 'evictions': 0,
+            'curr_size': 0, 'curr_memsize': 0}
+
+        for n in (10, 10, 20, 30):
+            a = testing.shaped_random((n,), cupy, cupy.complex64)
+            cupy.fft.fft(a)
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 3
+        # the cache holds 2 plans
+        assert stats['evictions'] == 1
+        assert stats['curr_size'] == 2
+
+        stdout = intercept_stdout(cache.show_info)
+        assert 'hits / misses / evictions: 1 / 3 / 1 (counts)' in stdout
+
+    def test_warm_up(self):
+        cache = config.get_plan_cache()
+        cache.set_size(16)
+        config.warm_up_plan_cache([
+            ((4, 16), cupy.complex64, -1),
+            ((8, 8), cupy.float64),
+        ])
+        # one C2C plan, and R2C and C2R plans
+        assert cache.get_curr_size() == 3
+
+        cupy.fft.ifft(testing.shaped_random((4, 16), cupy, cupy.complex64))
+        cupy.fft.irfftn(cupy.fft.rfftn(
+            testing.shaped_random((8, 8), cupy, cupy.float64)))
+        assert cache.get_curr_size() == 3
+        assert cache.get_stats()['hits'] == 3
+
+
+class TestSharedPlanCache(unittest.TestCase):
+    def setUp(self):
+        config.set_plan_cache_shared()
+        self.cache = config.get_plan_cache()
+        self.old_size = self.cache.get_size()
+        self.cache.clear()
+        self.cache.set_size(16)
+
+    def tearDown(self):
+        self.cache.clear()
+        self.cache.set_size(self.old_size)
+        config.set_plan_cache_shared(False)
+
+    def test_shared(self):
+        assert self.cache.shared
+        assert 'shared by threads? True' in intercept_stdout(
+            self.cache.show_info)
+
+        def fft_in_thread(q):
+            cache = config.get_plan_cache()
+            a = testing.shaped_random((10,), cupy, cupy.complex64)
+            cupy.fft.fft(a)
+            q.put(cache)
+
+        q = queue.Queue()
+        for _ in range(2):
+            thread = threading.Thread(target=fft_in_thread, args=(q,))
+            thread.start()
+            thread.join()
+            assert q.get() is self.cache
+        # the threads share the plan on the default stream
+        assert self.cache.get_curr_size() == 1
+        assert self.cache.get_stats()['hits'] == 1
+
+        # a different stream gets its own plan
+        with cupy.cuda.Stream():
+            fft_in_thread(q)
+        assert self.cache.get_curr_size() == 2
+
+    def test_per_thread_default_stream(self):
+        def fft_in_thread():
+            with cupy.cuda.Stream.ptds:
+                a = testing.shaped_random((10,), cupy, cupy.complex64)
+                cupy.fft.fft(a)
+
+        for _ in range(2):
+            thread = threading.Thread(target=fft_in_thread)
+            thread.start()
+            thread.join()
+        # the per-thread default streams are different streams
+        assert self.cache.get_curr_size() == 2
+
+    def test_concurrent(self):
+        a = testing.shaped_random((8, 64), cupy, cupy.complex64)
+        expected = cupy.fft.fft(a)
+        errors = []
+
+        def fft_in_thread():
+            try:
+                for _ in range(20):
+                    testing.assert_allclose(cupy.fft.fft(a), expected)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=fft_in_thread) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert self.cache.get_curr_size() == 1
+
+    def test_local_cache_unchanged(self):
+        config.set_plan_cache_shared(False)
+        try:
+            local_cache = config.get_plan_cache()
+            assert not local_cache.shared
+            assert local_cache is not self.cache
+        finally:
+            config.set_plan_cache_shared()
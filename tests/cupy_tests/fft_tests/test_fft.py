@@ -1335,6 +1335,71 @@ class TestFftshift:
         return out
 
 
+@pytest.mark.parametrize('norm', [None, 'ortho', 'forward'])
+@pytest.mark.parametrize('n', [None, 5, 12])
+@pytest.mark.parametrize('axis', [-1, 0])
+class TestFftBatch:
+
+    def _inputs(self, dtype):
+        # two groups of the same shape and a single array of another shape
+        shapes = [(3, 8), (4, 8), (3, 8), (3, 8), (4, 8)]
+        return [testing.shaped_random(shape, cupy, dtype, seed=i)
+                for i, shape in enumerate(shapes)]
+
+    def _check(self, func, batch_func, inputs, n, axis, norm):
+        outs = batch_func(inputs, n=n, axis=axis, norm=norm)
+        assert len(outs) == len(inputs)
+        for x, out in zip(inputs, outs):
+            expected = func(x, n=n, axis=axis, norm=norm)
+            assert out.shape == expected.shape
+            assert out.dtype == expected.dtype
+            testing.assert_allclose(out, expected, rtol=1e-4, atol=1e-6)
+
+    @pytest.mark.parametrize('name', ['fft', 'ifft'])
+    @testing.for_complex_dtypes()
+    def test_fft_batch(self, name, dtype, n, axis, norm):
+        func = getattr(cupy.fft, name)
+        batch_func = getattr(cupy.fft, name + '_batch')
+        self._check(func, batch_func, self._inputs(dtype), n, axis, norm)
+
+    @testing.for_float_dtypes(no_float16=True)
+    def test_rfft_batch(self, dtype, n, axis, norm):
+        inputs = self._inputs(dtype)
+        self._check(cupy.fft.rfft, cupy.fft.rfft_batch, inputs, n, axis,
+                    norm)
+        inputs = [cupy.fft.rfft(x, axis=axis) for x in inputs]
+        self._check(cupy.fft.irfft, cupy.fft.irfft_batch, inputs, n, axis,
+                    norm)
+
+    def test_inputs_unchanged(self, n, axis, norm):
+        inputs = self._inputs(cupy.complex64)
+        copies = [x.copy() for x in inputs]
+        cupy.fft.fft_batch(inputs, n=n, axis=axis, norm=norm)
+        for x, copy in zip(inputs, copies):
+            testing.assert_array_equal(x, copy)
+
+
+class TestFftBatchPlan:
+
+    def test_single_plan(self):
+        cache = config.get_plan_cache()
+        cache.clear()
+        inputs = [testing.shaped_random((16,), cupy, cupy.complex64, seed=i)
+                  for i in range(10)]
+        cupy.fft.fft_batch(inputs)
+        # one batched plan for all the arrays
+        assert cache.get_curr_size() == 1
+        assert next(iter(cache))[1].plan.batch == 10
+        cache.clear()
+
+    def test_empty(self):
+        assert cupy.fft.fft_batch([]) == []
+
+    def test_invalid(self):
+        with pytest.raises(TypeError):
+            cupy.fft.fft_batch([np.zeros(4, np.complex64)])
+
+
 class TestThreading:
 
     def test_threading1(self):
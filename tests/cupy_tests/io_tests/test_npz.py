@@ -2,8 +2,13 @@ import io
 import pickle
 import unittest
 
+import numpy
+import pytest
+
 import cupy
 from cupy import testing
+from cupy._io import npz
+from cupy.cuda import _pinned_staging
 
 
 class TestNpz(unittest.TestCase):
@@ -98,3 +103,136 @@ class TestNpz(unittest.TestCase):
         sio.close()
 
         testing.assert_array_equal(a, b)
+
+
+class TestNpzStreaming:
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, monkeypatch):
+        # Use small chunks to stream the arrays in multiple chunks.
+        monkeypatch.setattr(_pinned_staging, '_chunk_size', 100)
+        cupy.cuda.reset_pinned_staging_stats()
+
+    def _staged_bytes(self):
+        return cupy.cuda.get_pinned_staging_stats()['host_to_device_bytes']
+
+    @pytest.mark.parametrize('order', ['C', 'F'])
+    @testing.for_all_dtypes()
+    def test_load_npy(self, tmp_path, dtype, order):
+        a = numpy.asarray(
+            testing.shaped_arange((5, 6, 7), numpy, dtype), order=order)
+        path = str(tmp_path / 'a.npy')
+        numpy.save(path, a)
+        b = cupy.load(path)
+        testing.assert_array_equal(b, a)
+        assert b.flags.f_contiguous == (order == 'F')
+        assert self._staged_bytes() == a.nbytes
+
+    @pytest.mark.parametrize('shape', [(), (0,), (0, 3)])
+    def test_load_npy_small(self, tmp_path, shape):
+        a = numpy.ones(shape)
+        path = str(tmp_path / 'a.npy')
+        numpy.save(path, a)
+        testing.assert_array_equal(cupy.load(path), a)
+
+    def test_load_npy_big_endian(self, tmp_path):
+        a = numpy.arange(100, dtype='>i4')
+        path = str(tmp_path / 'a.npy')
+        numpy.save(path, a)
+        testing.assert_array_equal(cupy.load(path), a)
+
+    def test_load_npy_pickle(self, tmp_path):
+        path = str(tmp_path / 'a.npy')
+        numpy.save(path, numpy.array([None]), allow_pickle=True)
+        with pytest.raises(ValueError):
+            cupy.load(path)
+
+    @pytest.mark.parametrize('compressed', [False, True])
+    def test_load_npz(self, tmp_path, compressed):
+        a = testing.shaped_arange((5, 6, 7), numpy, numpy.float32)
+        b = numpy.asfortranarray(testing.shaped_arange((3, 4), numpy))
+        path = str(tmp_path / 'a.npz')
+        savez = numpy.savez_compressed if compressed else numpy.savez
+        savez(path, a=a, b=b, empty=numpy.empty((0,)))
+        with cupy.load(path) as f:
+            testing.assert_array_equal(f['a'], a)
+            testing.assert_array_equal(f['b'], b)
+            testing.assert_array_equal(f['empty'], numpy.empty((0,)))
+            with pytest.raises(KeyError):
+                f['c']
+        staged = a.nbytes + b.nbytes
+        assert self._staged_bytes() == staged
+
+    def _transferred_bytes(self):
+        return cupy.cuda.get_pinned_staging_stats()['device_to_host_bytes']
+
+    @pytest.mark.parametrize('order', ['C', 'F'])
+    @testing.for_all_dtypes()
+    def test_save_npy(self, tmp_path, dtype, order):
+        a = cupy.asarray(
+            testing.shaped_arange((5, 6, 7), cupy, dtype), order=order)
+        path = str(tmp_path / 'a.npy')
+        cupy.save(path, a)
+        b = numpy.load(path)
+        testing.assert_array_equal(b, a)
+        assert b.flags.f_contiguous == (order == 'F')
+        assert self._transferred_bytes() == a.nbytes
+
+    @pytest.mark.parametrize('shape', [(), (0,), (0, 3)])
+    def test_save_npy_small(self, tmp_path, shape):
+        a = cupy.ones(shape)
+        path = str(tmp_path / 'a.npy')
+        cupy.save(path, a)
+        testing.assert_array_equal(numpy.load(path), a)
+
+    def test_save_npy_non_contiguous(self, tmp_path):
+        a = testing.shaped_arange((10, 20), cupy)[::2, ::3]
+        path = str(tmp_path / 'a')
+        cupy.save(path, a)
+        testing.assert_array_equal(numpy.load(path + '.npy'), a)
+
+    def test_save_npy_file_object(self):
+        a = testing.shaped_arange((10, 20), cupy)
+        sio = io.BytesIO()
+        cupy.save(sio, a)
+        sio.seek(0)
+        testing.assert_array_equal(numpy.load(sio), a)
+
+    @pytest.mark.parametrize('compressed', [False, True])
+    @pytest.mark.parametrize('workers', [1, 4])
+    def test_savez(self, tmp_path, monkeypatch, compressed, workers):
+        monkeypatch.setattr(npz, '_compress_workers', workers)
+        a = testing.shaped_random((100, 100), cupy, numpy.float32)
+        b = numpy.arange(10)
+        path = str(tmp_path / 'a')
+        savez = cupy.savez_compressed if compressed else cupy.savez
+        savez(path, a, b=b, c=cupy.empty((0,)))
+        with numpy.load(path + '.npz') as f:
+            testing.assert_array_equal(f['arr_0'], a)
+            testing.assert_array_equal(f['b'], b)
+            assert f['c'].shape == (0,)
+        assert self._transferred_bytes() == a.nbytes
+
+    def test_savez_compressed_parallel(self, tmp_path, monkeypatch):
+        # Fails when the parallel compression stops taking effect, e.g., by
+        # a change of the internals of zipfile.
+        assert npz._can_replace_compressor()
+        monkeypatch.setattr(npz, '_compress_workers', 4)
+        calls = []
+
+        def deflate_chunk(data, level):
+            calls.append(len(data))
+            return deflate_chunk_orig(data, level)
+
+        deflate_chunk_orig = npz._deflate_chunk
+        monkeypatch.setattr(npz, '_deflate_chunk', deflate_chunk)
+        a = testing.shaped_random((100, 100), cupy, numpy.float32)
+        path = str(tmp_path / 'a')
+        cupy.savez_compressed(path, a)
+        assert sum(calls) > a.nbytes
+        with numpy.load(path + '.npz') as f:
+            testing.assert_array_equal(f['arr_0'], a)
+
+    def test_savez_name_conflict(self, tmp_path):
+        with pytest.raises(ValueError):
+            cupy.savez(str(tmp_path / 'a'), cupy.ones(1), arr_0=cupy.ones(1))
@@ -1,11 +1,19 @@
+import bz2
 import filecmp
+import gzip
+import io
+import lzma
 import os
 import tempfile
 import unittest
 
 import numpy
+import pytest
 
 import cupy
+from cupy import testing
+from cupy._io import text
+from cupy.cuda import _pinned_staging
 
 
 class TestText(unittest.TestCase):
@@ -23,3 +31,153 @@ class TestText(unittest.TestCase):
         finally:
             os.remove(tmp_cupy.name)
             os.remove(tmp_numpy.name)
+
+
+class TestSavetxtBlocks:
+
+    @pytest.mark.parametrize('shape', [(10,), (10, 3)])
+    @pytest.mark.parametrize('ext', ['.txt', '.gz', '.bz2', '.xz', '.lzma'])
+    def test_savetxt_blocks(self, tmp_path, monkeypatch, shape, ext):
+        monkeypatch.setattr(_pinned_staging, '_chunk_size', 16)
+        a = testing.shaped_random(shape, cupy, numpy.float64)
+        path_cupy = str(tmp_path / ('cupy' + ext))
+        path_numpy = str(tmp_path / ('numpy' + ext))
+        kwargs = dict(fmt='%.6f', header='head', footer='foot')
+        cupy.savetxt(path_cupy, a, **kwargs)
+        numpy.savetxt(path_numpy, a.get(), **kwargs)
+        opener = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open,
+                  '.lzma': lzma.open}.get(ext, open)
+        with opener(path_cupy, 'rt') as f:
+            actual = f.read()
+        with opener(path_numpy, 'rt') as f:
+            expected = f.read()
+        assert actual == expected
+
+    def test_savetxt_file_object(self, monkeypatch):
+        monkeypatch.setattr(_pinned_staging, '_chunk_size', 16)
+        a = testing.shaped_arange((10, 2), cupy, numpy.int64)
+        sio = io.BytesIO()
+        cupy.savetxt(sio, a, fmt='%d')
+        expected = io.BytesIO()
+        numpy.savetxt(expected, a.get(), fmt='%d')
+        assert sio.getvalue() == expected.getvalue()
+
+
+_loadtxt_data = b"""# comment
+1.5 -2 3e2
+
+4 nan 6 # trailing
+-7.25 8 9\r
+"""
+
+
+class TestLoadtxt:
+
+    @pytest.fixture(autouse=True, params=[256 * 1024 * 1024, 16])
+    def block_size(self, request, monkeypatch):
+        # A small block size splits the file into several blocks.
+        monkeypatch.setattr(text, '_block_size', request.param)
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        path = str(tmp_path / 'data.txt')
+        with open(path, 'wb') as f:
+            f.write(_loadtxt_data)
+        return path
+
+    @testing.for_dtypes('efd')
+    @testing.numpy_cupy_allclose()
+    def test_loadtxt(self, xp, dtype, path):
+        return xp.loadtxt(path, dtype=dtype)
+
+    @testing.for_dtypes('bhilqBHILQ')
+    @testing.numpy_cupy_array_equal()
+    def test_loadtxt_int(self, xp, dtype, tmp_path):
+        path = str(tmp_path / 'data.txt')
+        with open(path, 'w') as f:
+            f.write('0, 1, 2\n 10,20 ,30\n127,100,0\n')
+        return xp.loadtxt(path, dtype=dtype, delimiter=',')
+
+    @pytest.mark.parametrize('usecols', [0, -1, (2, 0), (1, 1)])
+    @testing.numpy_cupy_allclose()
+    def test_loadtxt_usecols(self, xp, path, usecols):
+        return xp.loadtxt(path, usecols=usecols)
+
+    @pytest.mark.parametrize('skiprows', [0, 2, 4, 10])
+    @testing.numpy_cupy_allclose()
+    def test_loadtxt_skiprows(self, xp, path, skiprows):
+        return xp.loadtxt(path, skiprows=skiprows, ndmin=2)
+
+    @pytest.mark.parametrize('ndmin', [0, 1, 2])
+    @testing.numpy_cupy_array_equal()
+    def test_loadtxt_ndmin(self, xp, tmp_path, ndmin):
+        path = str(tmp_path / 'data.txt')
+        with open(path, 'w') as f:
+            f.write('1 2 3\n')
+        return xp.loadtxt(path, ndmin=ndmin)
+
+    @testing.numpy_cupy_allclose()
+    def test_loadtxt_unpack(self, xp, path):
+        return xp.loadtxt(path, unpack=True)
+
+    @testing.numpy_cupy_array_equal()
+    def test_loadtxt_delimiter_comments(self, xp, tmp_path):
+        path = str(tmp_path / 'data.txt')
+        with open(path, 'w') as f:
+            f.write('%x\n1;2\n3;4 % comment\n')
+        return xp.loadtxt(path, delimiter=';', comments='%')
+
+    @testing.numpy_cupy_array_equal()
+    def test_loadtxt_roundtrip(self, xp, tmp_path):
+        path = str(tmp_path / 'data.txt')
+        a = testing.shaped_random((50, 4), numpy, numpy.float64) * 1e10
+        a[0] = [1e-310, 2.5e-320, 1.7976931348623157e308, -0.0]
+        numpy.savetxt(path, a)
+        return xp.loadtxt(path)
+
+    def test_loadtxt_file_object(self, tmp_path):
+        path = str(tmp_path / 'data.txt')
+        with open(path, 'wb') as f:
+            f.write(b'skipped\n1 2\n3 4\n')
+        with open(path, 'rb') as f:
+            f.readline()
+            a = cupy.loadtxt(f)
+            assert f.read() == b''
+        testing.assert_array_equal(a, [[1, 2], [3, 4]])
+
+    def test_loadtxt_empty(self, tmp_path):
+        path = str(tmp_path / 'data.txt')
+        with open(path, 'w') as f:
+            f.write('# comment\n\n')
+        with pytest.warns(UserWarning):
+            a = cupy.loadtxt(path)
+        assert a.shape == (0,)
+
+    @pytest.mark.parametrize('data', [
+        '1 2\n3\n', '1 x\n', '1e\n', '1,2\n'])
+    def test_loadtxt_invalid(self, tmp_path, data):
+        path = str(tmp_path / 'data.txt')
+        with open(path, 'w') as f:
+            f.write(data)
+        with pytest.raises(ValueError):
+            cupy.loadtxt(path)
+
+    def test_loadtxt_int_overflow(self, tmp_path):
+        path = str(tmp_path / 'data.txt')
+        with open(path, 'w') as f:
+            f.write('128\n')
+        with pytest.raises(ValueError):
+            cupy.loadtxt(path, dtype=numpy.int8)
+
+    @testing.for_dtypes('qQ')
+    @testing.numpy_cupy_array_equal()
+    def test_loadtxt_int_limits(self, xp, dtype, tmp_path):
+        info = numpy.iinfo(dtype)
+        path = str(tmp_path / 'data.txt')
+        with open(path, 'w') as f:
+            f.write('{} {}\n'.format(info.min, info.max))
+        return xp.loadtxt(path, dtype=dtype)
+
+    @testing.numpy_cupy_array_equal()
+    def test_loadtxt_fallback(self, xp):
+        return xp.loadtxt(io.StringIO('1 2\n3 4\n5 6\n'), max_rows=2)
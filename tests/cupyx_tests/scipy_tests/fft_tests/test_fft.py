@@ -1784,3 +1784,16 @@ def test_scalar_shape_axes(func):
     y_scalar = func(x, s=5, axes=-1)
     y_normal = func(x, s=(5,), axes=(-1,))
     testing.assert_allclose(y_scalar, y_normal)
+
+
+@pytest.mark.parametrize('name', ['fft', 'ifft', 'rfft', 'irfft'])
+@pytest.mark.parametrize('overwrite_x', [False, True])
+def test_fft_batch(name, overwrite_x):
+    dtype = cp.float64 if name == 'rfft' else cp.complex128
+    inputs = [testing.shaped_random(shape, cp, dtype, seed=i)
+              for i, shape in enumerate([(4, 6), (4, 6), (5, 6)])]
+    expected = [getattr(cp_fft, name)(x, n=8, axis=0) for x in inputs]
+    outs = getattr(cp_fft, name + '_batch')(
+        inputs, n=8, axis=0, overwrite_x=overwrite_x)
+    for out, e in zip(outs, expected):
+        testing.assert_allclose(out, e)
@@ -171,3 +171,29 @@ class TestDctnDstn():
         with scipy_fft.set_backend(backend):
             fft_func = getattr(scipy_fft, self.function)
             return self._run_transform(fft_func, xp, dtype)
+
+
+@testing.parameterize(
+    *testing.product(
+        {
+            'n': [None, 4, 11],
+            'type': [2, 3],
+            'axis': [0, 1, -1],
+            'norm': all_dct_norms,
+            'function': ['dct', 'dst', 'idct', 'idst'],
+        }
+    )
+)
+@testing.with_requires('scipy>=1.12.0rc1')
+class TestDctDstNonContiguous:
+
+    @testing.for_float_dtypes(no_float16=True)
+    @testing.numpy_cupy_allclose(
+        scipy_name='scp', rtol=1e-4, atol=1e-5, contiguous_check=False
+    )
+    def test_dct_non_contiguous(self, xp, scp, dtype):
+        x = testing.shaped_random((6, 16, 9), xp, dtype)
+        x = x[::2, ::-2].transpose(2, 0, 1)
+        fft_func = getattr(scp.fft, self.function)
+        return fft_func(x, type=self.type, n=self.n, axis=self.axis,
+                        norm=self.norm)
@@ -1,4 +1,5 @@
 import platform
+from unittest import mock
 
 import numpy
 import pytest
@@ -8,6 +9,7 @@ from cupy.cuda import runtime
 from cupy import testing
 from cupy.exceptions import AxisError
 import cupyx.scipy.ndimage  # NOQA
+from cupyx.scipy.ndimage import _filters_core
 
 try:
     import scipy.ndimage  # NOQA
@@ -745,6 +747,104 @@ class TestFortranOrder(FilterTestCaseBase):
         return self._filter(xp, scp)
 
 
+# Tests weights large enough to use the tiled kernels
+@testing.parameterize(*testing.product({
+    'filter': ['convolve', 'correlate'],
+    'shape': [(40, 37), (17, 18, 19)],
+    'ksize': [9, 10],
+    'mode': ['reflect', 'constant', 'nearest', 'mirror', 'wrap',
+             'grid-mirror', 'grid-wrap'],
+    'cval': [1.5],
+    'dtype': [numpy.float32, numpy.float64],
+    'order': ['C', 'F'],
+}))
+@testing.with_requires('scipy')
+class TestLargeWeights(FilterTestCaseBase):
+    @testing.numpy_cupy_allclose(atol=1e-4, rtol=1e-4, scipy_name='scp')
+    def test_filter(self, xp, scp):
+        return self._filter(xp, scp)
+
+
+# Tests weights that are the outer product of 1D weights
+@testing.parameterize(*testing.product({
+    'filter': ['convolve', 'correlate'],
+    'shape': [(30, 31), (12, 13, 14)],
+    'ksize': [5, 6],
+    'mode': ['reflect', 'constant', 'nearest', 'mirror', 'wrap'],
+    'cval': [0.0, 1.5],
+    'dtype': [numpy.uint8, numpy.float32, numpy.float64],
+}))
+@testing.with_requires('scipy')
+class TestSeparableWeights(FilterTestCaseBase):
+
+    perturbation = 0
+    device_weights = False
+    derivative = False
+
+    def _get_weights(self, xp):
+        weights = 1
+        for axis in range(self._ndim):
+            shape = [1] * self._ndim
+            shape[axis] = self.ksize
+            w = numpy.linspace(-2, 2, self.ksize) + axis
+            g = numpy.exp(-w * w)
+            if self.derivative and axis == 0:
+                # Contains a zero if ksize is odd.
+                g *= w
+            weights = weights * g.reshape(shape)
+        weights[numpy.unravel_index(weights.argmax(), weights.shape)] *= \
+            1 + self.perturbation
+        if self.device_weights:
+            weights = xp.asarray(weights)
+        return weights
+
+    @testing.numpy_cupy_allclose(atol=1e-4, rtol=1e-4, scipy_name='scp')
+    def test_filter(self, xp, scp):
+        return self._filter(xp, scp)
+
+    @testing.numpy_cupy_allclose(atol=1e-4, rtol=1e-4, scipy_name='scp')
+    def test_filter_float_output(self, xp, scp):
+        self.output = numpy.float64
+        return self._filter(xp, scp)
+
+    @testing.numpy_cupy_allclose(atol=1e-12, rtol=1e-12, scipy_name='scp')
+    def test_filter_nearly_separable(self, xp, scp):
+        # Weights separable only to about 1e-9 are not filtered separately.
+        self.perturbation = 1e-9
+        self.output = numpy.float64
+        return self._filter(xp, scp)
+
+    @testing.numpy_cupy_allclose(atol=1e-4, rtol=1e-4, scipy_name='scp')
+    def test_filter_device_weights(self, xp, scp):
+        self.device_weights = True
+        return self._filter(xp, scp)
+
+    @testing.numpy_cupy_allclose(atol=1e-4, rtol=1e-4, scipy_name='scp')
+    def test_filter_derivative(self, xp, scp):
+        self.derivative = True
+        self.device_weights = True
+        return self._filter(xp, scp)
+
+    def _check_separable(self):
+        with mock.patch.object(
+                _filters_core, '_run_1d_filters',
+                wraps=_filters_core._run_1d_filters) as run:
+            self._filter(cupy, cupyx.scipy)
+        separable = self.dtype != numpy.uint8 and (
+            self.cval == 0 or self.mode != 'constant')
+        assert run.called == separable
+
+    def test_device_weights_separable(self):
+        self.device_weights = True
+        self._check_separable()
+
+    def test_derivative_separable(self):
+        # Separable weights containing zeros are filtered separately.
+        self.device_weights = True
+        self.derivative = True
+        self._check_separable()
+
+
 # Tests with weight dtypes that are distinct from the input and output dtypes
 @testing.parameterize(*(
     testing.product_dict(
@@ -109,6 +109,20 @@ class TestLabelSpecialCases:
         labels, num_features = scp.ndimage.label(x)
         return labels
 
+    @pytest.mark.parametrize('connectivity', [1, 3])
+    @testing.numpy_cupy_array_equal(scipy_name='scp')
+    def test_label_snake_3d(self, xp, scp, connectivity):
+        # a long path folded in a volume, with a few separate features
+        x = xp.zeros((16, 40, 40), dtype=bool)
+        x[:, ::2, :] = True
+        x[:, 1::4, -1] = True
+        x[:, 3::4, 0] = True
+        x[1::2, :, 5] = False
+        x[::4, 20, 10:30] = False
+        structure = _generate_binary_structure(3, connectivity)
+        labels, num_features = scp.ndimage.label(x, structure)
+        return labels, xp.array(num_features)
+
 
 @testing.parameterize(*testing.product({
     'op': stats_ops,
@@ -366,6 +380,52 @@ class TestMeasurementsSelect:
         return result
 
 
+@testing.parameterize(*testing.product({
+    'op': ['maximum', 'minimum', 'maximum_position', 'minimum_position',
+           'extrema'],
+    'index': ['all', 'missing'],
+}))
+@testing.with_requires('scipy')
+class TestMeasurementsSelectManyLabels:
+
+    @testing.for_dtypes('ilqfd')
+    @testing.numpy_cupy_allclose(scipy_name='scp')
+    def test_measurements_select_many_labels(self, xp, scp, dtype):
+        shape = (64, 96)
+        n_labels = 2000
+        rstate = numpy.random.RandomState(0)
+        # unique values to compare the positions
+        x = rstate.permutation(shape[0] * shape[1]).reshape(shape)
+        x = xp.asarray(x, dtype=dtype)
+        labels = xp.asarray(rstate.randint(1, n_labels + 1, shape))
+        if self.index == 'all':
+            index = xp.arange(1, n_labels + 1)
+        else:
+            index = xp.asarray([3, n_labels + 5, 1, 0, 7])
+        result = getattr(scp.ndimage, self.op)(x, labels, index)
+        if self.op == 'extrema':
+            return [xp.asarray(r) for r in result[:2]]
+        return xp.asarray(result)
+
+    @testing.numpy_cupy_array_equal(scipy_name='scp')
+    def test_measurements_select_many_labels_float64(self, xp, scp):
+        shape = (64, 96)
+        n_labels = 2000
+        rstate = numpy.random.RandomState(0)
+        # values that differ below the resolution of float32
+        x = rstate.permutation(shape[0] * shape[1]).reshape(shape)
+        x = 1 + xp.asarray(x, dtype=numpy.float64) * 1e-12
+        labels = xp.asarray(rstate.randint(1, n_labels + 1, shape))
+        if self.index == 'all':
+            index = xp.arange(1, n_labels + 1)
+        else:
+            index = xp.asarray([3, n_labels + 5, 1, 0, 7])
+        result = getattr(scp.ndimage, self.op)(x, labels, index)
+        if self.op == 'extrema':
+            return [xp.asarray(r) for r in result[:2]]
+        return xp.asarray(result)
+
+
 @testing.parameterize(*testing.product({
     'labels': [None, 4, 6],
     'index': [None, [0, 2], [3, 1, 0], [1]],
@@ -452,6 +512,43 @@ class TestLabeledComprehension():
         return op(image, labels, index, func, dtype, self.default,
                   self.pass_positions)
 
+    @testing.for_all_dtypes(no_bool=True, no_complex=True, no_float16=True)
+    @testing.numpy_cupy_allclose(scipy_name='scp', rtol=1e-4, atol=1e-4)
+    def test_labeled_comprehension_batched(self, xp, scp, dtype):
+        image = self._make_image(self.shape, xp, dtype, scale=101)
+        labels = self.labels
+        index = self.index
+        if labels is not None:
+            labels = testing.shaped_random(self.shape, xp, dtype=xp.int32,
+                                           scale=4)
+        if index is not None:
+            # with a missing label and a repeated label
+            index = xp.array(index + [5, 1])
+        if labels is None and index is not None:
+            return xp.asarray([])
+
+        def segment_sum(x, offsets):
+            cs = cupy.concatenate([cupy.zeros(1, x.dtype), x]).cumsum()
+            return cs[offsets[1:]] - cs[offsets[:-1]]
+
+        if self.pass_positions:
+            def func(x, pos):
+                return xp.sum(x + pos > 50)
+
+            def batched_func(x, pos, offsets):
+                return segment_sum((x + pos > 50).astype(int), offsets)
+        else:
+            func = xp.sum
+            batched_func = segment_sum
+
+        op = scp.ndimage.labeled_comprehension
+        dtype = image.dtype if self.dtype == 'same' else self.dtype
+        if xp is cupy:
+            return op(image, labels, index, batched_func, dtype,
+                      self.default, self.pass_positions, batched=True)
+        return op(image, labels, index, func, dtype, self.default,
+                  self.pass_positions)
+
 
 @testing.parameterize(*testing.product({
     'shape': [(500,), (220, 240), (16, 24, 32), (4, 6, 8, 10)],
@@ -312,6 +312,14 @@ class TestFindPeaks:
         return (peaks,) + tuple(
             [props[k] for k in self.property_keys if k in props])
 
+    @pytest.mark.parametrize('distance', [1, 2.5, 7, 100])
+    @testing.numpy_cupy_allclose(scipy_name="scp")
+    def test_distance_condition_many_peaks(self, distance, xp, scp):
+        x = testing.shaped_random((10000,), xp, xp.float64, seed=0)
+        peaks, props = scp.signal.find_peaks(x, distance=distance)
+        return (peaks,) + tuple(
+            [props[k] for k in self.property_keys if k in props])
+
     @testing.numpy_cupy_allclose(scipy_name="scp")
     def test_distance_priority(self, xp, scp):
         # Test priority of peak removal
@@ -0,0 +1,80 @@
+import numpy
+import pytest
+
+import cupy
+from cupy import testing
+import cupyx
+
+
+class TestCopyPipelined:
+
+    @pytest.mark.parametrize('shape', [(0,), (1,), (10, 300), (1000, 33)])
+    @pytest.mark.parametrize('order', ['C', 'F'])
+    def test_to_device(self, shape, order):
+        a = numpy.asarray(
+            testing.shaped_random(shape, numpy, numpy.float32), order=order)
+        b, event = cupyx.copy_pipelined(a, chunk_bytes=1000)
+        expected = a.copy()
+        # The source can be modified once the function returns.
+        a[...] = 0
+        event.synchronize()
+        assert isinstance(b, cupy.ndarray)
+        assert b.flags.f_contiguous == (order == 'F' or a.ndim <= 1)
+        testing.assert_array_equal(b, expected)
+
+    @pytest.mark.parametrize('shape', [(0,), (1,), (10, 300), (1000, 33)])
+    @pytest.mark.parametrize('order', ['C', 'F'])
+    def test_to_host(self, shape, order):
+        a = cupy.asarray(
+            testing.shaped_random(shape, cupy, numpy.float32), order=order)
+        b, event = cupyx.copy_pipelined(a, chunk_bytes=1000)
+        event.synchronize()
+        assert isinstance(b, numpy.ndarray)
+        testing.assert_array_equal(b, a)
+
+    def test_non_contiguous(self):
+        a = testing.shaped_random((100, 100), numpy, numpy.int64)[::2, ::3]
+        b, event = cupyx.copy_pipelined(a, chunk_bytes=256)
+        event.synchronize()
+        testing.assert_array_equal(b, a)
+        c, event = cupyx.copy_pipelined(b[::2], chunk_bytes=256)
+        event.synchronize()
+        testing.assert_array_equal(c, a[::2])
+
+    def test_pinned(self):
+        a = cupyx.zeros_pinned((1000,), numpy.float64)
+        a[:] = numpy.arange(1000)
+        b, event = cupyx.copy_pipelined(a)
+        event.synchronize()
+        out = cupyx.empty_pinned((1000,), numpy.float64)
+        c, event = cupyx.copy_pipelined(b, out=out)
+        assert c is out
+        event.synchronize()
+        testing.assert_array_equal(c, a)
+
+    def test_out(self):
+        a = numpy.arange(1000, dtype=numpy.float32)
+        out = cupy.empty_like(a)
+        b, event = cupyx.copy_pipelined(a, chunk_bytes=1000, out=out)
+        event.synchronize()
+        assert b is out
+        testing.assert_array_equal(out, a)
+
+    def test_stream(self):
+        a = numpy.arange(1000, dtype=numpy.float32)
+        stream = cupy.cuda.Stream()
+        b, event = cupyx.copy_pipelined(a, chunk_bytes=1000, stream=stream)
+        stream.synchronize()
+        assert event.done
+        testing.assert_array_equal(b, a)
+
+    def test_invalid(self):
+        a = numpy.arange(10)
+        with pytest.raises(TypeError):
+            cupyx.copy_pipelined([1, 2, 3])
+        with pytest.raises(ValueError):
+            cupyx.copy_pipelined(a, chunk_bytes=0)
+        with pytest.raises(ValueError):
+            cupyx.copy_pipelined(a, out=cupy.empty(11, dtype=a.dtype))
+        with pytest.raises(TypeError):
+            cupyx.copy_pipelined(a, out=numpy.empty_like(a))
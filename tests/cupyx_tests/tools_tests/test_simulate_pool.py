@@ -0,0 +1,150 @@
+import json
+import random
+
+import pytest
+
+from cupy.cuda.memory_hooks import trace
+from cupyx.tools import simulate_pool
+
+
+def _event(kind, size, alloc_id, stream=0, device_id=0):
+    return trace.TraceEvent(kind, device_id, size, stream, alloc_id, 0, None)
+
+
+def _malloc(size, alloc_id, **kwargs):
+    return _event(trace.MALLOC, size, alloc_id, **kwargs)
+
+
+def _free(alloc_id, **kwargs):
+    return _event(trace.FREE, 0, alloc_id, **kwargs)
+
+
+class TestPoolSimulator:
+
+    def test_split_merge(self):
+        pool = simulate_pool.PoolSimulator()
+        p = pool.malloc(2048)
+        pool.free(p)
+        head = pool.malloc(1000)
+        tail = pool.malloc(1)
+        assert head.ptr == p.ptr
+        assert tail.ptr == p.ptr + 1024
+        stats = pool.get_stats()
+        assert stats['used_bytes'] == 1536
+        assert stats['free_bytes'] == 512
+        assert stats['total_bytes'] == 2048
+        assert stats['n_pool_hits'] == 2
+        assert stats['n_pool_misses'] == 1
+        pool.free(tail)
+        pool.free(head)
+        stats = pool.get_stats()
+        assert stats['n_free_blocks'] == 1
+        assert stats['fragmented_bytes'] == 0
+
+    def test_fragmentation(self):
+        pool = simulate_pool.PoolSimulator()
+        pool.free(pool.malloc(2048))
+        pool.malloc(512)
+        p = pool.malloc(512)
+        pool.malloc(512)
+        pool.free(p)
+        assert pool.get_stats()['fragmented_bytes'] == 512
+        pool.malloc(1024)
+        assert pool.get_stats()['peak_fragmented_bytes'] == 512
+
+    def test_streams(self):
+        pool = simulate_pool.PoolSimulator()
+        pool.free(pool.malloc(512, stream=1))
+        pool.malloc(512, stream=2)
+        stats = pool.get_stats()
+        assert stats['n_pool_misses'] == 2
+        assert stats['arenas'][1]['free_bytes'] == 512
+
+    def test_round_size(self):
+        pool = simulate_pool.PoolSimulator(
+            round_size=lambda size: 1 << (size - 1).bit_length())
+        pool.malloc(1000)
+        assert pool.get_stats()['used_bytes'] == 1024
+        pool = simulate_pool.PoolSimulator(allocation_unit_size=256)
+        pool.malloc(1)
+        assert pool.get_stats()['used_bytes'] == 256
+
+    def test_limit(self):
+        pool = simulate_pool.PoolSimulator(limit=2048)
+        pool.free(pool.malloc(1024))
+        assert pool.malloc(2048) is not None
+        assert pool.malloc(512) is None
+        stats = pool.get_stats()
+        assert stats['total_bytes'] == 2048
+        assert stats['n_oom_retries'] == 3
+        assert stats['n_oom_errors'] == 1
+
+    def test_first_fit(self):
+        pool = simulate_pool.PoolSimulator(policy='first_fit')
+        p1 = pool.malloc(2048)
+        pool.malloc(1024)
+        p3 = pool.malloc(1024)
+        pool.free(p3)
+        pool.free(p1)
+        # The block with the lowest address is chosen even if a smaller
+        # block fits.
+        assert pool.malloc(512).ptr == p1.ptr
+
+    def test_first_fit_alternating(self):
+        # Large transient buffers alternating with medium buffers living
+        # for a few iterations.
+        mb = 1024 * 1024
+        r = random.Random(0)
+        events = []
+        alloc_id = 0
+        medium = []
+        for i in range(50):
+            large = alloc_id
+            events.append(_malloc(r.randint(64 * mb, 128 * mb), alloc_id))
+            alloc_id += 1
+            for _ in range(r.randint(1, 3)):
+                events.append(_malloc(r.randint(mb, 8 * mb), alloc_id))
+                medium.append((i + r.randint(1, 20), alloc_id))
+                alloc_id += 1
+            events.append(_free(large))
+            events += [_free(a) for t, a in medium if t <= i]
+            medium = [(t, a) for t, a in medium if t > i]
+        peak_bin = simulate_pool.simulate(
+            events, policy='bin')[0]['peak_total_bytes']
+        peak_first_fit = simulate_pool.simulate(
+            events, policy='first_fit')[0]['peak_total_bytes']
+        assert peak_first_fit < peak_bin * 0.8
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            simulate_pool.PoolSimulator(policy='best_fit')
+
+
+class TestSimulate:
+
+    def test_simulate(self):
+        events = [
+            _malloc(1000, 0),
+            _malloc(100, 1, device_id=1),
+            _free(0),
+            _malloc(500, 2),
+            _free(3),  # unknown allocation
+        ]
+        stats = simulate_pool.simulate(events)
+        assert stats[0]['n_malloc'] == 2
+        assert stats[0]['n_pool_hits'] == 1
+        assert stats[0]['peak_total_bytes'] == 1024
+        assert stats[1]['used_bytes'] == 512
+
+    def test_main(self, tmp_path, capsys):
+        path = str(tmp_path / 'trace.bin')
+        with open(path, 'wb') as f:
+            f.write(trace._MAGIC)
+            for e in [_malloc(1000, 0), _free(0)]:
+                f.write(trace._record.pack(
+                    e.kind, e.device_id, 0, e.size, e.stream, e.alloc_id,
+                    e.timestamp))
+        ret = simulate_pool.main([path, '--policy', 'first_fit'])
+        assert ret == 0
+        stats = json.loads(capsys.readouterr().out)
+        assert stats['0']['n_free'] == 1
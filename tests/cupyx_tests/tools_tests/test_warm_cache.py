@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from cupy._core import core
+from cupy.cuda import compiler
+from cupyx.tools import warm_cache
+
+
+_source = '''
+extern "C" __global__ void warm_cache_test_kernel(float* x) {
+    x[threadIdx.x] = %d;
+}
+'''
+
+
+class TestWarmCache:
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmp_path, monkeypatch):
+        self.manifest = str(tmp_path / 'manifest.json')
+        self.cache_dir = str(tmp_path / 'cache')
+        monkeypatch.setattr(compiler, '_recorded_keys', set())
+        monkeypatch.setenv('CUPY_CACHE_RECORD', self.manifest)
+
+    def _record(self, n):
+        for i in range(n):
+            # Compile twice to check duplicates are not recorded.
+            for _ in range(2):
+                core.compile_with_cache(
+                    _source % i, cachd_dir=str(self.cache_dir) + '_record')
+
+    def test_record(self):
+        self._record(3)
+        entries = warm_cache.load_manifest(self.manifest)
+        assert len(entries) == 3
+        for entry in entries:
+            assert entry['cupy_headers']
+            assert entry['extra_source'] is None
+            assert 'warm_cache_test_kernel' in entry['source']
+
+    def test_load_manifest_json_list(self, tmp_path):
+        self._record(2)
+        entries = warm_cache.load_manifest(self.manifest)
+        path = str(tmp_path / 'list.json')
+        with open(path, 'w') as f:
+            json.dump(entries + entries, f)
+        assert warm_cache.load_manifest(path) == entries
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_warm_cache(self, workers):
+        self._record(3)
+        entries = warm_cache.load_manifest(self.manifest)
+        failures = warm_cache.warm_cache(entries, self.cache_dir, workers)
+        assert failures == []
+        info = compiler.get_cache_info(self.cache_dir)
+        assert info['entries'] == 3
+        # The replayed kernels are found in the cache.
+        for i in range(3):
+            core.compile_with_cache(_source % i, cachd_dir=self.cache_dir)
+        assert compiler.get_cache_info(self.cache_dir)['hits'] == 3
+
+    def test_warm_cache_failure(self):
+        entries = [{'source': 'invalid', 'options': []}]
+        failures = warm_cache.warm_cache(entries, self.cache_dir, 1)
+        assert len(failures) == 1
+        assert failures[0][0] == 0
+
+    def test_main(self, capsys, monkeypatch):
+        self._record(2)
+        monkeypatch.delenv('CUPY_CACHE_RECORD')
+        ret = warm_cache.main(
+            [self.manifest, '--cache-dir', self.cache_dir, '-j', '1'])
+        assert ret == 0
+        assert 'Compiled 2 of 2 kernels.' in capsys.readouterr().out
@@ -0,0 +1,65 @@
+import subprocess
+import sys
+
+import pytest
+
+
+"""
+Test to ensure that submodules which are not needed to import CuPy are
+loaded on first access.
+"""
+
+
+_lazy_modules = [
+    'cupy.fft',
+    'cupy.polynomial',
+    'cupy.random',
+    'cupy.sparse',
+    'cupy.testing',
+    'cupyx.linalg',
+    'cupyx.optimizing',
+    'cupyx.scipy',
+    'cupyx.scipy.sparse',
+]
+
+
+def _import_time(code):
+    # Returns a dict mapping imported module names to their cumulative
+    # import time in microseconds, as reported by `python -X importtime`.
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            cumulative = int(fields[1])
+        except ValueError:
+            continue  # header
+        times[fields[2].strip()] = cumulative
+    return times
+
+
+class TestLazyImport:
+
+    def test_import_cupy(self):
+        times = _import_time('import cupy')
+        assert 'cupy' in times
+        loaded = [name for name in _lazy_modules if name in times]
+        assert loaded == []
+
+    @pytest.mark.parametrize('name', _lazy_modules)
+    def test_access(self, name):
+        # Accessing the submodule as an attribute imports it.
+        code = 'import {}; m = {}; assert m.__name__ == {!r}'.format(
+            name.split('.')[0], name, name)
+        subprocess.run([sys.executable, '-c', code], check=True)
+
+    def test_dir(self):
+        import cupy
+        import cupyx
+        assert 'fft' in dir(cupy)
+        assert 'scipy' in dir(cupyx)